@@ -8,28 +8,33 @@ import voluptuous as vol
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant
 import homeassistant.helpers.config_validation as cv
-from homeassistant.helpers.device_registry import DeviceInfo
 from homeassistant.helpers.typing import ConfigType
 from homeassistant.loader import async_get_integration
 
-from .cert_handler import format_url
 from .const import (
     CONF_CERTIFICATE,
     CONF_HOST,
+    CONF_HTTP2,
+    CONF_LOG_FOLLOW,
+    CONF_LOG_PATTERNS,
+    CONF_OCR_REGIONS,
     CONF_PASSWORD,
-    CONF_SERIAL,
     DEFAULT_HOST,
+    DEFAULT_LOG_PATTERNS,
     DEFAULT_PASSWORD,
     DEFAULT_USERNAME,
     DOMAIN,
-    MANUFACTURER,
 )
 from .coordinator import GLKVMDataUpdateCoordinator
-from .entity import GLKVMEntity
+from .entity import GLKVMEntryRuntime
+from .log_follower import GLKVMLogFollower
+from .ocr import GLKVMOcrCoordinator, parse_ocr_regions
+from .services import async_setup_services
+from .storage import GLKVMDataStore
 
 _LOGGER = logging.getLogger(__name__)
 
-PLATFORMS = ["sensor", "button", "switch"]
+PLATFORMS = ["sensor", "binary_sensor", "button", "switch", "camera"]
 
 CONFIG_SCHEMA = vol.Schema(
     {
@@ -46,6 +51,7 @@ CONFIG_SCHEMA = vol.Schema(
 
 async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
     """Set up the GLKVM component."""
+    await async_setup_services(hass)
     return True
 
 
@@ -66,35 +72,37 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         DEFAULT_USERNAME,
         entry.data[CONF_PASSWORD],
         entry.data[CONF_CERTIFICATE],
+        http2=entry.options.get(CONF_HTTP2, False),
     )
+    # The coordinator closes its connections when the entry is unloaded
     await coordinator.async_setup()
-    await coordinator.async_config_entry_first_refresh()
-
-    hass.data[DOMAIN][entry.entry_id] = coordinator
-
-    # Safely extract device info with fallbacks
-    system = coordinator.data.get("system", {}) if coordinator.data else {}
-    platform = system.get("platform", {})
-    kvmd = system.get("kvmd", {})
-
-    # Use base field for model (e.g., "Rockchip RV1126B-P EVB V14 Board")
-    model = platform.get("base") or entry.data.get("model", "GLKVM")
-    hw_version = platform.get("model")  # e.g., "v3"
-    sw_version = kvmd.get("version")
-
-    GLKVMEntity.DEVICE_INFO = DeviceInfo(
-        identifiers={(DOMAIN, entry.data[CONF_SERIAL])},
-        configuration_url=format_url(entry.data[CONF_HOST]),
-        serial_number=entry.data[CONF_SERIAL],
-        manufacturer=MANUFACTURER,
-        name=entry.title,
-        model=model,
-        hw_version=hw_version,
-        sw_version=sw_version,
-    )
+    coordinator.store = GLKVMDataStore(hass, entry.entry_id)
+    if restored := await coordinator.store.async_load():
+        # Set up from the last known state and refresh once the entry is loaded
+        _LOGGER.debug("Setting up %s from its last known state", entry.title)
+        coordinator.async_set_updated_data(restored)
+        entry.async_create_background_task(
+            hass, coordinator.async_refresh(), f"{DOMAIN} first refresh {entry.title}"
+        )
+    else:
+        await coordinator.async_config_entry_first_refresh()
+
+    hass.data[DOMAIN][entry.entry_id] = GLKVMEntryRuntime(entry, coordinator)
+
+    if regions := parse_ocr_regions(entry.options.get(CONF_OCR_REGIONS, "")):
+        coordinator.ocr = GLKVMOcrCoordinator(hass, coordinator, regions)
 
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
 
+    if entry.options.get(CONF_LOG_FOLLOW):
+        coordinator.log_follower = GLKVMLogFollower(
+            hass,
+            coordinator,
+            entry.entry_id,
+            entry.options.get(CONF_LOG_PATTERNS, DEFAULT_LOG_PATTERNS),
+        )
+        coordinator.log_follower.async_start()
+
     entry.async_on_unload(entry.add_update_listener(update_listener))
 
     return True
@@ -109,7 +117,18 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
 
 
 async def update_listener(hass: HomeAssistant, entry: ConfigEntry) -> None:
-    """Handle options update."""
+    """Handle options update.
+
+    A new certificate alone (accepted rotation or a fixed repair issue) is
+    pinned on the running coordinator instead of reloading the entry.
+    """
+    runtime = hass.data[DOMAIN].get(entry.entry_id)
+    if isinstance(runtime, GLKVMEntryRuntime) and runtime.is_certificate_change(entry):
+        coordinator = runtime.coordinator
+        if coordinator.cert != entry.data[CONF_CERTIFICATE]:
+            await coordinator.async_set_certificate(entry.data[CONF_CERTIFICATE])
+            await coordinator.async_request_refresh()
+        return
     await hass.config_entries.async_reload(entry.entry_id)
 
 
@@ -117,3 +136,4 @@ async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
     """Handle removal of a config entry."""
     await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
     hass.data[DOMAIN].pop(entry.entry_id, None)
+    await GLKVMDataStore(hass, entry.entry_id).async_remove()
@@ -0,0 +1,118 @@
+"""Binary sensor platform for GL.iNet KVM."""
+
+import logging
+
+from homeassistant.components.binary_sensor import (
+    BinarySensorDeviceClass,
+    BinarySensorEntity,
+)
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.entity_platform import AddEntitiesCallback
+
+from .const import DOMAIN, WS_EVENT_STREAMER_STATE
+from .entity import GLKVMDescribedEntity, GLKVMEntityDescription
+from .utils import get_gpio_channels, get_gpio_state, get_nested_value
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class GLKVMBinarySensor(GLKVMDescribedEntity, BinarySensorEntity):
+    """Binary sensor driven by an entity description."""
+
+    @property
+    def is_on(self) -> bool | None:
+        """Return the evaluated value."""
+        return self.value
+
+
+def gpio_input_description(channel: str) -> GLKVMEntityDescription:
+    """Describe the binary sensor of a kvmd GPIO input channel."""
+    return GLKVMEntityDescription(
+        key=f"gpio_{channel}",
+        name=f"GPIO {channel}",
+        icon="mdi:import",
+        available_fn=lambda data: bool(
+            get_gpio_state(data, "inputs", channel).get("online")
+        ),
+        value_fn=lambda data: (
+            bool(state["state"])
+            if "state" in (state := get_gpio_state(data, "inputs", channel))
+            else None
+        ),
+    )
+
+
+def _resolution(data: dict) -> str | None:
+    """Return the source resolution as WIDTHxHEIGHT."""
+    resolution = get_nested_value(data, ["source", "resolution"], {})
+    if not resolution:
+        return None
+    return f"{resolution.get('width')}x{resolution.get('height')}"
+
+
+VIDEO_SIGNAL = GLKVMEntityDescription(
+    key="video_signal",
+    name="Video Signal",
+    icon="mdi:video-input-hdmi",
+    device_class=BinarySensorDeviceClass.CONNECTIVITY,
+    entity_registry_enabled_default=False,
+    available_fn=lambda data: "online" in get_nested_value(data, ["source"], {}),
+    value_fn=lambda data: get_nested_value(data, ["source", "online"], False),
+    attrs_fn=lambda data: {"resolution": _resolution(data)},
+)
+
+
+class GLKVMVideoSignalSensor(GLKVMBinarySensor):
+    """Binary sensor that is on while the host outputs a video signal.
+
+    Unlike the ATX power LED this also works for hosts without ATX wiring and
+    shows hosts that are powered but not producing a picture. It is backed by
+    the streamer coordinator and updated from streamer_state push events, with
+    polling only as a fallback while the websocket is quiet.
+    """
+
+    async def async_added_to_hass(self) -> None:
+        """Subscribe to push events and fetch the current state."""
+        await super().async_added_to_hass()
+        self.async_on_remove(
+            self.coordinator.device.events.async_subscribe(
+                WS_EVENT_STREAMER_STATE, self.coordinator.async_handle_push
+            )
+        )
+        await self.coordinator.async_request_refresh()
+
+    @property
+    def extra_state_attributes(self):
+        """Return the source resolution and push connection state."""
+        return {
+            "resolution": None,
+            **(super().extra_state_attributes or {}),
+            "push_connected": self.coordinator.device.events.connected,
+        }
+
+
+async def async_setup_entry(
+    hass: HomeAssistant,
+    config_entry: ConfigEntry,
+    async_add_entities: AddEntitiesCallback,
+) -> None:
+    """Set up GLKVM binary sensors from a config entry."""
+    _LOGGER.debug("Setting up GLKVM binary sensors from config entry")
+    runtime = hass.data[DOMAIN][config_entry.entry_id]
+    coordinator = runtime.coordinator
+
+    sensors = [
+        runtime.create(GLKVMBinarySensor, gpio_input_description(channel))
+        for channel in get_gpio_channels(coordinator.data, "inputs")
+    ]
+
+    async_add_entities(sensors, True)
+    async_add_entities(
+        [
+            runtime.create(
+                GLKVMVideoSignalSensor, VIDEO_SIGNAL, coordinator=coordinator.streamer
+            )
+        ]
+    )
+    _LOGGER.debug("%d GLKVM binary sensors added to Home Assistant", len(sensors))
@@ -1,7 +1,10 @@
 """Button platform for GL.iNet KVM ATX controls."""
 
-import functools
+from collections.abc import Mapping
+from dataclasses import dataclass
+from types import MappingProxyType
 import logging
+from typing import Any
 
 from homeassistant.components.button import ButtonEntity, ButtonDeviceClass
 from homeassistant.config_entries import ConfigEntry
@@ -10,101 +13,69 @@ from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
 from .const import (
     API_ATX_POWER,
+    API_GPIO_PULSE,
     ATX_ACTION_POWER_OFF,
     ATX_ACTION_RESET,
     DOMAIN,
 )
-from .entity import GLKVMEntity
+from .entity import GLKVMDescribedEntity, GLKVMEntityDescription
+from .utils import get_gpio_channels, get_gpio_state
 
 _LOGGER = logging.getLogger(__name__)
 
 
-class GLKVMButtonEntity(GLKVMEntity, ButtonEntity):
-    """Base class for GLKVM button entities."""
-
-    def __init__(
-        self,
-        coordinator,
-        unique_id_base: str,
-        button_type: str,
-        name: str,
-        action: str,
-        icon: str,
-        device_class: ButtonDeviceClass | None = None,
-    ) -> None:
-        """Initialize the button."""
-        super().__init__(coordinator, unique_id_base)
-        self._attr_unique_id = f"{unique_id_base}_{button_type}"
-        self._attr_name = name
-        self._attr_icon = icon
-        self._action = action
-        if device_class:
-            self._attr_device_class = device_class
+@dataclass(frozen=True, kw_only=True)
+class GLKVMButtonEntityDescription(GLKVMEntityDescription):
+    """Describes a GLKVM button and the command it sends."""
+
+    command_path: str
+    params: Mapping[str, Any]
+
+
+class GLKVMButton(GLKVMDescribedEntity, ButtonEntity):
+    """Button driven by an entity description."""
+
+    entity_description: GLKVMButtonEntityDescription
 
     async def async_press(self) -> None:
-        """Handle the button press."""
-        await self._send_atx_command(self._action)
-
-    async def _send_atx_command(self, action: str) -> None:
-        """Send ATX power command to the device."""
-        try:
-            url = f"{self.coordinator.url}{API_ATX_POWER}"
-            _LOGGER.debug("Sending ATX command: %s to %s", action, url)
-
-            response = await self.coordinator.hass.async_add_executor_job(
-                functools.partial(
-                    self.coordinator.session.post,
-                    url,
-                    params={"action": action},
-                    auth=self.coordinator.auth,
-                    timeout=10,
-                )
-            )
-
-            if response.status_code == 200:
-                _LOGGER.info("ATX command '%s' sent successfully", action)
-                await self.coordinator.async_request_refresh()
-            else:
-                _LOGGER.error(
-                    "ATX command '%s' failed with status %s: %s",
-                    action,
-                    response.status_code,
-                    response.text,
-                )
-
-        except Exception as err:
-            _LOGGER.error("Error sending ATX command '%s': %s", action, err)
-
-
-class GLKVMPowerButton(GLKVMButtonEntity):
-    """Button to press the power button on the connected system."""
-
-    def __init__(self, coordinator, unique_id_base: str, device_name: str) -> None:
-        """Initialize the power button."""
-        super().__init__(
-            coordinator,
-            unique_id_base,
-            "power_button",
-            f"{device_name} Power Button",
-            ATX_ACTION_POWER_OFF,
-            "mdi:power",
+        """Send the button's command through the device's command path."""
+        description = self.entity_description
+        await self.coordinator.async_send_command(
+            description.command_path, dict(description.params)
         )
 
 
-class GLKVMResetButton(GLKVMButtonEntity):
-    """Button to press the reset button on the connected system."""
+ATX_BUTTONS = (
+    GLKVMButtonEntityDescription(
+        key="power_button",
+        name="Power Button",
+        icon="mdi:power",
+        command_path=API_ATX_POWER,
+        params=MappingProxyType({"action": ATX_ACTION_POWER_OFF}),
+    ),
+    GLKVMButtonEntityDescription(
+        key="reset_button",
+        name="Reset Button",
+        icon="mdi:restart",
+        device_class=ButtonDeviceClass.RESTART,
+        command_path=API_ATX_POWER,
+        params=MappingProxyType({"action": ATX_ACTION_RESET}),
+    ),
+)
 
-    def __init__(self, coordinator, unique_id_base: str, device_name: str) -> None:
-        """Initialize the reset button."""
-        super().__init__(
-            coordinator,
-            unique_id_base,
-            "reset_button",
-            f"{device_name} Reset Button",
-            ATX_ACTION_RESET,
-            "mdi:restart",
-            ButtonDeviceClass.RESTART,
-        )
+
+def gpio_pulse_description(channel: str) -> GLKVMButtonEntityDescription:
+    """Describe the pulse button of a kvmd GPIO output channel."""
+    return GLKVMButtonEntityDescription(
+        key=f"gpio_{channel}_pulse",
+        name=f"GPIO {channel} Pulse",
+        icon="mdi:gesture-tap-button",
+        available_fn=lambda data: bool(
+            get_gpio_state(data, "outputs", channel).get("online")
+        ),
+        command_path=API_GPIO_PULSE,
+        params=MappingProxyType({"channel": channel}),
+    )
 
 
 async def async_setup_entry(
@@ -114,17 +85,17 @@ async def async_setup_entry(
 ) -> None:
     """Set up GLKVM buttons from a config entry."""
     _LOGGER.debug("Setting up GLKVM ATX buttons from config entry")
-    coordinator = hass.data[DOMAIN][config_entry.entry_id]
-
-    serial = config_entry.data.get("serial", config_entry.entry_id)
-    unique_id_base = f"{config_entry.entry_id}_{serial}"
-
-    device_name = config_entry.title or "GLKVM"
+    runtime = hass.data[DOMAIN][config_entry.entry_id]
+    coordinator = runtime.coordinator
 
     buttons = [
-        GLKVMPowerButton(coordinator, unique_id_base, device_name),
-        GLKVMResetButton(coordinator, unique_id_base, device_name),
+        runtime.create(GLKVMButton, description) for description in ATX_BUTTONS
     ]
+    buttons.extend(
+        runtime.create(GLKVMButton, gpio_pulse_description(channel))
+        for channel, model in get_gpio_channels(coordinator.data, "outputs").items()
+        if model.get("pulse", {}).get("delay")
+    )
 
     async_add_entities(buttons, True)
     _LOGGER.debug("%d GLKVM ATX buttons added to Home Assistant", len(buttons))
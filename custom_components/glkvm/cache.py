@@ -0,0 +1,85 @@
+"""Small async caches shared by the GLKVM entities."""
+
+import asyncio
+from collections.abc import Awaitable, Callable, Hashable
+import logging
+import time
+from typing import Any
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class TTLCache:
+    """Per-key TTL cache with single-flight loading.
+
+    Concurrent callers asking for the same missing or expired key share one
+    loader call; the value is then served from memory until it is older than
+    ``ttl`` seconds. Failed loads are not cached, and neither are loads
+    that were in flight when the cache was invalidated.
+    """
+
+    def __init__(self, ttl: float, max_entries: int = 8) -> None:
+        """Initialize the cache."""
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries: dict[Hashable, tuple[float, Any]] = {}
+        self._inflight: dict[Hashable, asyncio.Future] = {}
+        # Bumped by invalidate, so loads started before it are not stored
+        self.generation = 0
+
+    def get_fresh(self, key: Hashable) -> Any | None:
+        """Return the cached value for key if it is younger than the TTL."""
+        entry = self._entries.get(key)
+        if entry is not None and time.monotonic() - entry[0] < self.ttl:
+            return entry[1]
+        return None
+
+    async def async_get(
+        self, key: Hashable, loader: Callable[[], Awaitable[Any]]
+    ) -> Any:
+        """Return the value for key, loading it at most once at a time."""
+        entry = self._entries.get(key)
+        if entry is not None and time.monotonic() - entry[0] < self.ttl:
+            return entry[1]
+
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self._async_load(key, loader))
+            self._inflight[key] = task
+            task.add_done_callback(lambda done: self._forget(key, done))
+        else:
+            _LOGGER.debug("Joining in-flight load for %s", key)
+        # Shield so one cancelled caller does not abort the load for the others
+        return await asyncio.shield(task)
+
+    def _forget(self, key: Hashable, task: asyncio.Future) -> None:
+        """Drop a finished load unless a newer one replaced it."""
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+
+    async def _async_load(
+        self, key: Hashable, loader: Callable[[], Awaitable[Any]]
+    ) -> Any:
+        """Run the loader and store its result."""
+        generation = self.generation
+        value = await loader()
+        if self.generation == generation:
+            self.set(key, value)
+        return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        """Store a value for key, such as one fetched by a poll."""
+        self._entries.pop(key, None)
+        self._entries[key] = (time.monotonic(), value)
+        while len(self._entries) > self.max_entries:
+            self._entries.pop(next(iter(self._entries)))
+
+    def invalidate(self, key: Hashable | None = None) -> None:
+        """Drop one key, or every key if none is given."""
+        self.generation += 1
+        if key is None:
+            self._entries.clear()
+            self._inflight.clear()
+        else:
+            self._entries.pop(key, None)
+            self._inflight.pop(key, None)
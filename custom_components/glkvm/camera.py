@@ -0,0 +1,56 @@
+"""Camera platform for the GL.iNet KVM screen."""
+
+import logging
+
+from aiohttp import web
+import requests
+
+from homeassistant.components.camera import Camera
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.entity_platform import AddEntitiesCallback
+
+from .const import DOMAIN
+from .entity import GLKVMEntity
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class GLKVMSnapshotCamera(GLKVMEntity, Camera):
+    """Camera showing snapshots of the host screen."""
+
+    def __init__(self, coordinator, unique_id_base: str, device_name: str) -> None:
+        """Initialize the camera."""
+        super().__init__(coordinator, unique_id_base)
+        Camera.__init__(self)
+        self._attr_unique_id = f"{unique_id_base}_screen"
+        self._attr_name = f"{device_name} Screen"
+        self._attr_icon = "mdi:monitor"
+
+    async def async_camera_image(
+        self, width: int | None = None, height: int | None = None
+    ) -> bytes | None:
+        """Return a snapshot, downscaled on the device for thumbnails."""
+        try:
+            return await self.coordinator.async_get_snapshot(width, height)
+        except requests.exceptions.RequestException as err:
+            _LOGGER.debug("Could not fetch snapshot from %s: %s", self.coordinator.url, err)
+            return None
+
+    async def handle_async_mjpeg_stream(
+        self, request: web.Request
+    ) -> web.StreamResponse | None:
+        """Serve the live stream from the device's shared upstream connection."""
+        return await self.coordinator.stream_proxy.async_handle_request(request)
+
+
+async def async_setup_entry(
+    hass: HomeAssistant,
+    config_entry: ConfigEntry,
+    async_add_entities: AddEntitiesCallback,
+) -> None:
+    """Set up the GLKVM camera from a config entry."""
+    _LOGGER.debug("Setting up GLKVM camera from config entry")
+    runtime = hass.data[DOMAIN][config_entry.entry_id]
+
+    async_add_entities([runtime.create(GLKVMSnapshotCamera)])
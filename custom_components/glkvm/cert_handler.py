@@ -13,7 +13,9 @@ currently being intercepted. The GLKVM public certificate will be recorded
 during the time of the initial setup and stored in the Home Assistant configuration.
 When loaded, the certificate will be used to establish a secure connection to the GLKVM.
 Due to this, we are able to bypass the certificate verification process and establish
-a secure connection to the GLKVM.
+a secure connection to the GLKVM. Instead of chain verification, the SHA-256
+fingerprint of the recorded certificate is pinned: a connection presenting any
+other certificate fails during the handshake.
 
 This module provides functions to fetch and serialize the certificate from the device.
 It also provides a function to check if the device is a GLKVM and return its serial number.
@@ -21,13 +23,16 @@ It also provides a function to check if the device is a GLKVM and return its ser
 
 from collections import namedtuple
 import functools
+import hashlib
 import logging
 import os
 import socket
 import ssl
 import tempfile
+from urllib.parse import urlsplit
 import warnings
 
+import aiohttp
 import OpenSSL
 import requests
 from requests.adapters import HTTPAdapter
@@ -36,24 +41,44 @@ from urllib3.exceptions import InsecureRequestWarning
 
 from homeassistant.core import HomeAssistant
 
-from .const import CONF_HOST, CONF_MODEL, CONF_SERIAL
+from .const import CONF_HOST, CONF_MODEL, CONF_SERIAL, HTTP_POOL_MAXSIZE
+from .resolver import GLKVMResolver, PinnedAiohttpResolver, pinned_pool_classes
 
 warnings.simplefilter("ignore", InsecureRequestWarning)
 
 _LOGGER = logging.getLogger(__name__)
 
 
-class SSLContextAdapter(HTTPAdapter):
+class PinnedAddressAdapter(HTTPAdapter):
+    """An HTTP adapter that connects to the resolver's pinned address."""
+
+    def __init__(self, *args, resolver: GLKVMResolver | None = None, **kwargs) -> None:
+        """Initialize the adapter with an optional resolver."""
+        self.resolver = resolver
+        super().__init__(*args, **kwargs)
+
+    def init_poolmanager(self, *args, **kwargs) -> None:
+        """Initialize the pool manager with pinned pool classes."""
+        super().init_poolmanager(*args, **kwargs)
+        if self.resolver is not None:
+            self.poolmanager.pool_classes_by_scheme = pinned_pool_classes(self.resolver)
+
+
+class SSLContextAdapter(PinnedAddressAdapter):
     """An HTTP adapter that uses a custom SSL context."""
 
-    def __init__(self, ssl_context, *args, **kwargs) -> None:
+    def __init__(self, ssl_context, *args, fingerprint=None, **kwargs) -> None:
         """Initialize the adapter with the custom SSL context. This method is called by the session."""
         self.ssl_context = ssl_context
+        self.fingerprint = fingerprint
         super().__init__(*args, **kwargs)
 
     def init_poolmanager(self, *args, **kwargs) -> None:
         """Initialize the pool manager with the custom SSL context. This method is called by the session."""
         kwargs["ssl_context"] = self.ssl_context
+        if self.fingerprint:
+            # Checked by urllib3 on every handshake, even without verification
+            kwargs["assert_fingerprint"] = self.fingerprint
         super().init_poolmanager(*args, **kwargs)
 
     def cert_verify(self, conn, *args, **kwargs) -> None:
@@ -62,8 +87,23 @@ class SSLContextAdapter(HTTPAdapter):
         conn.cert_reqs = ssl.CERT_NONE
 
 
-async def create_session_with_cert(hass: HomeAssistant | None, serialized_cert=None):
+def cert_fingerprint(serialized_cert: str) -> str:
+    """Return the SHA-256 fingerprint of a PEM certificate as hex."""
+    return hashlib.sha256(ssl.PEM_cert_to_DER_cert(serialized_cert)).hexdigest()
+
+
+async def create_session_with_cert(
+    hass: HomeAssistant | None,
+    serialized_cert=None,
+    resolver: GLKVMResolver | None = None,
+):
+    """Create a requests session pinned to the given certificate.
+
+    Returns the session and the path of the temporary certificate file, or
+    (None, None) if the session could not be created.
+    """
     cert_file_path = None
+    fingerprint = None
     try:
         session = requests.Session()
 
@@ -82,9 +122,24 @@ async def create_session_with_cert(hass: HomeAssistant | None, serialized_cert=N
                 )
             else:
                 context.load_verify_locations(cert_file_path)
-
-        adapter = SSLContextAdapter(context)
+            fingerprint = cert_fingerprint(serialized_cert)
+
+        # Every session talks to one device, so one pool per scheme; requests
+        # beyond the pool size get a connection that is closed afterwards
+        adapter = SSLContextAdapter(
+            context,
+            fingerprint=fingerprint,
+            resolver=resolver,
+            pool_connections=1,
+            pool_maxsize=HTTP_POOL_MAXSIZE,
+        )
         session.mount("https://", adapter)
+        session.mount(
+            "http://",
+            PinnedAddressAdapter(
+                resolver=resolver, pool_connections=1, pool_maxsize=HTTP_POOL_MAXSIZE
+            ),
+        )
 
         _LOGGER.debug("Created session with custom SSL context using the certificate")
         return session, cert_file_path if serialized_cert else None
@@ -93,6 +148,61 @@ async def create_session_with_cert(hass: HomeAssistant | None, serialized_cert=N
         return None, None
 
 
+def create_aiohttp_session(
+    serialized_cert: str | None, resolver: GLKVMResolver | None = None
+) -> aiohttp.ClientSession:
+    """Create an aiohttp session pinned to the given certificate and address.
+
+    Used for the long-lived connections (websocket, MJPEG stream) that are
+    read on the event loop rather than in the executor. Without a resolver
+    the host is looked up with the system resolver, like the requests
+    session does, rather than a c-ares channel per session.
+    """
+    ssl_setting: aiohttp.Fingerprint | bool = False
+    if serialized_cert:
+        ssl_setting = aiohttp.Fingerprint(
+            bytes.fromhex(cert_fingerprint(serialized_cert))
+        )
+    return aiohttp.ClientSession(
+        connector=aiohttp.TCPConnector(
+            ssl=ssl_setting,
+            resolver=PinnedAiohttpResolver(resolver)
+            if resolver
+            else aiohttp.ThreadedResolver(),
+        )
+    )
+
+
+def connection_stats(session: requests.Session | None) -> dict[str, int]:
+    """Return the connection pool counters of a session.
+
+    ``open`` counts connections that are idle in a pool or checked out by a
+    request, ``created`` and ``requests`` are totals over the pools' lives.
+    """
+    stats = {"pools": 0, "open": 0, "idle": 0, "created": 0, "requests": 0}
+    if session is None:
+        return stats
+    for adapter in session.adapters.values():
+        pools = adapter.poolmanager.pools
+        # Looking a pool up would mark it as recently used; copy them instead
+        with pools.lock:
+            adapter_pools = list(pools._container.values())
+        for pool in adapter_pools:
+            if pool.pool is None:
+                continue
+            idle = sum(
+                1
+                for conn in list(pool.pool.queue)
+                if conn is not None and conn.sock is not None
+            )
+            stats["pools"] += 1
+            stats["idle"] += idle
+            stats["open"] += idle + pool.pool.maxsize - pool.pool.qsize()
+            stats["created"] += pool.num_connections
+            stats["requests"] += pool.num_requests
+    return stats
+
+
 async def fetch_serialized_cert(hass: HomeAssistant, url: str) -> str:
     """Fetch and serialize the certificate."""
     return await hass.async_add_executor_job(_fetch_and_serialize_cert, url)
@@ -112,8 +222,9 @@ def _fetch_and_serialize_cert(url):
 
     """
     try:
-        hostname = url.replace("https://", "").replace("http://", "").split("/")[0]
-        port = 443
+        parts = urlsplit(format_url(url))
+        hostname = parts.hostname
+        port = parts.port or 443
 
         context = ssl.create_default_context()
         context.check_hostname = False
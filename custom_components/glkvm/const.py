@@ -23,8 +23,186 @@ ATX_ACTION_RESET_HARD = "reset_hard"
 API_ATX = "/api/atx"
 API_ATX_POWER = "/api/atx/power"
 API_INFO = "/api/info"
+API_PROMETHEUS_METRICS = "/api/export/prometheus/metrics"
+
+# Streamer API Endpoints
+API_STREAMER = "/api/streamer"
+API_STREAMER_SNAPSHOT = "/api/streamer/snapshot"
+API_STREAMER_STREAM = "/streamer/stream"
+
+# GPIO API Endpoints
+API_GPIO = "/api/gpio"
+API_GPIO_SWITCH = "/api/gpio/switch"
+API_GPIO_PULSE = "/api/gpio/pulse"
+
+# Websocket API Endpoint
+API_WS = "/api/ws"
+
+# Log API Endpoint
+API_LOG = "/api/log"
+
+# HID API Endpoints
+API_HID_PRINT = "/api/hid/print"
+API_HID_SEND_KEY = "/api/hid/events/send_key"
+API_HID_SEND_SHORTCUT = "/api/hid/events/send_shortcut"
+
+# MSD API Endpoints
+API_MSD_WRITE = "/api/msd/write"
+API_MSD_WRITE_REMOTE = "/api/msd/write_remote"
+
+# Refresh tiers (seconds)
+UPDATE_INTERVAL = 30
+SLOW_UPDATE_INTERVAL = 300
+STREAMER_UPDATE_INTERVAL = 10
+# Timeout of the single attempt made when a config entry is set up
+PROBE_TIMEOUT = 3
+# Seconds a resolved device address stays pinned before it is re-resolved
+RESOLVE_TTL = 300
+# Connections kept open per device: poll, streamer, snapshots, MJPEG stream,
+# log follower and a virtual media transfer can all be in flight at once
+HTTP_POOL_MAXSIZE = 6
+
+# Websocket push events
+WS_HEARTBEAT = 30
+WS_RECONNECT_DELAY = 10
+# Seconds a sender waits for the websocket to connect
+WS_CONNECT_TIMEOUT = 10
+# Seconds the websocket stays open after the last sender, so bursts of
+# key and mouse service calls reuse one authenticated connection
+WS_IDLE_TIMEOUT = 30
+WS_EVENT_STREAMER_STATE = "streamer_state"
+WS_EVENT_ATX_STATE = "atx_state"
+
+# Seconds a fetched ATX state may decide whether a power command is sent
+ATX_STATE_TTL = 2
+
+# Screen snapshots
+SNAPSHOT_CACHE_TTL = 2
+SNAPSHOT_PREVIEW_QUALITY = 80
+# Requested preview sizes are rounded up to this step so similar cards share
+SNAPSHOT_PREVIEW_STEP = 64
+
+# MJPEG proxy: frames buffered per viewer before the oldest is dropped
+STREAM_QUEUE_SIZE = 2
 
 # Shutdown mode options (for switch turn_off behavior)
 CONF_SHUTDOWN_MODE = "shutdown_mode"
 SHUTDOWN_MODE_GRACEFUL = "graceful"
 SHUTDOWN_MODE_FORCE = "force"
+
+# Options
+CONF_LOG_FOLLOW = "log_follow"
+CONF_LOG_PATTERNS = "log_patterns"
+DEFAULT_LOG_PATTERNS = "ERROR\nCRITICAL\nTraceback"
+CONF_OCR_REGIONS = "ocr_regions"
+CONF_ACTIVITY_WINDOW = "activity_window"
+# Seconds over which LED duty cycles are averaged
+DEFAULT_ACTIVITY_WINDOW = 60
+# What to do when the device presents a certificate other than the pinned one
+CONF_CERT_POLICY = "certificate_policy"
+CERT_POLICY_REPAIR = "repair"
+CERT_POLICY_ACCEPT = "accept"
+DEFAULT_CERT_POLICY = CERT_POLICY_REPAIR
+# Talk to the device API over HTTP/2 (needs the h2 package)
+CONF_HTTP2 = "http2"
+# Degrees Celsius the SoC temperature must move before its sensor is written
+CONF_HEALTH_DEADBAND = "health_deadband"
+DEFAULT_HEALTH_DEADBAND = 1.0
+
+# Services
+SERVICE_TYPE_TEXT = "type_text"
+SERVICE_MSD_UPLOAD = "msd_upload"
+SERVICE_MSD_CANCEL = "msd_cancel"
+SERVICE_MSD_WRITE_REMOTE = "msd_write_remote"
+SERVICE_RUN_MACRO = "run_macro"
+SERVICE_SAVE_MACRO = "save_macro"
+SERVICE_DELETE_MACRO = "delete_macro"
+SERVICE_SEND_KEYS = "send_keys"
+SERVICE_MOUSE = "mouse"
+ATTR_DEVICE_ID = "device_id"
+ATTR_TEXT = "text"
+ATTR_KEYMAP = "keymap"
+ATTR_METHOD = "method"
+ATTR_CHUNK_SIZE = "chunk_size"
+ATTR_CHUNK_DELAY = "chunk_delay"
+ATTR_SLOW = "slow"
+ATTR_PATH = "path"
+ATTR_IMAGE = "image"
+ATTR_URL = "url"
+ATTR_MAX_PARALLEL = "max_parallel"
+ATTR_NAME = "name"
+ATTR_STEPS = "steps"
+ATTR_KEYS = "keys"
+ATTR_REPEAT = "repeat"
+ATTR_HOLD = "hold"
+ATTR_INTERVAL = "interval"
+ATTR_WAIT = "wait"
+ATTR_ACTIONS = "actions"
+ATTR_MOVE = "move"
+ATTR_MOVE_BY = "move_by"
+ATTR_BUTTON = "button"
+ATTR_STATE = "state"
+ATTR_WHEEL = "wheel"
+
+# Text typing
+TYPE_METHOD_PRINT = "print"
+TYPE_METHOD_KEYS = "keys"
+DEFAULT_KEYMAP = "en-us"
+# Characters per /api/hid/print request; keeps each burst within the HID queue
+HID_PRINT_CHUNK_SIZE = 256
+HID_PRINT_CHUNK_DELAY = 0.25
+
+# Virtual media transfers
+MSD_CHUNK_SIZE = 1024 * 1024
+MSD_PROGRESS_INTERVAL = 1
+# Seconds the device waits on a stalled remote download
+MSD_REMOTE_TIMEOUT = 60
+MSD_REMOTE_MAX_PARALLEL = 4
+
+# Log follower
+EVENT_LOG = "glkvm_log"
+# Seconds of history requested when (re)connecting
+LOG_SEEK = 60
+LOG_BUFFER_LINES = 200
+LOG_MAX_LINE_LENGTH = 2048
+LOG_RECONNECT_DELAY = 30
+
+# Screen change detection
+EVENT_SCREEN_CHANGED = "glkvm_screen_changed"
+SCREEN_SAMPLE_INTERVAL = 15
+# Preview width requested from the device; the hash only needs 32x32 pixels
+SCREEN_SAMPLE_WIDTH = 128
+SCREEN_HASH_HISTORY = 4
+# Differing bits (out of 64) between two samples that count as a change
+SCREEN_CHANGE_THRESHOLD = 10
+
+# Screen region OCR
+OCR_UPDATE_INTERVAL = 30
+# Recognized texts kept by region digest
+OCR_CACHE_SIZE = 64
+# Bits dropped from each gray level before hashing a region (8 levels remain)
+OCR_DIGEST_LEVELS_SHIFT = 5
+# Longest text kept as sensor state; the full text is an attribute
+OCR_STATE_MAX_LENGTH = 255
+
+# LED history
+# LED transitions kept per LED; a flickering disk LED fills this in minutes
+LED_HISTORY_SIZE = 4096
+
+# Last known state storage
+STORAGE_VERSION = 1
+# Seconds to coalesce saves of the last known state
+STORAGE_SAVE_DELAY = 60
+
+# Keyboard macros (milliseconds)
+MACRO_KEY_HOLD = 20
+MACRO_KEY_INTERVAL = 30
+
+# Mouse input
+MOUSE_BUTTONS = ["left", "right", "middle", "up", "down"]
+MOUSE_CLICK = "click"
+MOUSE_PRESS = "press"
+MOUSE_RELEASE = "release"
+# Range of absolute pointer coordinates, from one screen edge to the other
+MOUSE_ABS_MIN = -32768
+MOUSE_ABS_MAX = 32767
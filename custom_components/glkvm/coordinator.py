@@ -1,19 +1,58 @@
 """Manages fetching data from the GLKVM API."""
 
 import asyncio
+from collections.abc import Awaitable, Callable
 from datetime import timedelta
 import functools
 import logging
 import os
+import time
+from urllib.parse import urlsplit
 
 import requests
 from requests.auth import HTTPBasicAuth
 
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers import issue_registry as ir
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
 
-from .cert_handler import create_session_with_cert
-from .const import DOMAIN, API_INFO, API_ATX
+from .cert_handler import (
+    cert_fingerprint,
+    create_session_with_cert,
+    fetch_serialized_cert,
+)
+from .const import (
+    API_ATX,
+    API_GPIO,
+    API_INFO,
+    API_PROMETHEUS_METRICS,
+    API_STREAMER,
+    API_STREAMER_SNAPSHOT,
+    ATX_STATE_TTL,
+    CERT_POLICY_ACCEPT,
+    CONF_CERT_POLICY,
+    CONF_CERTIFICATE,
+    DEFAULT_CERT_POLICY,
+    DOMAIN,
+    PROBE_TIMEOUT,
+    SLOW_UPDATE_INTERVAL,
+    SNAPSHOT_CACHE_TTL,
+    SNAPSHOT_PREVIEW_QUALITY,
+    SNAPSHOT_PREVIEW_STEP,
+    STREAMER_UPDATE_INTERVAL,
+    UPDATE_INTERVAL,
+)
+from .cache import TTLCache
+from .hid_sender import GLKVMHidSender
+from .http2 import HTTP2_AVAILABLE, GLKVMHttp2Client
+from .led_history import AtxLedHistory
+from .msd import MsdTransfer
+from .stream_proxy import MjpegStreamProxy
+from .prometheus import parse_metrics
+from .resolver import GLKVMResolver
+from .screen import GLKVMScreenCoordinator
+from .utils import get_hw_health
+from .websocket import GLKVMEventStream
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -35,7 +74,13 @@ class GLKVMDataUpdateCoordinator(DataUpdateCoordinator):
     url: str = ""
 
     def __init__(
-        self, hass: HomeAssistant, url: str, username: str, password: str, cert: str
+        self,
+        hass: HomeAssistant,
+        url: str,
+        username: str,
+        password: str,
+        cert: str,
+        http2: bool = False,
     ) -> None:
         """Initialize."""
         self.hass = hass
@@ -43,15 +88,39 @@ class GLKVMDataUpdateCoordinator(DataUpdateCoordinator):
         self.username = username
         self.password = password
         self.cert = cert
+        self.resolver = GLKVMResolver(hass, urlsplit(self.url).hostname or "")
+        # Milliseconds of the last request per API path, for diagnostics
+        self.latency: dict[str, float] = {}
         self.session = None
+        self.use_http2 = http2
+        self.http2: GLKVMHttp2Client | None = None
         self.cert_file_path = None
         self.auth = HTTPBasicAuth(self.username, self.password)
+        self.metrics: dict[str, float] = {}
+        self.health: dict = {}
+        self.metrics_supported = True
+        self.gpio_supported = True
+        self._command_lock = asyncio.Lock()
+        self._last_slow_refresh: float | None = None
+        self._probing = False
+        self.snapshot_cache = TTLCache(SNAPSHOT_CACHE_TTL)
+        self.atx_cache = TTLCache(ATX_STATE_TTL, max_entries=1)
+        self.stream_proxy = MjpegStreamProxy(self)
+        self.msd_transfer: MsdTransfer | None = None
+        self.log_follower = None
+        self.ocr = None
+        self.store = None
         super().__init__(
             hass,
             _LOGGER,
             name=DOMAIN,
-            update_interval=timedelta(seconds=30),
+            update_interval=timedelta(seconds=UPDATE_INTERVAL),
         )
+        self.events = GLKVMEventStream(hass, self)
+        self.hid = GLKVMHidSender(hass, self.events)
+        self.led_history = AtxLedHistory(self.events)
+        self.streamer = GLKVMStreamerCoordinator(hass, self)
+        self.screen = GLKVMScreenCoordinator(hass, self)
 
     async def async_setup(self) -> None:
         """Async setup method to create session and handle async code."""
@@ -60,35 +129,150 @@ class GLKVMDataUpdateCoordinator(DataUpdateCoordinator):
     async def _create_session(self):
         """Create the session with the certificate."""
         self.auth = HTTPBasicAuth(self.username, self.password)
-        session_with_cert = await create_session_with_cert(self.cert)
+        old_session = self.session
+        session_with_cert = await create_session_with_cert(
+            self.hass, self.cert, self.resolver
+        )
         self.session, self.cert_file_path = session_with_cert
+        if old_session is not None:
+            # Requests still using it finish on their own connection
+            await self.hass.async_add_executor_job(old_session.close)
+        if self.use_http2 and not HTTP2_AVAILABLE:
+            _LOGGER.warning(
+                "HTTP/2 is enabled for %s but the h2 package is not installed, "
+                "using HTTP/1.1",
+                self.url,
+            )
+            self.use_http2 = False
+        if self.use_http2:
+            if self.http2 is not None:
+                await self.http2.async_close()
+            self.http2 = GLKVMHttp2Client(
+                self.url, self.username, self.password, self.cert, self.resolver
+            )
         if not self.session:
             _LOGGER.error("Failed to create session with certificate")
         else:
             _LOGGER.debug("Session created successfully")
 
+    async def async_shutdown(self) -> None:
+        """Stop polling and close every connection to the device.
+
+        Runs when the config entry is unloaded, which includes reloads, so
+        no pool, stream or websocket outlives the coordinator that opened it.
+        """
+        await super().async_shutdown()
+        for coordinator in (self.streamer, self.screen, self.ocr):
+            if coordinator is not None:
+                await coordinator.async_shutdown()
+        await self.stream_proxy.async_close()
+        if self.log_follower is not None:
+            await self.log_follower.async_stop()
+        await self.hid.async_close()
+        await self.events.async_close()
+        await self.resolver.async_close()
+        if self.http2 is not None:
+            await self.http2.async_close()
+        if self.session is not None:
+            session, self.session = self.session, None
+            await self.hass.async_add_executor_job(session.close)
+            _LOGGER.debug("Closed connections to %s", self.url)
+
+    async def async_set_certificate(self, cert: str) -> None:
+        """Pin a new device certificate without reloading the entry.
+
+        Requests made after this use a new session pinned to the certificate,
+        and the websocket reconnects with it.
+        """
+        if cert == self.cert:
+            return
+        self.cert = cert
+        await self._create_session()
+        await self.events.async_reconnect()
+
+    async def _async_check_certificate(self) -> bool:
+        """Check whether a TLS failure is caused by a rotated certificate.
+
+        The certificate the device presents now is fetched and compared with
+        the pinned one. A new certificate is pinned in place if the entry's
+        certificate policy accepts rotation; otherwise a repair issue asking
+        the user to confirm it is raised and the update fails. Returns True
+        if a new certificate was pinned.
+        """
+        entry = self.config_entry
+        if entry is None or not self.cert:
+            return False
+        current = await fetch_serialized_cert(self.hass, self.url)
+        if not current or cert_fingerprint(current) == cert_fingerprint(self.cert):
+            return False
+
+        fingerprint = cert_fingerprint(current)
+        issue_id = f"certificate_changed_{entry.entry_id}"
+        if entry.options.get(CONF_CERT_POLICY, DEFAULT_CERT_POLICY) != CERT_POLICY_ACCEPT:
+            ir.async_create_issue(
+                self.hass,
+                DOMAIN,
+                issue_id,
+                is_fixable=True,
+                severity=ir.IssueSeverity.ERROR,
+                translation_key="certificate_changed",
+                translation_placeholders={"name": entry.title, "fingerprint": fingerprint},
+                data={"entry_id": entry.entry_id, "certificate": current},
+            )
+            raise UpdateFailed(
+                f"The certificate of {self.url} changed (SHA-256 {fingerprint})"
+            )
+
+        _LOGGER.warning(
+            "The certificate of %s changed, pinning the new one (SHA-256 %s)",
+            self.url,
+            fingerprint,
+        )
+        await self.async_set_certificate(current)
+        self.hass.config_entries.async_update_entry(
+            entry, data={**entry.data, CONF_CERTIFICATE: current}
+        )
+        ir.async_delete_issue(self.hass, DOMAIN, issue_id)
+        return True
+
+    async def async_config_entry_first_refresh(self) -> None:
+        """Probe the device once with a short timeout.
+
+        An unreachable device fails setup within seconds with
+        ConfigEntryNotReady, leaving retries to Home Assistant's setup
+        retry schedule instead of holding the entry in setup.
+        """
+        self._probing = True
+        try:
+            await super().async_config_entry_first_refresh()
+        finally:
+            self._probing = False
+
     async def _async_update_data(self):
         """Fetch data from GLKVM API."""
-        max_retries = 5
+        max_retries = 1 if self._probing else 5
+        info_timeout = PROBE_TIMEOUT if self._probing else 10
         backoff_time = 2
+        repinned = False
+
+        # Connections keep the pinned address while it is re-resolved
+        self.resolver.async_refresh()
 
         retries = 0
         while retries < max_retries:
             try:
                 _LOGGER.debug("Fetching GLKVM Info at %s", self.url)
 
-                if not self.session:
-                    await self._create_session()
-
-                # Fetch device info
-                response = await self.hass.async_add_executor_job(
-                    functools.partial(
-                        self.session.get,
-                        f"{self.url}{API_INFO}",
-                        auth=self.auth,
-                        timeout=10,
+                if self.http2 is not None:
+                    # Multiplexed over one connection: one round trip for all
+                    response, data_atx, data_gpio = await asyncio.gather(
+                        self._async_get(API_INFO, info_timeout),
+                        self._async_fetch_atx(),
+                        self._async_fetch_gpio(),
                     )
-                )
+                else:
+                    response = await self._async_get(API_INFO, info_timeout)
+                    data_atx = data_gpio = None
 
                 if response.status_code == 401:
                     raise AuthenticationFailed("Invalid username or password")
@@ -96,26 +280,19 @@ class GLKVMDataUpdateCoordinator(DataUpdateCoordinator):
                 response.raise_for_status()
                 data_info = response.json().get("result", {})
 
-                # Fetch ATX status
-                try:
-                    response_atx = await self.hass.async_add_executor_job(
-                        functools.partial(
-                            self.session.get,
-                            f"{self.url}{API_ATX}",
-                            auth=self.auth,
-                            timeout=10,
-                        )
-                    )
-                    if response_atx.status_code == 200:
-                        data_atx = response_atx.json().get("result", {})
-                        data_info["atx"] = data_atx
-                        _LOGGER.debug("ATX status: %s", data_atx)
-                    else:
-                        _LOGGER.debug("ATX endpoint not available (status %s)", response_atx.status_code)
-                        data_info["atx"] = {}
-                except Exception as atx_err:
-                    _LOGGER.debug("Could not fetch ATX status: %s", atx_err)
-                    data_info["atx"] = {}
+                if self.http2 is None:
+                    data_atx = await self._async_fetch_atx()
+                    # Fetch every GPIO channel's model and state in one request
+                    data_gpio = await self._async_fetch_gpio()
+                data_info["atx"] = data_atx
+                data_info["gpio"] = data_gpio
+
+                if self._slow_tier_due():
+                    await self._async_refresh_slow_tier(data_info)
+                data_info["metrics"] = self.metrics
+                data_info["health"] = self.health
+                if self.store is not None:
+                    self.store.async_save(data_info)
 
                 _LOGGER.debug("Received GLKVM Info from %s", self.url)
                 return data_info
@@ -124,6 +301,17 @@ class GLKVMDataUpdateCoordinator(DataUpdateCoordinator):
                 _LOGGER.error("Authentication failed: %s", auth_err)
                 raise UpdateFailed(f"Authentication failed: {auth_err}") from auth_err
             except requests.exceptions.RequestException as err:
+                if (
+                    isinstance(err, requests.exceptions.SSLError)
+                    and not repinned
+                    and await self._async_check_certificate()
+                ):
+                    # Retry at once with the new certificate
+                    repinned = True
+                    continue
+                if isinstance(err, requests.exceptions.ConnectionError):
+                    # The device may have a new address by the next attempt
+                    self.resolver.async_refresh(force=True)
                 retries += 1
                 if retries < max_retries:
                     _LOGGER.warning(
@@ -134,9 +322,12 @@ class GLKVMDataUpdateCoordinator(DataUpdateCoordinator):
                     await asyncio.sleep(backoff_time)
                     backoff_time *= 2
                 else:
-                    _LOGGER.error(
-                        "Max retries exceeded. Error communicating with API: %s", err
-                    )
+                    # A failed probe is reported by config entry setup
+                    if not self._probing:
+                        _LOGGER.error(
+                            "Max retries exceeded. Error communicating with API: %s",
+                            err,
+                        )
                     raise UpdateFailed(f"Error communicating with API: {err}") from err
             except (ValueError, KeyError) as e:
                 _LOGGER.error("Data processing error: %s", e)
@@ -146,4 +337,261 @@ class GLKVMDataUpdateCoordinator(DataUpdateCoordinator):
                     os.remove(self.cert_file_path)
         return None
 
+    async def _async_get(self, path: str, timeout: float = 10) -> requests.Response:
+        """GET a path of the device API over HTTP/2 if enabled."""
+        start = time.monotonic()
+        if self.http2 is not None:
+            response = await self.http2.async_get(path, timeout)
+        else:
+            if not self.session:
+                await self._create_session()
+            response = await self.hass.async_add_executor_job(
+                functools.partial(
+                    self.session.get,
+                    f"{self.url}{path}",
+                    auth=self.auth,
+                    timeout=timeout,
+                )
+            )
+        self.latency[path] = round((time.monotonic() - start) * 1000, 1)
+        return response
+
+    async def _async_fetch_atx(self) -> dict:
+        """Fetch the ATX state, or {} if the device has no ATX."""
+        generation = self.atx_cache.generation
+        try:
+            data_atx = await self._async_load_atx()
+        except (requests.exceptions.RequestException, ValueError) as atx_err:
+            _LOGGER.debug("Could not fetch ATX status: %s", atx_err)
+            return {}
+        # Skip seeding if a command was sent while the poll was in flight
+        if self.atx_cache.generation == generation:
+            self.atx_cache.set(API_ATX, data_atx)
+        return data_atx
 
+    async def _async_load_atx(self) -> dict:
+        """Fetch the ATX state, or {} if the device has no ATX endpoint."""
+        response = await self._async_get(API_ATX)
+        if response.status_code != 200:
+            _LOGGER.debug("ATX endpoint not available (status %s)", response.status_code)
+            return {}
+        data_atx = response.json().get("result", {})
+        self.led_history.async_record(data_atx)
+        _LOGGER.debug("ATX status: %s", data_atx)
+        return data_atx
+
+    async def async_get_atx_state(self) -> dict:
+        """Return an ATX state fetched less than ATX_STATE_TTL seconds ago.
+
+        Commands that depend on the current power state use this instead of
+        the last poll, which can be UPDATE_INTERVAL seconds old. Concurrent
+        callers share one /api/atx request, and a recent poll is reused.
+        Raises requests.exceptions.RequestException or ValueError if the
+        state cannot be fetched.
+        """
+        return await self.atx_cache.async_get(API_ATX, self._async_load_atx)
+
+    async def _async_fetch_gpio(self) -> dict:
+        """Fetch the GPIO model and state, or {} if the device has none."""
+        if not self.gpio_supported:
+            return {}
+        try:
+            response = await self._async_get(API_GPIO)
+            if response.status_code == 404:
+                _LOGGER.debug("GPIO endpoint not available, not polling it again")
+                self.gpio_supported = False
+                return {}
+            response.raise_for_status()
+            return response.json().get("result", {})
+        except (requests.exceptions.RequestException, ValueError) as err:
+            _LOGGER.debug("Could not fetch GPIO state: %s", err)
+            return {}
+
+    async def async_send_command(
+        self,
+        path: str,
+        params: dict,
+        condition: Callable[[], Awaitable[bool]] | None = None,
+    ) -> bool:
+        """Send a control command to the device and refresh on success.
+
+        Commands for one device are serialized, so ATX actions and GPIO
+        switches or pulses never race each other on the device. A condition
+        is awaited under the same lock and the command is only sent if it
+        returns True, so a decision on the device state is never made on a
+        state another command is about to change.
+        """
+        async with self._command_lock:
+            if condition is not None and not await condition():
+                return False
+            try:
+                _LOGGER.debug("Sending command %s %s to %s", path, params, self.url)
+                response = await self.async_post(path, params=params)
+            except requests.exceptions.RequestException as err:
+                _LOGGER.error("Error sending command %s %s: %s", path, params, err)
+                return False
+            finally:
+                # The command may have changed the state the cache holds
+                self.atx_cache.invalidate()
+        if response.status_code != 200:
+            _LOGGER.error(
+                "Command %s %s failed with status %s: %s",
+                path,
+                params,
+                response.status_code,
+                response.text,
+            )
+            return False
+        _LOGGER.info("Command %s %s sent successfully", path, params)
+        await self.async_request_refresh()
+        return True
+
+    def _slow_tier_due(self) -> bool:
+        """Return True if the slow refresh tier should run on this update."""
+        return (
+            self._last_slow_refresh is None
+            or time.monotonic() - self._last_slow_refresh >= SLOW_UPDATE_INTERVAL
+        )
+
+    async def _async_refresh_slow_tier(self, data_info: dict) -> None:
+        """Refresh the data sources that change slowly.
+
+        Failures here never fail the whole update; the previous values are kept
+        and retried on the next slow tick. Hardware health comes with every
+        /api/info answer but is only taken on this tick.
+        """
+        self._last_slow_refresh = time.monotonic()
+        self.health = get_hw_health(data_info)
+        if self.metrics_supported:
+            try:
+                metrics = await self.hass.async_add_executor_job(self._fetch_metrics)
+            except requests.exceptions.RequestException as err:
+                _LOGGER.debug("Could not fetch Prometheus metrics: %s", err)
+            else:
+                if metrics is not None:
+                    self.metrics = metrics
+
+    def _fetch_metrics(self) -> dict[str, float] | None:
+        """Fetch and parse the Prometheus export. Runs in the executor."""
+        with self.session.get(
+            f"{self.url}{API_PROMETHEUS_METRICS}",
+            auth=self.auth,
+            timeout=10,
+            stream=True,
+        ) as response:
+            if response.status_code in (401, 403, 404):
+                # Export disabled or not provided by this firmware; stop asking
+                _LOGGER.debug(
+                    "Prometheus export not available (status %s)",
+                    response.status_code,
+                )
+                self.metrics_supported = False
+                return None
+            response.raise_for_status()
+            return parse_metrics(response.iter_lines())
+
+    async def async_post(
+        self, path: str, params=None, data=None, timeout: float = 10
+    ) -> requests.Response:
+        """Send a POST request to the device with the coordinator's session."""
+        if not self.session:
+            await self._create_session()
+        return await self.hass.async_add_executor_job(
+            functools.partial(
+                self.session.post,
+                f"{self.url}{path}",
+                params=params,
+                data=data,
+                auth=self.auth,
+                timeout=timeout,
+            )
+        )
+
+    async def async_get_snapshot(
+        self, width: int | None = None, height: int | None = None
+    ) -> bytes:
+        """Return a JPEG screen snapshot, optionally downscaled on the device.
+
+        Snapshots go through a short TTL cache, so any number of concurrent
+        callers asking for the same size cause a single device fetch.
+        """
+        width = _round_up(width)
+        height = _round_up(height)
+        return await self.snapshot_cache.async_get(
+            (width, height),
+            functools.partial(
+                self.hass.async_add_executor_job, self._fetch_snapshot, width, height
+            ),
+        )
+
+    def _fetch_snapshot(self, width: int | None, height: int | None) -> bytes:
+        """Fetch a snapshot from the streamer. Runs in the executor."""
+        params = {"allow_offline": 1}
+        if width or height:
+            params["preview"] = 1
+            params["preview_quality"] = SNAPSHOT_PREVIEW_QUALITY
+            if width:
+                params["preview_max_width"] = width
+            if height:
+                params["preview_max_height"] = height
+        response = self.session.get(
+            f"{self.url}{API_STREAMER_SNAPSHOT}",
+            params=params,
+            auth=self.auth,
+            timeout=10,
+        )
+        response.raise_for_status()
+        return response.content
+
+
+class GLKVMStreamerCoordinator(DataUpdateCoordinator):
+    """Fetch the video streamer state on its own refresh tier.
+
+    The streamer query is heavier than the ATX poll, so it is kept off the
+    main coordinator. Like any DataUpdateCoordinator it only polls while it
+    has listeners, i.e. while at least one streamer entity is enabled.
+    """
+
+    def __init__(
+        self, hass: HomeAssistant, device: GLKVMDataUpdateCoordinator
+    ) -> None:
+        """Initialize."""
+        self.device = device
+        super().__init__(
+            hass,
+            _LOGGER,
+            name=f"{DOMAIN} streamer",
+            update_interval=timedelta(seconds=STREAMER_UPDATE_INTERVAL),
+        )
+
+    @property
+    def url(self) -> str:
+        """Return the device URL."""
+        return self.device.url
+
+    async def _async_update_data(self) -> dict:
+        """Fetch the streamer state."""
+        try:
+            response = await self.device._async_get(API_STREAMER)
+            response.raise_for_status()
+            result = response.json().get("result", {})
+        except (requests.exceptions.RequestException, ValueError) as err:
+            raise UpdateFailed(f"Error fetching streamer state: {err}") from err
+        # "streamer" is null while the capture service is not running
+        return result.get("streamer") or {}
+
+    @callback
+    def async_handle_push(self, event: dict) -> None:
+        """Take the streamer state from a streamer_state websocket event.
+
+        Setting the data also pushes the next poll back, so polling only
+        happens when the device has been quiet for a whole interval.
+        """
+        self.async_set_updated_data(event.get("streamer") or {})
+
+
+def _round_up(size: int | None) -> int | None:
+    """Round a requested preview dimension up to the preview step."""
+    if not size:
+        return None
+    return -(-size // SNAPSHOT_PREVIEW_STEP) * SNAPSHOT_PREVIEW_STEP
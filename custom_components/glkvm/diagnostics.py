@@ -10,6 +10,7 @@ from typing import Any
 from homeassistant.config_entries import ConfigEntry, ConfigEntryState
 from homeassistant.core import HomeAssistant
 
+from .cert_handler import connection_stats
 from .const import DOMAIN
 
 _LOGGER = logging.getLogger(__name__)
@@ -19,7 +20,8 @@ async def async_get_config_entry_diagnostics(
     hass: HomeAssistant, config_entry: ConfigEntry
 ) -> Mapping[str, Any]:
     """Return diagnostics for a config entry."""
-    coordinator = hass.data[DOMAIN].get(config_entry.entry_id)
+    runtime = hass.data[DOMAIN].get(config_entry.entry_id)
+    coordinator = runtime.coordinator if runtime else None
 
     diagnostics_data = {
         "config_entry": _mask_sensitive_data(_expand_mapping_proxy(vars(config_entry))),
@@ -38,6 +40,35 @@ async def async_get_config_entry_diagnostics(
         else {},
     }
 
+    if coordinator:
+        diagnostics_data["connections"] = {
+            "http": connection_stats(coordinator.session),
+            "http2": {
+                "http_version": coordinator.http2.http_version,
+                "requests": coordinator.http2.requests,
+            }
+            if coordinator.http2
+            else None,
+            "websocket_connected": coordinator.events.connected,
+            "hid": {
+                "events": coordinator.hid.events_sent,
+                "frames": coordinator.hid.frames_sent,
+            },
+            "stream_viewers": coordinator.stream_proxy.viewers,
+            "resolver": coordinator.resolver.as_dict(),
+        }
+        # Milliseconds spent per step of talking to the device
+        diagnostics_data["latency"] = {
+            "resolve": coordinator.resolver.resolve_ms,
+            **coordinator.latency,
+        }
+
+    if coordinator and coordinator.log_follower:
+        diagnostics_data["log"] = {
+            "matched": coordinator.log_follower.matched,
+            "recent_lines": list(coordinator.log_follower.buffer),
+        }
+
     # Sanitize diagnostics data before serialization
     sanitized_data = _sanitize_data(diagnostics_data)
 
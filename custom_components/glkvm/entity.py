@@ -1,19 +1,28 @@
 """GLKVM entity base class."""
 
+from collections.abc import Callable
+from dataclasses import dataclass
 import logging
+from typing import Any, TypeVar
 
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import callback
 from homeassistant.helpers.device_registry import DeviceInfo
+from homeassistant.helpers.entity import EntityDescription
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
+from .const import CONF_CERTIFICATE, CONF_HOST, CONF_SERIAL, DOMAIN, MANUFACTURER
 from .coordinator import GLKVMDataUpdateCoordinator
+from .utils import format_url
 
 _LOGGER = logging.getLogger(__name__)
 
+_EntityT = TypeVar("_EntityT", bound="GLKVMEntity")
+
 
 class GLKVMEntity(CoordinatorEntity):
     """Base class for a GLKVM entity."""
 
-    DEVICE_INFO: DeviceInfo | None = None
     coordinator: GLKVMDataUpdateCoordinator
 
     def __init__(
@@ -22,7 +31,145 @@ class GLKVMEntity(CoordinatorEntity):
         """Initialize the entity."""
         super().__init__(coordinator)
         self.coordinator = coordinator
-        self._attr_device_info = self.DEVICE_INFO
         self._attr_unique_id_base = unique_id_base
 
 
+@dataclass(frozen=True, kw_only=True)
+class GLKVMEntityDescription(EntityDescription):
+    """Describes an entity whose state is derived from coordinator data.
+
+    The functions receive the coordinator data (never None) and must not
+    have side effects; they are evaluated once per coordinator update.
+    """
+
+    value_fn: Callable[[dict], Any] = lambda data: None
+    available_fn: Callable[[dict], bool] = lambda data: True
+    attrs_fn: Callable[[dict], dict[str, Any]] | None = None
+
+
+class GLKVMDescribedEntity(GLKVMEntity):
+    """Entity driven by a GLKVMEntityDescription.
+
+    The description is evaluated once per coordinator update and the
+    result is cached; properties only read the cache, and the state is
+    written only if the result (or the coordinator's success) changed.
+    """
+
+    entity_description: GLKVMEntityDescription
+
+    def __init__(
+        self,
+        coordinator,
+        unique_id_base: str,
+        device_name: str,
+        description: GLKVMEntityDescription,
+    ) -> None:
+        """Initialize the entity."""
+        super().__init__(coordinator, unique_id_base)
+        self.entity_description = description
+        self._attr_unique_id = f"{unique_id_base}_{description.key}"
+        self._attr_name = f"{device_name} {description.name}"
+        self._result: tuple | None = None
+        self._last_update_success: bool | None = None
+        self._evaluate()
+
+    def _evaluate(self) -> bool:
+        """Evaluate the description, returning True if the result changed."""
+        data = self.coordinator.data or {}
+        description = self.entity_description
+        available = description.available_fn(data)
+        result = (
+            available,
+            description.value_fn(data) if available else None,
+            description.attrs_fn(data) if description.attrs_fn and available else None,
+            bool(data.get("restored")),
+        )
+        if result == self._result:
+            return False
+        self._result = result
+        return True
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Write the state if the evaluated result changed."""
+        changed = self._evaluate()
+        if changed or self._last_update_success != self.coordinator.last_update_success:
+            self._last_update_success = self.coordinator.last_update_success
+            self.async_write_ha_state()
+
+    @property
+    def available(self) -> bool:
+        """Return True if the coordinator and the description report data."""
+        return super().available and self._result[0]
+
+    @property
+    def value(self) -> Any:
+        """Return the cached value."""
+        return self._result[1]
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any] | None:
+        """Return the cached attributes."""
+        attributes = dict(self._result[2] or {})
+        if self._result[3]:
+            attributes["restored"] = True
+        return attributes or None
+
+
+class GLKVMEntryRuntime:
+    """State of one config entry shared by its platforms.
+
+    Device info, unique ID base and device name are derived once when the
+    entry is set up, and every entity of the entry is built through
+    ``create`` so it is attached to this entry's device and no other.
+    """
+
+    def __init__(self, entry: ConfigEntry, coordinator: GLKVMDataUpdateCoordinator) -> None:
+        """Initialize the runtime data from the entry and the first device data."""
+        self.coordinator = coordinator
+        serial = entry.data.get(CONF_SERIAL, entry.entry_id)
+        self.unique_id_base = f"{entry.entry_id}_{serial}"
+        self.device_name = entry.title or "GLKVM"
+        self._settings = _settings(entry)
+
+        # Safely extract device info with fallbacks
+        system = coordinator.data.get("system", {}) if coordinator.data else {}
+        platform = system.get("platform", {})
+        kvmd = system.get("kvmd", {})
+
+        self.device_info = DeviceInfo(
+            identifiers={(DOMAIN, entry.data[CONF_SERIAL])},
+            configuration_url=format_url(entry.data[CONF_HOST]),
+            serial_number=entry.data[CONF_SERIAL],
+            manufacturer=MANUFACTURER,
+            name=entry.title,
+            # Use base field for model (e.g., "Rockchip RV1126B-P EVB V14 Board")
+            model=platform.get("base") or entry.data.get("model", "GLKVM"),
+            hw_version=platform.get("model"),  # e.g., "v3"
+            sw_version=kvmd.get("version"),
+        )
+
+    def is_certificate_change(self, entry: ConfigEntry) -> bool:
+        """Return True if nothing but the certificate changed since setup."""
+        return _settings(entry) == self._settings
+
+    def create(
+        self, entity_class: type[_EntityT], *args: Any, coordinator: Any = None
+    ) -> _EntityT:
+        """Build an entity of this entry.
+
+        The entity gets the entry's coordinator unless another one (e.g.
+        the streamer coordinator) is given, followed by the unique ID base,
+        the device name and any extra arguments.
+        """
+        entity = entity_class(
+            coordinator or self.coordinator, self.unique_id_base, self.device_name, *args
+        )
+        entity._attr_device_info = self.device_info
+        return entity
+
+
+def _settings(entry: ConfigEntry) -> tuple:
+    """Return what the entry was set up from, apart from the certificate."""
+    data = {key: value for key, value in entry.data.items() if key != CONF_CERTIFICATE}
+    return entry.title, data, dict(entry.options)
@@ -0,0 +1,127 @@
+"""Keyboard helpers for sending text to the host through kvmd's HID API."""
+
+import json
+import string
+
+# Web key codes (KeyboardEvent.code) for the US layout
+_UNSHIFTED = {
+    **{c: f"Key{c.upper()}" for c in string.ascii_lowercase},
+    **{d: f"Digit{d}" for d in string.digits},
+    " ": "Space",
+    "\n": "Enter",
+    "\t": "Tab",
+    "-": "Minus",
+    "=": "Equal",
+    "[": "BracketLeft",
+    "]": "BracketRight",
+    "\\": "Backslash",
+    ";": "Semicolon",
+    "'": "Quote",
+    "`": "Backquote",
+    ",": "Comma",
+    ".": "Period",
+    "/": "Slash",
+}
+_SHIFTED = {
+    **{c: f"Key{c}" for c in string.ascii_uppercase},
+    "!": "Digit1",
+    "@": "Digit2",
+    "#": "Digit3",
+    "$": "Digit4",
+    "%": "Digit5",
+    "^": "Digit6",
+    "&": "Digit7",
+    "*": "Digit8",
+    "(": "Digit9",
+    ")": "Digit0",
+    "_": "Minus",
+    "+": "Equal",
+    "{": "BracketLeft",
+    "}": "BracketRight",
+    "|": "Backslash",
+    ":": "Semicolon",
+    '"': "Quote",
+    "~": "Backquote",
+    "<": "Comma",
+    ">": "Period",
+    "?": "Slash",
+}
+
+
+def _build_keymap() -> dict[str, tuple[str, bool]]:
+    """Build the character to (key code, shift) table."""
+    keymap = {char: (code, False) for char, code in _UNSHIFTED.items()}
+    keymap.update({char: (code, True) for char, code in _SHIFTED.items()})
+    return keymap
+
+
+# Built once at import; looked up per character when typing with key events
+KEYMAP_EN_US = _build_keymap()
+
+
+def unmapped_characters(text: str) -> list[str]:
+    """Return the characters of text that have no key in KEYMAP_EN_US."""
+    return list(dict.fromkeys(char for char in text if char not in KEYMAP_EN_US))
+
+
+def chunk_text(text: str, size: int) -> list[str]:
+    """Split text into chunks of at most size characters.
+
+    A chunk is cut after its last newline when that keeps it at least half
+    full, so lines of a pasted script are not split across HID bursts.
+    """
+    chunks = []
+    start = 0
+    while start < len(text):
+        end = min(start + size, len(text))
+        if end < len(text):
+            newline = text.rfind("\n", start, end)
+            if newline >= start + size // 2:
+                end = newline + 1
+        chunks.append(text[start:end])
+        start = end
+    return chunks
+
+
+# Largest relative mouse movement kvmd accepts per axis in one delta
+MOUSE_DELTA_LIMIT = 127
+
+
+def key_frame(key: str, pressed: bool) -> str:
+    """Return the websocket frame of a key event."""
+    return json.dumps({"event_type": "key", "event": {"key": key, "state": pressed}})
+
+
+def mouse_button_frame(button: str, pressed: bool) -> str:
+    """Return the websocket frame of a mouse button event."""
+    return json.dumps(
+        {"event_type": "mouse_button", "event": {"button": button, "state": pressed}}
+    )
+
+
+def mouse_move_frame(x: int, y: int) -> str:
+    """Return the websocket frame moving the pointer to absolute coordinates."""
+    return json.dumps({"event_type": "mouse_move", "event": {"to": {"x": x, "y": y}}})
+
+
+def mouse_relative_frame(dx: int, dy: int) -> str:
+    """Return the websocket frame of a relative move of any size.
+
+    kvmd limits each delta to +-127 per axis, so larger moves are sent as a
+    list of deltas in the one frame.
+    """
+    deltas = []
+    while dx or dy or not deltas:
+        step_x = max(-MOUSE_DELTA_LIMIT, min(MOUSE_DELTA_LIMIT, dx))
+        step_y = max(-MOUSE_DELTA_LIMIT, min(MOUSE_DELTA_LIMIT, dy))
+        deltas.append({"x": step_x, "y": step_y})
+        dx -= step_x
+        dy -= step_y
+    return json.dumps(
+        {"event_type": "mouse_relative", "event": {"delta": deltas, "squash": True}}
+    )
+
+
+def mouse_wheel_frame(dx: int, dy: int) -> str:
+    """Return the websocket frame of a wheel scroll."""
+    return json.dumps({"event_type": "mouse_wheel", "event": {"delta": {"x": dx, "y": dy}}})
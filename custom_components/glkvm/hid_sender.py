@@ -0,0 +1,179 @@
+"""Low-latency key and mouse input over the kvmd websocket.
+
+Every device has one sender. Service calls append their events to its queue
+and one writer task drains the queue through the device's websocket, so
+input costs a frame on an open authenticated connection instead of an HTTP
+request each. The writer sends everything that is queued back to back under
+the HID lock, so the keystrokes of a call go out as one burst and are never
+interleaved with a macro.
+
+Pointer moves that are still queued when the writer reaches them are
+coalesced: consecutive absolute moves collapse into the last one and
+consecutive relative moves into their sum. A fast stream of move calls then
+costs the host one frame per write instead of replaying every intermediate
+position late.
+
+Each call learns when its events were written, as the latency from being
+queued to leaving on the socket; a coalesced event counts as written with
+the move that replaced it.
+"""
+
+import asyncio
+from collections import deque
+import logging
+
+import aiohttp
+
+from homeassistant.core import HomeAssistant, callback
+
+from .hid import (
+    key_frame,
+    mouse_button_frame,
+    mouse_move_frame,
+    mouse_relative_frame,
+    mouse_wheel_frame,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+EVENT_KEY = "key"
+EVENT_BUTTON = "button"
+EVENT_MOVE = "move"
+EVENT_MOVE_BY = "move_by"
+EVENT_WHEEL = "wheel"
+
+
+def _frame(kind: str, value: tuple) -> str:
+    """Return the websocket frame of a queued event."""
+    if kind == EVENT_KEY:
+        return key_frame(*value)
+    if kind == EVENT_BUTTON:
+        return mouse_button_frame(*value)
+    if kind == EVENT_MOVE:
+        return mouse_move_frame(*value)
+    if kind == EVENT_MOVE_BY:
+        return mouse_relative_frame(*value)
+    return mouse_wheel_frame(*value)
+
+
+class _Batch:
+    """The events of one call and the latencies they were written with."""
+
+    def __init__(self, count: int) -> None:
+        """Initialize the batch."""
+        self.pending = count
+        self.latencies: list[float] = []
+        self.frames = 0
+        self.future: asyncio.Future[None] = asyncio.get_running_loop().create_future()
+
+    def written(self, latency: float) -> None:
+        """Record one event as written."""
+        self.latencies.append(latency)
+        self.pending -= 1
+        if not self.pending and not self.future.done():
+            self.future.set_result(None)
+
+    def failed(self, err: Exception) -> None:
+        """Fail the call waiting for the batch."""
+        if not self.future.done():
+            self.future.set_exception(err)
+
+
+class GLKVMHidSender:
+    """Queue of key and mouse events written to one device's websocket."""
+
+    def __init__(self, hass: HomeAssistant, stream) -> None:
+        """Initialize the sender."""
+        self.hass = hass
+        self.stream = stream
+        self.events_sent = 0
+        self.frames_sent = 0
+        # [kind, value, queued at, batch]
+        self._queue: deque[list] = deque()
+        self._task: asyncio.Task | None = None
+
+    async def async_send(self, events: list[tuple[str, tuple]]) -> dict:
+        """Send (kind, value) events in order and report their latency.
+
+        Raises aiohttp.ClientError if the websocket cannot be opened or drops
+        before every event was written.
+        """
+        if not events:
+            return {"events": 0, "frames": 0}
+        batch = _Batch(len(events))
+        now = self.hass.loop.time()
+        self._queue.extend([kind, value, now, batch] for kind, value in events)
+        self._async_ensure_writer()
+        await batch.future
+        return {
+            "events": len(events),
+            "frames": batch.frames,
+            "mean_latency_ms": round(sum(batch.latencies) * 1000 / len(events), 2),
+            "max_latency_ms": round(max(batch.latencies) * 1000, 2),
+        }
+
+    @callback
+    def _async_ensure_writer(self) -> None:
+        """Start the writer task if it is not running."""
+        if self._task is None or self._task.done():
+            # Not eager: callers queuing in the same loop iteration must get
+            # their events in before the writer drains the queue
+            self._task = self.hass.async_create_background_task(
+                self._async_write(),
+                f"glkvm hid {self.stream.coordinator.url}",
+                eager_start=False,
+            )
+
+    async def _async_write(self) -> None:
+        """Write queued events until the queue is empty."""
+        loop = self.hass.loop
+        written: list[tuple[float, _Batch]] = []
+        try:
+            async with self.stream.hid_lock, self.stream.async_channel():
+                while self._queue:
+                    kind, value, queued_at, batch = self._queue.popleft()
+                    written = [(queued_at, batch)]
+                    while (
+                        kind in (EVENT_MOVE, EVENT_MOVE_BY)
+                        and self._queue
+                        and self._queue[0][0] == kind
+                    ):
+                        _, next_value, queued_at, batch = self._queue.popleft()
+                        written.append((queued_at, batch))
+                        if kind == EVENT_MOVE:
+                            value = next_value
+                        else:
+                            value = (value[0] + next_value[0], value[1] + next_value[1])
+                    await self.stream.async_send_str(_frame(kind, value))
+                    now = loop.time()
+                    self.frames_sent += 1
+                    self.events_sent += len(written)
+                    for batch in {id(batch): batch for _, batch in written}.values():
+                        batch.frames += 1
+                    for queued_at, batch in written:
+                        batch.written(now - queued_at)
+                    written = []
+        except (aiohttp.ClientError, ConnectionError) as err:
+            _LOGGER.debug("HID input to %s failed: %s", self.stream.coordinator.url, err)
+            self._fail(written, err)
+        except asyncio.CancelledError:
+            self._fail(written, aiohttp.ClientConnectionError("The device was unloaded"))
+            raise
+
+    def _fail(self, written: list[tuple[float, _Batch]], err: Exception) -> None:
+        """Fail the calls of unwritten events and empty the queue."""
+        for _, batch in written:
+            batch.failed(err)
+        while self._queue:
+            self._queue.popleft()[3].failed(err)
+
+    async def async_close(self) -> None:
+        """Stop the writer, failing the events still queued."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        self._fail([], aiohttp.ClientConnectionError("The device was unloaded"))
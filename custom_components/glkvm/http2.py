@@ -0,0 +1,162 @@
+"""Optional HTTP/2 transport for the device API.
+
+kvmd's nginx front end can speak HTTP/2. With the HTTP/2 option enabled and
+the h2 package installed, the coordinator's API requests go through one
+httpx client instead of the requests session, so the requests of a refresh
+are multiplexed over a single TLS connection and cost one round trip instead
+of one each. A device that does not negotiate h2 is talked to over HTTP/1.1
+by the same client, and a protocol error on the HTTP/2 connection switches
+the client to HTTP/1.1 for good.
+
+Responses are handed back as requests.Response objects and transport errors
+as requests exceptions, so callers handle both transports the same way. The
+pinned certificate fingerprint is checked as part of every TLS handshake, so
+no request, and no credentials, are sent to a device presenting another
+certificate. Requests are sent to the resolver's pinned address with the
+host name kept in the Host header and TLS SNI.
+"""
+
+import hashlib
+import importlib.util
+import logging
+import ssl
+
+import httpx
+import requests
+from requests.structures import CaseInsensitiveDict
+
+from .cert_handler import cert_fingerprint
+from .const import HTTP_POOL_MAXSIZE
+from .resolver import GLKVMResolver
+
+_LOGGER = logging.getLogger(__name__)
+
+HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+
+def _pinned_ssl_object(fingerprint: str) -> type[ssl.SSLObject]:
+    """Return an SSLObject class whose handshake checks the peer fingerprint."""
+
+    class PinnedSSLObject(ssl.SSLObject):
+        """TLS connection that fails its handshake on another certificate."""
+
+        def do_handshake(self) -> None:
+            """Complete the handshake, then compare the peer certificate."""
+            super().do_handshake()
+            digest = hashlib.sha256(self.getpeercert(binary_form=True)).hexdigest()
+            if digest != fingerprint:
+                raise ssl.SSLError(
+                    f'Fingerprints did not match. Expected "{fingerprint}", got "{digest}"'
+                )
+
+    return PinnedSSLObject
+
+
+class GLKVMHttp2Client:
+    """Async HTTP client for one device, preferring HTTP/2."""
+
+    def __init__(
+        self,
+        url: str,
+        username: str,
+        password: str,
+        cert: str | None,
+        resolver: GLKVMResolver | None = None,
+    ) -> None:
+        """Initialize the client."""
+        self.url = url
+        self._resolver = resolver
+        self.http2 = True
+        self.http_version: str | None = None
+        self.requests = 0
+        self._auth = httpx.BasicAuth(username, password)
+        self._fingerprint = cert_fingerprint(cert) if cert else None
+        self._client = self._build_client()
+
+    def _build_client(self) -> httpx.AsyncClient:
+        """Create the httpx client with a context pinning the certificate.
+
+        The chain is not checked: kvmd's certificate is self-signed, and
+        the fingerprint pins the one recorded at setup instead.
+        """
+        # A context per client: httpcore sets its ALPN protocols on it
+        context = ssl.SSLContext(ssl.PROTOCOL_TLS_CLIENT)
+        context.check_hostname = False
+        context.verify_mode = ssl.CERT_NONE
+        if self._fingerprint is not None:
+            context.sslobject_class = _pinned_ssl_object(self._fingerprint)
+        return httpx.AsyncClient(
+            http2=self.http2,
+            verify=context,
+            auth=self._auth,
+            limits=httpx.Limits(
+                max_connections=HTTP_POOL_MAXSIZE,
+                max_keepalive_connections=HTTP_POOL_MAXSIZE,
+            ),
+        )
+
+    async def async_get(self, path: str, timeout: float = 10) -> requests.Response:
+        """GET a path of the device API."""
+        url = httpx.URL(f"{self.url}{path}")
+        headers = extensions = None
+        if self._resolver is not None and url.host == self._resolver.host:
+            address = await self._resolver.async_get()
+            if address != url.host:
+                headers = {"Host": url.netloc.decode("ascii")}
+                extensions = {"sni_hostname": url.host}
+                url = url.copy_with(host=address)
+        try:
+            response = await self._client.get(
+                url, headers=headers, extensions=extensions, timeout=timeout
+            )
+        except httpx.RemoteProtocolError as err:
+            if not self.http2:
+                raise requests.exceptions.ConnectionError(str(err)) from err
+            _LOGGER.warning(
+                "HTTP/2 failed for %s (%s), falling back to HTTP/1.1", self.url, err
+            )
+            await self.async_fall_back()
+            return await self.async_get(path, timeout)
+        except httpx.TimeoutException as err:
+            raise requests.exceptions.Timeout(str(err)) from err
+        except httpx.ConnectError as err:
+            if _caused_by_ssl_error(err):
+                raise requests.exceptions.SSLError(str(err)) from err
+            raise requests.exceptions.ConnectionError(str(err)) from err
+        except httpx.TransportError as err:
+            raise requests.exceptions.ConnectionError(str(err)) from err
+
+        self.requests += 1
+        self.http_version = response.http_version
+        return _to_requests_response(response)
+
+    async def async_fall_back(self) -> None:
+        """Replace the client with one that only speaks HTTP/1.1."""
+        await self._client.aclose()
+        self.http2 = False
+        self._client = self._build_client()
+
+    async def async_close(self) -> None:
+        """Close every connection of the client."""
+        await self._client.aclose()
+
+
+def _caused_by_ssl_error(err: BaseException | None) -> bool:
+    """Return True if an SSLError is among the causes of an error."""
+    while err is not None:
+        if isinstance(err, ssl.SSLError):
+            return True
+        err = err.__cause__ or err.__context__
+    return False
+
+
+def _to_requests_response(response: httpx.Response) -> requests.Response:
+    """Return an httpx response as a requests response."""
+    result = requests.Response()
+    result.status_code = response.status_code
+    result.reason = response.reason_phrase
+    result.headers = CaseInsensitiveDict(response.headers)
+    result.url = str(response.url)
+    result.encoding = response.encoding
+    result._content = response.content
+    return result
@@ -0,0 +1,116 @@
+"""History of the ATX power and HDD LEDs.
+
+kvmd polls the ATX LEDs several times per second and pushes an atx_state
+event on the websocket whenever one changes, so recording every event gives
+the LED timeline at the device's own sampling rate. Each LED keeps its
+transitions in a fixed-size ring buffer of two flat arrays (timestamps and
+states), so a busy disk costs a constant few kilobytes per device. Duty
+cycles over a window are computed from the timeline on demand.
+"""
+
+from array import array
+from collections.abc import Callable
+import time
+
+from homeassistant.core import CALLBACK_TYPE, callback
+
+from .const import LED_HISTORY_SIZE, WS_EVENT_ATX_STATE
+
+LEDS = ("power", "hdd")
+
+
+class LedRingBuffer:
+    """Fixed-size ring buffer of LED state transitions."""
+
+    def __init__(self, size: int = LED_HISTORY_SIZE) -> None:
+        """Initialize the buffer."""
+        self._times = array("d", bytes(8 * size))
+        self._states = array("B", bytes(size))
+        self._size = size
+        self._next = 0
+        self._count = 0
+
+    def __len__(self) -> int:
+        """Return the number of stored transitions."""
+        return self._count
+
+    @property
+    def state(self) -> bool | None:
+        """Return the most recent state."""
+        if not self._count:
+            return None
+        return bool(self._states[self._next - 1])
+
+    def append(self, timestamp: float, state: bool) -> None:
+        """Record a sample; samples repeating the current state are dropped."""
+        if self._count and self._states[self._next - 1] == state:
+            return
+        self._times[self._next] = timestamp
+        self._states[self._next] = state
+        self._next = (self._next + 1) % self._size
+        self._count = min(self._count + 1, self._size)
+
+    def duty_cycle(self, now: float, window: float) -> float | None:
+        """Return the percentage of the window the LED was on.
+
+        If the buffer does not reach back to the start of the window, only
+        the covered part is used. Returns None without any samples.
+        """
+        if not self._count:
+            return None
+        start = now - window
+        end = now
+        on_time = 0.0
+        index = self._next
+        for _ in range(self._count):
+            index = (index - 1) % self._size
+            since = max(self._times[index], start)
+            if self._states[index]:
+                on_time += end - since
+            end = since
+            if since == start:
+                break
+        covered = now - end
+        return round(on_time * 100 / covered, 1) if covered > 0 else None
+
+
+class AtxLedHistory:
+    """LED timelines of one device, fed by ATX push events and polls."""
+
+    def __init__(self, events) -> None:
+        """Initialize the history."""
+        self.events = events
+        self.leds = {led: LedRingBuffer() for led in LEDS}
+        self._listeners = 0
+        self._unsubscribe: CALLBACK_TYPE | None = None
+
+    @callback
+    def async_record(self, atx: dict, timestamp: float | None = None) -> None:
+        """Record the LED states of an ATX state."""
+        timestamp = time.monotonic() if timestamp is None else timestamp
+        leds = atx.get("leds") or {}
+        for led, buffer in self.leds.items():
+            if led in leds:
+                buffer.append(timestamp, bool(leds[led]))
+
+    def duty_cycle(self, led: str, window: float) -> float | None:
+        """Return the percentage of the window an LED was on."""
+        return self.leds[led].duty_cycle(time.monotonic(), window)
+
+    @callback
+    def async_track(self) -> Callable[[], None]:
+        """Record push events while at least one caller is tracking."""
+        self._listeners += 1
+        if self._unsubscribe is None:
+            self._unsubscribe = self.events.async_subscribe(
+                WS_EVENT_ATX_STATE, self.async_record
+            )
+
+        @callback
+        def untrack() -> None:
+            self._listeners -= 1
+            if not self._listeners and self._unsubscribe is not None:
+                self._unsubscribe()
+                self._unsubscribe = None
+
+        return untrack
@@ -0,0 +1,153 @@
+"""Follow the kvmd log and turn matching lines into Home Assistant events.
+
+The log is read from /api/log?follow=1 on the event loop with aiohttp, and
+every line is handled as soon as it is read. Nothing is read ahead of that:
+while lines are being handled aiohttp stops reading the socket once its small
+buffer is full, which in turn lets the TCP window close on the device, so a
+chatty device slows down instead of growing memory. Lines are capped in
+length, the most recent ones are kept in a fixed-size ring buffer for
+diagnostics, and lines matching one of the configured patterns are fired as
+glkvm_log events. Stopping cancels the reading task, so it returns at once
+even while the device writes nothing.
+"""
+
+import asyncio
+from collections import deque
+from collections.abc import AsyncIterable, AsyncIterator
+import logging
+import re
+
+import aiohttp
+
+from homeassistant.core import HomeAssistant
+
+from .cert_handler import create_aiohttp_session
+from .const import (
+    API_LOG,
+    EVENT_LOG,
+    LOG_BUFFER_LINES,
+    LOG_MAX_LINE_LENGTH,
+    LOG_RECONNECT_DELAY,
+    LOG_SEEK,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+# The log stays quiet for as long as the device has nothing to say
+LOG_TIMEOUT = aiohttp.ClientTimeout(total=None, connect=10, sock_read=None)
+
+
+def compile_patterns(patterns: str) -> re.Pattern | None:
+    """Compile newline-separated patterns into one alternation.
+
+    Raises re.error if a pattern is invalid. Returns None if there are none.
+    """
+    parts = [line.strip() for line in patterns.splitlines() if line.strip()]
+    if not parts:
+        return None
+    for part in parts:
+        re.compile(part)
+    return re.compile("|".join(f"(?:{part})" for part in parts))
+
+
+async def async_iter_bounded_lines(
+    chunks: AsyncIterable[bytes], max_length: int
+) -> AsyncIterator[bytes]:
+    """Split a byte stream into lines, truncating lines longer than max_length."""
+    pending = bytearray()
+    overflow = False
+    async for chunk in chunks:
+        start = 0
+        while True:
+            end = chunk.find(b"\n", start)
+            if end < 0:
+                if not overflow:
+                    pending += chunk[start : start + max_length - len(pending)]
+                    overflow = len(pending) >= max_length
+                break
+            if not overflow:
+                pending += chunk[start : min(end, start + max_length - len(pending))]
+            yield bytes(pending)
+            pending.clear()
+            overflow = False
+            start = end + 1
+    if pending:
+        yield bytes(pending)
+
+
+class GLKVMLogFollower:
+    """Stream the kvmd log of one device."""
+
+    def __init__(
+        self, hass: HomeAssistant, coordinator, entry_id: str, patterns: str
+    ) -> None:
+        """Initialize the follower."""
+        self.hass = hass
+        self.coordinator = coordinator
+        self.entry_id = entry_id
+        self.pattern = compile_patterns(patterns)
+        self.buffer: deque[str] = deque(maxlen=LOG_BUFFER_LINES)
+        self.matched = 0
+        self._task: asyncio.Task | None = None
+
+    def async_start(self) -> None:
+        """Start following the log in the background."""
+        self._task = self.hass.async_create_background_task(
+            self._async_run(), f"glkvm log follower {self.coordinator.url}"
+        )
+
+    async def async_stop(self) -> None:
+        """Stop following the log."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _async_run(self) -> None:
+        """Follow the log until stopped, reconnecting on errors."""
+        while True:
+            try:
+                await self._async_follow()
+            except (aiohttp.ClientError, TimeoutError) as err:
+                _LOGGER.warning(
+                    "Log stream from %s failed: %s. Reconnecting in %s seconds",
+                    self.coordinator.url,
+                    err,
+                    LOG_RECONNECT_DELAY,
+                )
+            await asyncio.sleep(LOG_RECONNECT_DELAY)
+
+    async def _async_follow(self) -> None:
+        """Read one log stream, keeping a ring buffer and firing events."""
+        coordinator = self.coordinator
+        async with (
+            create_aiohttp_session(coordinator.cert, coordinator.resolver) as session,
+            session.get(
+                f"{coordinator.url}{API_LOG}",
+                params={"follow": 1, "seek": LOG_SEEK},
+                auth=aiohttp.BasicAuth(coordinator.username, coordinator.password),
+                timeout=LOG_TIMEOUT,
+            ) as response,
+        ):
+            response.raise_for_status()
+            chunks = response.content.iter_any()
+            async for raw in async_iter_bounded_lines(chunks, LOG_MAX_LINE_LENGTH):
+                if raw:
+                    self._handle(raw.decode("utf-8", errors="replace"))
+
+    def _handle(self, line: str) -> None:
+        """Buffer a log line and fire an event if it matches."""
+        self.buffer.append(line)
+        if self.pattern is not None and self.pattern.search(line):
+            self.matched += 1
+            self.hass.bus.async_fire(
+                EVENT_LOG,
+                {
+                    "entry_id": self.entry_id,
+                    "url": self.coordinator.url,
+                    "line": line,
+                },
+            )
@@ -0,0 +1,168 @@
+"""Keyboard macros replayed over the kvmd websocket.
+
+A macro is a timeline of key presses and releases. It is defined as a list
+of steps (keys, chords, text and waits), compiled once into that timeline and
+stored as delta-encoded ``[milliseconds since the previous event, key,
+pressed]`` rows, which keeps even long BIOS sequences to a few hundred bytes
+in Home Assistant storage.
+
+Before a replay every event is turned into its websocket frame. The replay
+loop then only sleeps until the next event's offset on the loop's monotonic
+clock and writes a prebuilt string. Offsets are measured from the start of
+the replay, so a late wakeup delays one event instead of everything after it.
+"""
+
+import asyncio
+import contextlib
+import logging
+
+import aiohttp
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.storage import Store
+
+from .const import (
+    ATTR_HOLD,
+    ATTR_INTERVAL,
+    ATTR_KEYS,
+    ATTR_REPEAT,
+    ATTR_TEXT,
+    ATTR_WAIT,
+    DOMAIN,
+    MACRO_KEY_HOLD,
+    MACRO_KEY_INTERVAL,
+    STORAGE_VERSION,
+)
+from .hid import KEYMAP_EN_US, key_frame
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def compile_steps(steps: list[dict]) -> list[list]:
+    """Compile macro steps into delta-encoded [delay ms, key, pressed] rows.
+
+    Each chord is pressed in order, held for ``hold`` ms, released in reverse
+    order and followed by an ``interval`` ms pause. Raises ValueError for
+    text that has no key on the US layout.
+    """
+    rows: list[list] = []
+    delay = 0
+    for step in steps:
+        if ATTR_WAIT in step:
+            delay += step[ATTR_WAIT]
+            continue
+        if ATTR_TEXT in step:
+            chords = []
+            for char in step[ATTR_TEXT]:
+                if (mapping := KEYMAP_EN_US.get(char)) is None:
+                    raise ValueError(f"No key for character {char!r}")
+                code, shift = mapping
+                chords.append(["ShiftLeft", code] if shift else [code])
+        else:
+            chords = [step[ATTR_KEYS]] * step.get(ATTR_REPEAT, 1)
+        hold = step.get(ATTR_HOLD, MACRO_KEY_HOLD)
+        interval = step.get(ATTR_INTERVAL, MACRO_KEY_INTERVAL)
+        for chord in chords:
+            for key in chord:
+                rows.append([delay, key, 1])
+                delay = 0
+            delay = hold
+            for key in reversed(chord):
+                rows.append([delay, key, 0])
+                delay = 0
+            delay = interval
+    return rows
+
+
+class Macro:
+    """A compiled macro with its websocket frames prebuilt."""
+
+    def __init__(self, rows: list[list]) -> None:
+        """Build the (offset seconds, key, pressed, frame) timeline."""
+        self.rows = rows
+        self.events: list[tuple[float, str, bool, str]] = []
+        offset = 0
+        for delay, key, pressed in rows:
+            offset += delay
+            self.events.append((offset / 1000, key, bool(pressed), key_frame(key, bool(pressed))))
+
+    @property
+    def duration(self) -> float:
+        """Return the offset of the last event in seconds."""
+        return self.events[-1][0] if self.events else 0.0
+
+
+async def async_play(stream, macro: Macro) -> dict:
+    """Replay a macro on a device's websocket and report its timing.
+
+    Keys still held when the replay is interrupted are released, so a
+    failed or cancelled macro never leaves a key down on the host.
+    """
+    loop = asyncio.get_running_loop()
+    pressed: set[str] = set()
+    lateness = 0.0
+    worst = 0.0
+    sent = 0
+    async with stream.hid_lock, stream.async_channel():
+        start = loop.time()
+        try:
+            for offset, key, state, frame in macro.events:
+                if (delay := start + offset - loop.time()) > 0:
+                    await asyncio.sleep(delay)
+                late = loop.time() - start - offset
+                lateness += late
+                worst = max(worst, late)
+                await stream.async_send_str(frame)
+                sent += 1
+                if state:
+                    pressed.add(key)
+                else:
+                    pressed.discard(key)
+        finally:
+            for key in pressed:
+                with contextlib.suppress(aiohttp.ClientError, ConnectionError):
+                    await stream.async_send_str(key_frame(key, False))
+        elapsed = loop.time() - start
+    return {
+        "events": sent,
+        "duration": round(elapsed, 3),
+        "mean_lateness_ms": round(lateness * 1000 / sent, 2) if sent else None,
+        "max_lateness_ms": round(worst * 1000, 2),
+    }
+
+
+class GLKVMMacroStore:
+    """Saved macros, shared by every device."""
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the store."""
+        self._store: Store[dict[str, list[list]]] = Store(
+            hass, STORAGE_VERSION, f"{DOMAIN}.macros"
+        )
+        self._rows: dict[str, list[list]] = {}
+        self._macros: dict[str, Macro] = {}
+
+    async def async_load(self) -> None:
+        """Load the saved macros."""
+        self._rows = await self._store.async_load() or {}
+
+    def get(self, name: str) -> Macro | None:
+        """Return a saved macro, building its frames on first use."""
+        if name not in self._macros and name in self._rows:
+            self._macros[name] = Macro(self._rows[name])
+        return self._macros.get(name)
+
+    async def async_save(self, name: str, rows: list[list]) -> Macro:
+        """Save a macro under a name, replacing any macro of that name."""
+        self._rows[name] = rows
+        self._macros[name] = Macro(rows)
+        await self._store.async_save(self._rows)
+        return self._macros[name]
+
+    async def async_delete(self, name: str) -> bool:
+        """Delete a macro, returning False if there is none of that name."""
+        if self._rows.pop(name, None) is None:
+            return False
+        self._macros.pop(name, None)
+        await self._store.async_save(self._rows)
+        return True
@@ -0,0 +1,298 @@
+"""Virtual media (MSD) image transfers to the GL.iNet KVM.
+
+Images are streamed from disk to kvmd's /api/msd/write in fixed-size chunks
+read into one reused buffer, so a multi-gigabyte ISO costs the same memory as
+a small one. Alternatively the device downloads an image from a URL itself
+through /api/msd/write_remote, and Home Assistant only follows the progress
+lines it streams back. Progress is kept on the coordinator and published to
+the transfer sensor at most once per second.
+"""
+
+import asyncio
+import json
+import logging
+import os
+import threading
+import time
+
+import requests
+
+from homeassistant.exceptions import HomeAssistantError
+
+from .const import (
+    API_MSD_WRITE,
+    API_MSD_WRITE_REMOTE,
+    MSD_CHUNK_SIZE,
+    MSD_PROGRESS_INTERVAL,
+    MSD_REMOTE_TIMEOUT,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+TRANSFER_QUEUED = "queued"
+TRANSFER_RUNNING = "running"
+TRANSFER_DONE = "done"
+TRANSFER_FAILED = "failed"
+TRANSFER_CANCELLED = "cancelled"
+
+
+class TransferCancelled(Exception):
+    """Raised from the request body when a transfer is cancelled."""
+
+
+class MsdTransfer:
+    """Progress of one image transfer to a device's mass storage."""
+
+    def __init__(self, image: str, total: int | None, source: str) -> None:
+        """Initialize the transfer."""
+        self.image = image
+        self.total = total
+        self.source = source
+        self.written = 0
+        self.state = TRANSFER_RUNNING
+        self.error: str | None = None
+        self.started = time.monotonic()
+        self.finished: float | None = None
+        self.cancel_event = threading.Event()
+
+    @property
+    def running(self) -> bool:
+        """Return True while the transfer is queued or in progress."""
+        return self.state in (TRANSFER_QUEUED, TRANSFER_RUNNING)
+
+    @property
+    def percent(self) -> float | None:
+        """Return the completed percentage, if the size is known."""
+        if not self.total:
+            return None
+        return round(self.written * 100 / self.total, 1)
+
+    @property
+    def throughput(self) -> float:
+        """Return the average throughput in bytes per second."""
+        elapsed = (self.finished or time.monotonic()) - self.started
+        return self.written / elapsed if elapsed > 0 else 0.0
+
+    def finish(self, state: str, error: str | None = None) -> None:
+        """Mark the transfer as finished."""
+        self.state = state
+        self.error = error
+        self.finished = time.monotonic()
+
+    def as_dict(self) -> dict:
+        """Return the transfer as a dict for attributes and diagnostics."""
+        return {
+            "image": self.image,
+            "source": self.source,
+            "state": self.state,
+            "written": self.written,
+            "total": self.total,
+            "percent": self.percent,
+            "throughput": round(self.throughput),
+            "error": self.error,
+        }
+
+
+class ChunkedFileBody:
+    """Request body that streams a file in fixed-size chunks.
+
+    Defines ``__len__`` so requests sends a Content-Length instead of
+    chunked transfer encoding, and yields views of a single reused buffer;
+    each view is fully sent before the next read overwrites it.
+    """
+
+    def __init__(self, path: str, transfer: MsdTransfer, on_progress) -> None:
+        """Initialize the body."""
+        self.path = path
+        self.transfer = transfer
+        self.on_progress = on_progress
+
+    def __len__(self) -> int:
+        """Return the file size."""
+        return self.transfer.total
+
+    def __iter__(self):
+        """Yield the file contents chunk by chunk."""
+        buffer = bytearray(MSD_CHUNK_SIZE)
+        view = memoryview(buffer)
+        last_report = 0.0
+        with open(self.path, "rb", buffering=0) as file:
+            while True:
+                if self.transfer.cancel_event.is_set():
+                    raise TransferCancelled
+                size = file.readinto(buffer)
+                if not size:
+                    break
+                yield view[:size]
+                self.transfer.written += size
+                now = time.monotonic()
+                if now - last_report >= MSD_PROGRESS_INTERVAL:
+                    last_report = now
+                    self.on_progress()
+
+
+def start_transfer(coordinator, image: str, total: int | None, source: str) -> MsdTransfer:
+    """Register a new transfer on the coordinator, refusing if one is running."""
+    if coordinator.msd_transfer is not None and coordinator.msd_transfer.running:
+        raise HomeAssistantError(
+            f"An image transfer to {coordinator.url} is already running"
+        )
+    transfer = MsdTransfer(image, total, source)
+    coordinator.msd_transfer = transfer
+    coordinator.async_update_listeners()
+    return transfer
+
+
+def image_size(path: str) -> int:
+    """Return the size of a local image file. Blocking; raises OSError."""
+    if not os.path.isfile(path):
+        raise OSError(f"{path} is not a file")
+    return os.path.getsize(path)
+
+
+async def async_upload_image(coordinator, transfer: MsdTransfer) -> MsdTransfer:
+    """Stream the local image of a registered transfer to the mass storage.
+
+    Every failure is recorded on the transfer rather than raised, since
+    this runs as a background task with nobody awaiting it.
+    """
+    path, image = transfer.source, transfer.image
+
+    def on_progress() -> None:
+        coordinator.hass.loop.call_soon_threadsafe(coordinator.async_update_listeners)
+
+    try:
+        response = await coordinator.async_post(
+            API_MSD_WRITE,
+            params={"image": image, "remove_incomplete": 1},
+            data=ChunkedFileBody(path, transfer, on_progress),
+            timeout=(10, 300),
+        )
+        response.raise_for_status()
+    except TransferCancelled:
+        _LOGGER.info("Upload of %s to %s cancelled", image, coordinator.url)
+        transfer.finish(TRANSFER_CANCELLED)
+    except (requests.exceptions.RequestException, OSError) as err:
+        _LOGGER.error("Upload of %s to %s failed: %s", image, coordinator.url, err)
+        transfer.finish(TRANSFER_FAILED, str(err))
+    else:
+        _LOGGER.info(
+            "Uploaded %s to %s at %.1f MB/s",
+            image,
+            coordinator.url,
+            transfer.throughput / (1024 * 1024),
+        )
+        transfer.finish(TRANSFER_DONE)
+    coordinator.async_update_listeners()
+    return transfer
+
+
+def queue_remote_writes(coordinators: list, url: str, image: str) -> list[MsdTransfer]:
+    """Register queued remote writes, refusing if any device is busy."""
+    busy = [
+        coordinator.url
+        for coordinator in coordinators
+        if coordinator.msd_transfer is not None and coordinator.msd_transfer.running
+    ]
+    if busy:
+        raise HomeAssistantError(
+            f"An image transfer is already running on {', '.join(busy)}"
+        )
+    transfers = []
+    for coordinator in coordinators:
+        transfer = start_transfer(coordinator, image, None, url)
+        transfer.state = TRANSFER_QUEUED
+        transfers.append(transfer)
+    return transfers
+
+
+async def async_write_remote_many(
+    coordinators: list, transfers: list[MsdTransfer], url: str, max_parallel: int
+) -> None:
+    """Have several devices download the same image, a few at a time."""
+    semaphore = asyncio.Semaphore(max_parallel)
+
+    async def run(coordinator, transfer: MsdTransfer) -> None:
+        async with semaphore:
+            if transfer.cancel_event.is_set():
+                transfer.finish(TRANSFER_CANCELLED)
+                coordinator.async_update_listeners()
+                return
+            await _async_write_remote(coordinator, transfer, url)
+
+    await asyncio.gather(
+        *(
+            run(coordinator, transfer)
+            for coordinator, transfer in zip(coordinators, transfers)
+        )
+    )
+
+
+async def _async_write_remote(coordinator, transfer: MsdTransfer, url: str) -> None:
+    """Ask the device to download an image and follow its progress."""
+    transfer.state = TRANSFER_RUNNING
+    transfer.started = time.monotonic()
+    coordinator.async_update_listeners()
+    try:
+        error = await coordinator.hass.async_add_executor_job(
+            _follow_write_remote, coordinator, transfer, url
+        )
+    except TransferCancelled:
+        _LOGGER.info("Remote write of %s on %s cancelled", transfer.image, coordinator.url)
+        transfer.finish(TRANSFER_CANCELLED)
+    except (requests.exceptions.RequestException, OSError, ValueError) as err:
+        _LOGGER.error(
+            "Remote write of %s on %s failed: %s", transfer.image, coordinator.url, err
+        )
+        transfer.finish(TRANSFER_FAILED, str(err))
+    else:
+        if error:
+            _LOGGER.error(
+                "Device %s could not fetch %s: %s", coordinator.url, url, error
+            )
+            transfer.finish(TRANSFER_FAILED, error)
+        else:
+            transfer.finish(TRANSFER_DONE)
+    coordinator.async_update_listeners()
+
+
+def _follow_write_remote(coordinator, transfer: MsdTransfer, url: str) -> str | None:
+    """Start a remote write and parse its progress stream. Runs in the executor.
+
+    kvmd answers with newline-delimited JSON: ``{"image": {"name", "size",
+    "written"}}`` progress records, or an ``error``/``error_msg`` record if the
+    download fails. Returns the device's error message, if any.
+    """
+    last_report = 0.0
+    with coordinator.session.post(
+        f"{coordinator.url}{API_MSD_WRITE_REMOTE}",
+        params={
+            "url": url,
+            "image": transfer.image,
+            "timeout": MSD_REMOTE_TIMEOUT,
+            "remove_incomplete": 1,
+        },
+        auth=coordinator.auth,
+        timeout=(10, MSD_REMOTE_TIMEOUT + 10),
+        stream=True,
+    ) as response:
+        response.raise_for_status()
+        for line in response.iter_lines():
+            if transfer.cancel_event.is_set():
+                # Dropping the connection makes the device abort the download
+                raise TransferCancelled
+            if not line:
+                continue
+            record = json.loads(line)
+            if "error" in record:
+                return record.get("error_msg") or record["error"]
+            info = record.get("image", {})
+            transfer.total = info.get("size") or transfer.total
+            transfer.written = info.get("written", transfer.written)
+            now = time.monotonic()
+            if now - last_report >= MSD_PROGRESS_INTERVAL:
+                last_report = now
+                coordinator.hass.loop.call_soon_threadsafe(
+                    coordinator.async_update_listeners
+                )
+    return None
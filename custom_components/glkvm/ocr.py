@@ -0,0 +1,154 @@
+"""Text recognition of configured screen regions.
+
+kvmd can OCR a region of the captured screen, but recognition is expensive on
+the device. Each refresh therefore takes one full snapshot (shared with the
+camera through the snapshot cache), crops every region and reduces it to a
+short digest of its coarsely quantized pixels. OCR is only requested for a
+region whose digest changed, and results are kept in a small LRU keyed by
+digest, so a screen flipping between known states is never recognized twice.
+An idle console costs one snapshot per refresh and no OCR at all.
+"""
+
+from collections import OrderedDict
+from datetime import timedelta
+import hashlib
+import io
+import logging
+
+import numpy as np
+from PIL import Image
+import requests
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
+
+from .const import (
+    API_STREAMER_SNAPSHOT,
+    DOMAIN,
+    OCR_CACHE_SIZE,
+    OCR_DIGEST_LEVELS_SHIFT,
+    OCR_UPDATE_INTERVAL,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+Region = tuple[int, int, int, int]
+
+
+def parse_ocr_regions(text: str) -> dict[str, Region]:
+    """Parse ``name: left, top, right, bottom`` lines into regions.
+
+    Raises ValueError if a line is malformed or a region is empty.
+    """
+    regions = {}
+    for line in text.splitlines():
+        if not line.strip():
+            continue
+        name, separator, box = line.partition(":")
+        name = name.strip()
+        if not separator or not name:
+            raise ValueError(f"Expected 'name: left, top, right, bottom', got {line!r}")
+        try:
+            left, top, right, bottom = (int(value) for value in box.split(","))
+        except ValueError as err:
+            raise ValueError(f"Region {name!r} needs four pixel coordinates") from err
+        if left < 0 or top < 0 or right <= left or bottom <= top:
+            raise ValueError(f"Region {name!r} is empty or negative")
+        if name in regions:
+            raise ValueError(f"Region {name!r} is defined twice")
+        regions[name] = (left, top, right, bottom)
+    return regions
+
+
+def region_digests(jpeg: bytes, regions: dict[str, Region]) -> dict[str, bytes]:
+    """Decode a snapshot once and return a digest of each region.
+
+    Pixels are reduced to grayscale and a few brightness levels before
+    hashing, so JPEG noise does not change the digest but text does.
+    """
+    with Image.open(io.BytesIO(jpeg)) as image:
+        gray = np.asarray(image.convert("L"))
+    digests = {}
+    for name, (left, top, right, bottom) in regions.items():
+        crop = gray[top:bottom, left:right] >> OCR_DIGEST_LEVELS_SHIFT
+        digests[name] = hashlib.blake2b(crop.tobytes(), digest_size=8).digest()
+    return digests
+
+
+class GLKVMOcrCoordinator(DataUpdateCoordinator):
+    """Recognize the text of screen regions, skipping unchanged ones.
+
+    Like any DataUpdateCoordinator it only polls while it has listeners,
+    i.e. while at least one OCR sensor is enabled.
+    """
+
+    def __init__(self, hass: HomeAssistant, device, regions: dict[str, Region]) -> None:
+        """Initialize."""
+        self.device = device
+        self.regions = regions
+        self.ocr_requests = 0
+        self.cache_hits = 0
+        self._digests: dict[str, bytes] = {}
+        self._cache: OrderedDict[bytes, str] = OrderedDict()
+        super().__init__(
+            hass,
+            _LOGGER,
+            name=f"{DOMAIN} ocr",
+            update_interval=timedelta(seconds=OCR_UPDATE_INTERVAL),
+        )
+
+    @property
+    def url(self) -> str:
+        """Return the device URL."""
+        return self.device.url
+
+    async def _async_update_data(self) -> dict[str, str | None]:
+        """Recognize the regions whose pixels changed since the last refresh."""
+        previous = self.data or {}
+        try:
+            jpeg = await self.device.async_get_snapshot()
+            digests = await self.hass.async_add_executor_job(
+                region_digests, jpeg, self.regions
+            )
+            texts = {}
+            for name, digest in digests.items():
+                if digest == self._digests.get(name) and name in previous:
+                    texts[name] = previous[name]
+                    continue
+                if digest in self._cache:
+                    self._cache.move_to_end(digest)
+                    self.cache_hits += 1
+                else:
+                    self._cache[digest] = await self.hass.async_add_executor_job(
+                        self._fetch_text, self.regions[name]
+                    )
+                    self.ocr_requests += 1
+                    if len(self._cache) > OCR_CACHE_SIZE:
+                        self._cache.popitem(last=False)
+                texts[name] = self._cache[digest]
+                self._digests[name] = digest
+        except requests.exceptions.RequestException as err:
+            raise UpdateFailed(f"Error recognizing screen text: {err}") from err
+        except OSError as err:
+            # PIL raises OSError for undecodable images
+            raise UpdateFailed(f"Error decoding snapshot: {err}") from err
+        return texts
+
+    def _fetch_text(self, region: Region) -> str:
+        """Have the device recognize the text of a region. Runs in the executor."""
+        left, top, right, bottom = region
+        response = self.device.session.get(
+            f"{self.url}{API_STREAMER_SNAPSHOT}",
+            params={
+                "allow_offline": 1,
+                "ocr": 1,
+                "ocr_left": left,
+                "ocr_top": top,
+                "ocr_right": right,
+                "ocr_bottom": bottom,
+            },
+            auth=self.device.auth,
+            timeout=30,
+        )
+        response.raise_for_status()
+        return response.text.strip()
@@ -1,6 +1,7 @@
 """Config flow to configure GL.iNet KVM."""
 
 import logging
+import re
 
 from homeassistant import config_entries
 
@@ -8,15 +9,21 @@ from .cert_handler import fetch_serialized_cert, is_glkvm_device
 from .const import (
     CONF_CERTIFICATE,
     CONF_HOST,
+    CONF_LOG_PATTERNS,
+    CONF_OCR_REGIONS,
     CONF_PASSWORD,
     DEFAULT_PASSWORD,
     DEFAULT_USERNAME,
     DOMAIN,
 )
+from .log_follower import compile_patterns
+from .ocr import parse_ocr_regions
 from .utils import (
     create_data_schema,
+    create_options_schema,
     format_url,
     get_translations,
+    split_options,
     update_existing_entry,
 )
 
@@ -40,6 +47,19 @@ class GLKVMOptionsFlowHandler(config_entries.OptionsFlow):
         _LOGGER.debug("Entered async_step_init with data: %s", user_input)
 
         if user_input is not None:
+            options = split_options(user_input)
+            try:
+                compile_patterns(options.get(CONF_LOG_PATTERNS, ""))
+            except re.error as err:
+                _LOGGER.error("Invalid log pattern: %s", err)
+                errors["base"] = "invalid_log_pattern"
+            try:
+                parse_ocr_regions(options.get(CONF_OCR_REGIONS, ""))
+            except ValueError as err:
+                _LOGGER.error("Invalid OCR region: %s", err)
+                errors["base"] = "invalid_ocr_region"
+
+        if user_input is not None and not errors:
             url = format_url(user_input[CONF_HOST])
             username = DEFAULT_USERNAME
             password = user_input.get(CONF_PASSWORD, DEFAULT_PASSWORD)
@@ -75,14 +95,14 @@ class GLKVMOptionsFlowHandler(config_entries.OptionsFlow):
 
                     if existing_entry:
                         update_existing_entry(self.hass, existing_entry, user_input)
-                        return self.async_create_entry(title="", data={})
+                        return self.async_create_entry(title="", data=options)
 
                     user_input["serial"] = response.serial
                     new_data = {**self.config_entry.data, **user_input}
                     self.hass.config_entries.async_update_entry(
                         self.config_entry, data=new_data
                     )
-                    return self.async_create_entry(title="", data={})
+                    return self.async_create_entry(title="", data=options)
                 else:
                     errors["base"] = "cannot_connect"
                     _LOGGER.error(
@@ -98,7 +118,7 @@ class GLKVMOptionsFlowHandler(config_entries.OptionsFlow):
                 CONF_HOST: default_url,
                 CONF_PASSWORD: default_password,
             }
-        )
+        ).extend(create_options_schema(self.config_entry.options))
 
         return self.async_show_form(
             step_id="init",
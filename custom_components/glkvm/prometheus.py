@@ -0,0 +1,65 @@
+"""Incremental parser for the kvmd Prometheus metrics export.
+
+kvmd publishes ATX, HID, MSD, streamer, GPIO and hardware gauges on
+/api/export/prometheus/metrics in the Prometheus text exposition format.
+The parser consumes the response line by line so the body never has to be
+held in memory as a whole, and drops every sample whose family is not
+whitelisted before it is decoded or converted.
+"""
+
+from collections.abc import Iterable
+import logging
+
+_LOGGER = logging.getLogger(__name__)
+
+# Metric families the integration maps to entities; everything else is skipped.
+METRIC_FAMILY_PREFIXES = (
+    b"pikvm_atx_",
+    b"pikvm_hid_",
+    b"pikvm_msd_",
+    b"pikvm_streamer_",
+    b"pikvm_gpio_",
+    b"pikvm_hw_",
+    b"pikvm_fan_",
+)
+
+
+def parse_metrics(
+    lines: Iterable[bytes | str],
+    prefixes: tuple[bytes, ...] = METRIC_FAMILY_PREFIXES,
+) -> dict[str, float]:
+    """Parse Prometheus text lines into a mapping of sample name to value.
+
+    Args:
+      lines: An iterable of lines, e.g. ``response.iter_lines()``.
+      prefixes: Metric family prefixes to keep.
+
+    Returns:
+      A dict keyed by sample name. Samples with labels are keyed by the name
+      followed by the label set exactly as exported, e.g. ``name{a="b"}``.
+
+    """
+    metrics: dict[str, float] = {}
+    for line in lines:
+        if isinstance(line, str):
+            line = line.encode("utf-8")
+        line = line.strip()
+        # Comments (# HELP / # TYPE) and blank lines never start with a prefix
+        if not line.startswith(prefixes):
+            continue
+        parts = line.rsplit(b"}", 1)
+        if len(parts) == 2:
+            name = parts[0] + b"}"
+            fields = parts[1].split()
+        else:
+            name, *fields = line.split()
+        if not fields:
+            continue
+        try:
+            # An optional timestamp may follow the value; it is ignored
+            value = float(fields[0])
+        except ValueError:
+            _LOGGER.debug("Skipping malformed metric line: %s", line)
+            continue
+        metrics[name.decode("utf-8")] = value
+    return metrics
@@ -0,0 +1,36 @@
+"""Repairs for the GL.iNet KVM integration."""
+
+from homeassistant import data_entry_flow
+from homeassistant.components.repairs import ConfirmRepairFlow, RepairsFlow
+from homeassistant.core import HomeAssistant
+
+from .const import CONF_CERTIFICATE
+
+
+class CertificateChangedRepairFlow(ConfirmRepairFlow):
+    """Pin the certificate a device presented after it changed.
+
+    The certificate is the one fetched when the issue was raised, so the
+    fingerprint the user confirms is exactly the one that gets pinned.
+    """
+
+    async def async_step_confirm(
+        self, user_input: dict[str, str] | None = None
+    ) -> data_entry_flow.FlowResult:
+        """Pin the new certificate once the user confirms it."""
+        if user_input is not None:
+            entry = self.hass.config_entries.async_get_entry(self.data["entry_id"])
+            if entry is not None:
+                # Applied in place by the entry's update listener
+                self.hass.config_entries.async_update_entry(
+                    entry,
+                    data={**entry.data, CONF_CERTIFICATE: self.data["certificate"]},
+                )
+        return await super().async_step_confirm(user_input)
+
+
+async def async_create_fix_flow(
+    hass: HomeAssistant, issue_id: str, data: dict[str, str] | None
+) -> RepairsFlow:
+    """Create a flow to fix a GLKVM issue."""
+    return CertificateChangedRepairFlow()
@@ -0,0 +1,218 @@
+"""Host name resolution with address pinning for the device connections.
+
+The default host, glkvm.local, is resolved over mDNS, which can take hundreds
+of milliseconds or fail outright on a busy network. Letting every new
+connection resolve it again makes each of them pay that cost and risk.
+Instead the host of each device is resolved once and the address is pinned:
+the requests session, the HTTP/2 client and the websocket all connect to the
+pinned address while still sending the host name in the Host header and TLS
+SNI.
+
+Once the pin is older than RESOLVE_TTL seconds it is refreshed in the
+background while connections keep using it. If resolution fails, the last
+address that resolved stays pinned, so a flaky mDNS responder does not take
+a device offline.
+"""
+
+import asyncio
+import ipaddress
+import logging
+import socket
+import threading
+import time
+
+from aiohttp.abc import AbstractResolver
+from aiohttp.resolver import ThreadedResolver
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+
+from homeassistant.core import HomeAssistant, callback
+
+from .const import RESOLVE_TTL
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class GLKVMResolver:
+    """Pinned address of one device's host name."""
+
+    def __init__(self, hass: HomeAssistant, host: str, ttl: float = RESOLVE_TTL) -> None:
+        """Initialize the resolver."""
+        self.hass = hass
+        self.host = host
+        self.ttl = ttl
+        try:
+            ipaddress.ip_address(host)
+        except ValueError:
+            self.literal = False
+            self.address: str | None = None
+        else:
+            self.literal = True
+            self.address = host
+        self.resolved_at: float | None = None
+        self.resolve_ms: float | None = None
+        self.resolutions = 0
+        self.failures = 0
+        self._lock = threading.Lock()
+        self._first_lookup = threading.Lock()
+        self._task: asyncio.Task | None = None
+
+    def _lookup(self) -> list[str]:
+        """Return the addresses of the host, in the system's preference order."""
+        infos = socket.getaddrinfo(self.host, None, type=socket.SOCK_STREAM)
+        return list(dict.fromkeys(info[4][0] for info in infos))
+
+    def resolve(self) -> str:
+        """Resolve the host and pin an address. Blocking; raises OSError."""
+        start = time.monotonic()
+        try:
+            addresses = self._lookup()
+            if not addresses:
+                raise OSError(f"No address for {self.host}")
+        except OSError:
+            self.failures += 1
+            raise
+        finally:
+            self.resolve_ms = round((time.monotonic() - start) * 1000, 1)
+        with self._lock:
+            # Stay on the pinned address while it still resolves
+            if self.address not in addresses:
+                if self.address is not None:
+                    _LOGGER.debug(
+                        "%s moved from %s to %s", self.host, self.address, addresses[0]
+                    )
+                self.address = addresses[0]
+            self.resolved_at = time.monotonic()
+            self.resolutions += 1
+            return self.address
+
+    def get(self) -> str:
+        """Return the pinned address, resolving now if there is none. Blocking.
+
+        Returns the host name itself if it cannot be resolved, so the
+        connection fails with the usual error.
+        """
+        if self.address is None:
+            # Connections opened together wait for one resolution
+            with self._first_lookup:
+                if self.address is None:
+                    try:
+                        self.resolve()
+                    except OSError as err:
+                        _LOGGER.debug("Could not resolve %s: %s", self.host, err)
+                        return self.host
+        return self.address
+
+    async def async_get(self) -> str:
+        """Return the pinned address, resolving in the executor if needed."""
+        if self.address is not None:
+            return self.address
+        return await self.hass.async_add_executor_job(self.get)
+
+    @property
+    def expired(self) -> bool:
+        """Return True if the pinned address is due to be resolved again.
+
+        A host that never resolved is resolved by the next connection.
+        """
+        if self.literal or self.resolved_at is None:
+            return False
+        return time.monotonic() - self.resolved_at > self.ttl
+
+    @callback
+    def async_refresh(self, force: bool = False) -> None:
+        """Re-resolve in the background if the pin expired or force is set."""
+        if not (force or self.expired) or self.literal:
+            return
+        if self._task is None or self._task.done():
+            self._task = self.hass.async_create_background_task(
+                self._async_refresh(), f"glkvm resolve {self.host}"
+            )
+
+    async def _async_refresh(self) -> None:
+        """Resolve again, keeping the last good address on failure."""
+        try:
+            await self.hass.async_add_executor_job(self.resolve)
+        except OSError as err:
+            _LOGGER.debug(
+                "Re-resolving %s failed, staying on %s: %s", self.host, self.address, err
+            )
+
+    async def async_close(self) -> None:
+        """Cancel a background resolution."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def as_dict(self) -> dict:
+        """Return the resolver state for diagnostics."""
+        return {
+            "host": self.host,
+            "address": self.address,
+            "age": round(time.monotonic() - self.resolved_at)
+            if self.resolved_at is not None
+            else None,
+            "resolve_ms": self.resolve_ms,
+            "resolutions": self.resolutions,
+            "failures": self.failures,
+        }
+
+
+def pinned_pool_classes(resolver: GLKVMResolver) -> dict[str, type]:
+    """Return urllib3 pool classes that connect to the pinned address."""
+
+    def pinned(base: type) -> type:
+        class PinnedConnectionPool(base):
+            """Pool whose new connections dial the pinned address."""
+
+            def _new_conn(self):
+                conn = super()._new_conn()
+                if self.host == resolver.host:
+                    # urllib3 dials _dns_host; Host header and SNI keep host
+                    conn._dns_host = resolver.get()
+                return conn
+
+        return PinnedConnectionPool
+
+    return {"http": pinned(HTTPConnectionPool), "https": pinned(HTTPSConnectionPool)}
+
+
+class PinnedAiohttpResolver(AbstractResolver):
+    """aiohttp resolver answering the device host with the pinned address."""
+
+    def __init__(self, resolver: GLKVMResolver) -> None:
+        """Initialize the resolver."""
+        self._resolver = resolver
+        # The aiodns DefaultResolver keeps a c-ares channel and its shutdown
+        # thread per instance; other hosts are rare enough for getaddrinfo
+        self._default = ThreadedResolver()
+
+    async def resolve(
+        self, host: str, port: int = 0, family: int = socket.AF_INET
+    ) -> list[dict]:
+        """Return the pinned address for the device host."""
+        if host == self._resolver.host:
+            address = await self._resolver.async_get()
+            try:
+                version = ipaddress.ip_address(address).version
+            except ValueError:
+                pass
+            else:
+                return [
+                    {
+                        "hostname": host,
+                        "host": address,
+                        "port": port,
+                        "family": socket.AF_INET6 if version == 6 else socket.AF_INET,
+                        "proto": 0,
+                        "flags": socket.AI_NUMERICHOST,
+                    }
+                ]
+        return await self._default.resolve(host, port, family)
+
+    async def close(self) -> None:
+        """Close the fallback resolver."""
+        await self._default.close()
@@ -0,0 +1,143 @@
+"""Screen change detection using perceptual hashes of snapshots.
+
+Each sample is a small preview snapshot that the device downscales itself.
+It is decoded straight to a tiny grayscale image (JPEG draft mode, so most
+of the image is never decompressed) and reduced to a 64-bit DCT perceptual
+hash with two 32x32 matrix products. Only a short hash history is kept per
+device, so a sample costs a few milliseconds of executor time and a few
+bytes of memory however many KVMs are watched.
+"""
+
+from collections import deque
+from datetime import timedelta
+import io
+import logging
+import time
+
+import numpy as np
+from PIL import Image
+import requests
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
+from homeassistant.util import dt as dt_util
+
+from .const import (
+    DOMAIN,
+    EVENT_SCREEN_CHANGED,
+    SCREEN_CHANGE_THRESHOLD,
+    SCREEN_HASH_HISTORY,
+    SCREEN_SAMPLE_INTERVAL,
+    SCREEN_SAMPLE_WIDTH,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+_HASH_SIZE = 8
+_IMAGE_SIZE = 32
+
+
+def _dct_matrix(size: int) -> np.ndarray:
+    """Return the orthonormal DCT-II matrix of the given size."""
+    k = np.arange(size)[:, None]
+    n = np.arange(size)[None, :]
+    matrix = np.cos(np.pi * (2 * n + 1) * k / (2 * size)) * np.sqrt(2 / size)
+    matrix[0] /= np.sqrt(2)
+    return matrix.astype(np.float32)
+
+
+# Only the low-frequency rows are needed, so the transform is precomputed once
+_DCT = _dct_matrix(_IMAGE_SIZE)[:_HASH_SIZE]
+_BIT_WEIGHTS = np.left_shift(
+    np.uint64(1), np.arange(_HASH_SIZE * _HASH_SIZE, dtype=np.uint64)
+)
+
+
+def grayscale_pixels(jpeg: bytes) -> np.ndarray:
+    """Decode a JPEG into a 32x32 grayscale float array."""
+    with Image.open(io.BytesIO(jpeg)) as image:
+        # Let the JPEG decoder downscale by up to 8x while decoding
+        image.draft("L", (_IMAGE_SIZE * 2, _IMAGE_SIZE * 2))
+        small = image.convert("L").resize((_IMAGE_SIZE, _IMAGE_SIZE), Image.BILINEAR)
+        return np.asarray(small, dtype=np.float32)
+
+
+def perceptual_hash(pixels: np.ndarray) -> int:
+    """Return the 64-bit DCT perceptual hash of a 32x32 grayscale image."""
+    coefficients = _DCT @ pixels @ _DCT.T
+    bits = (coefficients > np.median(coefficients)).ravel()
+    return int(np.sum(_BIT_WEIGHTS[bits]))
+
+
+def hamming_distance(first: int, second: int) -> int:
+    """Return the number of differing bits between two hashes."""
+    return (first ^ second).bit_count()
+
+
+def hash_snapshot(jpeg: bytes) -> int:
+    """Decode a snapshot and return its perceptual hash."""
+    return perceptual_hash(grayscale_pixels(jpeg))
+
+
+class GLKVMScreenCoordinator(DataUpdateCoordinator):
+    """Sample the host screen and detect meaningful changes.
+
+    Polls only while the screen change sensor is enabled. Fires a
+    glkvm_screen_changed event when the hash of a sample differs from the
+    previous one by at least SCREEN_CHANGE_THRESHOLD bits.
+    """
+
+    def __init__(self, hass: HomeAssistant, device) -> None:
+        """Initialize."""
+        self.device = device
+        self.history: deque[tuple[float, int]] = deque(maxlen=SCREEN_HASH_HISTORY)
+        self.last_changed = None
+        self._last_changed_monotonic: float | None = None
+        super().__init__(
+            hass,
+            _LOGGER,
+            name=f"{DOMAIN} screen",
+            update_interval=timedelta(seconds=SCREEN_SAMPLE_INTERVAL),
+        )
+
+    @property
+    def url(self) -> str:
+        """Return the device URL."""
+        return self.device.url
+
+    async def _async_update_data(self) -> dict:
+        """Take a sample and compare it with the previous one."""
+        try:
+            jpeg = await self.device.async_get_snapshot(SCREEN_SAMPLE_WIDTH)
+            started = time.perf_counter()
+            sample_hash = await self.hass.async_add_executor_job(hash_snapshot, jpeg)
+        except requests.exceptions.RequestException as err:
+            raise UpdateFailed(f"Error fetching snapshot: {err}") from err
+        except OSError as err:
+            # PIL raises OSError for undecodable images
+            raise UpdateFailed(f"Error decoding snapshot: {err}") from err
+        hash_time = time.perf_counter() - started
+
+        now = time.monotonic()
+        distance = (
+            hamming_distance(self.history[-1][1], sample_hash) if self.history else None
+        )
+        self.history.append((now, sample_hash))
+        if self._last_changed_monotonic is None:
+            self._last_changed_monotonic = now
+            self.last_changed = dt_util.utcnow()
+        elif distance is not None and distance >= SCREEN_CHANGE_THRESHOLD:
+            self._last_changed_monotonic = now
+            self.last_changed = dt_util.utcnow()
+            self.hass.bus.async_fire(
+                EVENT_SCREEN_CHANGED,
+                {"url": self.url, "distance": distance, "hash": f"{sample_hash:016x}"},
+            )
+
+        return {
+            "hash": f"{sample_hash:016x}",
+            "distance": distance,
+            "last_changed": self.last_changed,
+            "static_for": round(now - self._last_changed_monotonic),
+            "hash_ms": round(hash_time * 1000, 2),
+        }
@@ -1,22 +1,41 @@
 """Platform for GLKVM sensor integration."""
 
 from collections.abc import Mapping
+from dataclasses import dataclass
+from datetime import datetime, timedelta
 import logging
 
 from voluptuous import Any
 
-from homeassistant.components.binary_sensor import BinarySensorDeviceClass
+from homeassistant.components.sensor import (
+    SensorDeviceClass,
+    SensorEntity,
+    SensorEntityDescription,
+    SensorStateClass,
+)
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.const import UnitOfTemperature
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.event import async_track_time_interval
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
-
-from .const import DOMAIN
-from .entity import GLKVMEntity
+from homeassistant.util import slugify
+
+from .const import (
+    CONF_ACTIVITY_WINDOW,
+    CONF_HEALTH_DEADBAND,
+    DEFAULT_ACTIVITY_WINDOW,
+    DEFAULT_HEALTH_DEADBAND,
+    DOMAIN,
+    OCR_STATE_MAX_LENGTH,
+)
+from .entity import GLKVMDescribedEntity, GLKVMEntity, GLKVMEntityDescription
+from .ocr import Region
+from .utils import get_nested_value, parse_power_value
 
 _LOGGER = logging.getLogger(__name__)
 
 
-class GLKVMBaseSensor(GLKVMEntity):
+class GLKVMBaseSensor(GLKVMEntity, SensorEntity):
     """Base class for a GLKVM sensor."""
 
     def __init__(
@@ -32,7 +51,7 @@ class GLKVMBaseSensor(GLKVMEntity):
         super().__init__(coordinator, unique_id_base)
         self._attr_unique_id = f"{unique_id_base}_{sensor_type}"
         self._attr_name = name
-        self._attr_unit_of_measurement = unit
+        self._attr_native_unit_of_measurement = unit
         self._attr_icon = icon
         self._unique_id_base = unique_id_base
         self._sensor_type = sensor_type
@@ -40,100 +59,436 @@ class GLKVMBaseSensor(GLKVMEntity):
     @property
     def extra_state_attributes(self) -> Mapping[str, Any] | None:
         """Return the state attributes."""
-        return {"ip": self.coordinator.url}
+        attributes = {"ip": self.coordinator.url}
+        if (self.coordinator.data or {}).get("restored"):
+            attributes["restored"] = True
+        return attributes
 
     @property
-    def state(self) -> str | int | float | bool | None:
-        """Return the state of the sensor."""
+    def native_value(self) -> str | int | float | datetime | None:
+        """Return the value of the sensor."""
         raise NotImplementedError(
-            "The state method must be implemented by the subclass."
+            "The native_value property must be implemented by the subclass."
         )
 
 
-class GLKVMPowerStateSensor(GLKVMBaseSensor):
-    """Sensor for ATX power state."""
+@dataclass(frozen=True, kw_only=True)
+class GLKVMSensorEntityDescription(GLKVMEntityDescription, SensorEntityDescription):
+    """Describes a GLKVM sensor, including its unit and state class."""
 
-    def __init__(self, coordinator, unique_id_base, device_name) -> None:
+
+class GLKVMSensor(GLKVMDescribedEntity, SensorEntity):
+    """Sensor driven by an entity description."""
+
+    entity_description: GLKVMSensorEntityDescription
+
+    @property
+    def native_value(self):
+        """Return the evaluated value."""
+        return self.value
+
+    @property
+    def extra_state_attributes(self) -> Mapping[str, Any] | None:
+        """Return the state attributes."""
+        return {"ip": self.coordinator.url, **(super().extra_state_attributes or {})}
+
+
+def _atx(data: dict) -> dict:
+    """Return the ATX state."""
+    return data.get("atx") or {}
+
+
+def _atx_attributes(data: dict) -> dict:
+    """Return the LED states and any other scalar ATX values."""
+    atx = _atx(data)
+    attributes = {}
+    if leds := atx.get("leds"):
+        attributes["power_led"] = leds.get("power")
+        attributes["hdd_led"] = leds.get("hdd")
+    for key, value in atx.items():
+        if key != "leds" and not isinstance(value, dict):
+            attributes[key] = value
+    return attributes
+
+
+ATX_SENSORS = (
+    GLKVMSensorEntityDescription(
+        key="atx_power_state",
+        name="Power State",
+        icon="mdi:power",
+        available_fn=lambda data: "leds" in _atx(data) or "power" in _atx(data),
+        value_fn=lambda data: (
+            ("on" if parse_power_value(_atx(data)["power"]) else "off")
+            if "power" in _atx(data)
+            else None
+        ),
+        attrs_fn=_atx_attributes,
+    ),
+    GLKVMSensorEntityDescription(
+        key="atx_hdd_activity",
+        name="HDD Activity",
+        icon="mdi:harddisk",
+        available_fn=lambda data: "hdd" in (_atx(data).get("leds") or {}),
+        value_fn=lambda data: "active" if _atx(data)["leds"]["hdd"] else "idle",
+    ),
+)
+
+
+def _metric(metric: str, key: str, name: str, unit: str | None, icon: str, **kwargs):
+    """Describe a sensor for a sample of the kvmd Prometheus export.
+
+    Further keyword arguments, such as a device class, are passed on to the
+    entity description.
+    """
+
+    def value(data: dict) -> float | int:
+        sample = data["metrics"][metric]
+        return int(sample) if sample.is_integer() else sample
+
+    return GLKVMSensorEntityDescription(
+        key=key,
+        name=name,
+        native_unit_of_measurement=unit,
+        icon=icon,
+        available_fn=lambda data: metric in (data.get("metrics") or {}),
+        value_fn=value,
+        **kwargs,
+    )
+
+
+# Prometheus samples mapped to sensors
+METRIC_SENSORS = (
+    _metric("pikvm_atx_enabled", "metric_atx_enabled", "ATX Enabled", None, "mdi:power-plug"),
+    _metric("pikvm_atx_power", "metric_atx_power", "ATX Power LED", None, "mdi:led-on"),
+    _metric("pikvm_hid_online", "metric_hid_online", "HID Online", None, "mdi:keyboard"),
+    _metric("pikvm_msd_online", "metric_msd_online", "MSD Online", None, "mdi:usb-flash-drive"),
+    _metric(
+        "pikvm_streamer_source_online",
+        "metric_streamer_source_online",
+        "Video Source Online",
+        None,
+        "mdi:video-input-hdmi",
+    ),
+    _metric(
+        "pikvm_hw_temp_cpu",
+        "metric_hw_temp_cpu",
+        "CPU Temperature",
+        UnitOfTemperature.CELSIUS,
+        "mdi:thermometer",
+        device_class=SensorDeviceClass.TEMPERATURE,
+        state_class=SensorStateClass.MEASUREMENT,
+    ),
+    _metric(
+        "pikvm_hw_throttling_raw_flags",
+        "metric_hw_throttling",
+        "Throttling Flags",
+        None,
+        "mdi:speedometer-slow",
+    ),
+    _metric("pikvm_fan_state_fan_speed", "metric_fan_speed", "Fan Speed", "RPM", "mdi:fan"),
+)
+
+
+def _health(data: dict) -> dict:
+    """Return the hardware health taken on the last slow refresh."""
+    return data.get("health") or {}
+
+
+def _throttling_flags(data: dict, when: str) -> list[str]:
+    """Return the throttling flags set now or at some point since boot."""
+    flags = _health(data)["throttling"].get("parsed_flags") or {}
+    return sorted(
+        flag for flag, state in flags.items() if isinstance(state, dict) and state.get(when)
+    )
+
+
+# Health sensors duplicating a Prometheus sample, mapped to that metric
+HEALTH_METRICS = {
+    "hw_temp": "pikvm_hw_temp_cpu",
+    "hw_throttling": "pikvm_hw_throttling_raw_flags",
+}
+
+# Hardware health from /api/info, refreshed on the slow tier
+HEALTH_SENSORS = (
+    GLKVMSensorEntityDescription(
+        key="hw_temp",
+        name="SoC Temperature",
+        device_class=SensorDeviceClass.TEMPERATURE,
+        state_class=SensorStateClass.MEASUREMENT,
+        native_unit_of_measurement=UnitOfTemperature.CELSIUS,
+        icon="mdi:thermometer",
+        entity_registry_enabled_default=False,
+        available_fn=lambda data: "temp" in _health(data),
+        value_fn=lambda data: _health(data)["temp"],
+    ),
+    GLKVMSensorEntityDescription(
+        key="hw_throttling",
+        name="Throttling",
+        icon="mdi:speedometer-slow",
+        entity_registry_enabled_default=False,
+        available_fn=lambda data: "throttling" in _health(data),
+        value_fn=lambda data: ", ".join(_throttling_flags(data, "now")) or "none",
+        attrs_fn=lambda data: {
+            "raw_flags": _health(data)["throttling"].get("raw_flags"),
+            "since_boot": _throttling_flags(data, "past"),
+        },
+    ),
+    GLKVMSensorEntityDescription(
+        key="kvmd_version",
+        name="KVMD Version",
+        icon="mdi:information-outline",
+        entity_registry_enabled_default=False,
+        available_fn=lambda data: "kvmd_version" in _health(data),
+        value_fn=lambda data: _health(data)["kvmd_version"],
+    ),
+)
+
+
+class GLKVMHealthSensor(GLKVMSensor):
+    """Sensor for a hardware health value.
+
+    Numeric values are only written once they move by at least the
+    deadband from the last written value, so a temperature hovering around
+    a degree boundary does not fill the recorder.
+    """
+
+    def __init__(self, coordinator, unique_id_base, device_name, description, deadband):
+        """Initialize the sensor."""
+        self._deadband = deadband
+        super().__init__(coordinator, unique_id_base, device_name, description)
+
+    def _evaluate(self) -> bool:
+        """Keep the last result while a numeric value stays within the deadband."""
+        previous = self._result
+        if not super()._evaluate():
+            return False
+        if previous is not None and self._within_deadband(previous):
+            self._result = previous
+            return False
+        return True
+
+    def _within_deadband(self, previous: tuple) -> bool:
+        """Return True if only the value changed, by less than the deadband."""
+        value, last = self._result[1], previous[1]
+        return (
+            self._result[0] == previous[0]
+            and self._result[2:] == previous[2:]
+            and isinstance(value, (int, float))
+            and isinstance(last, (int, float))
+            and abs(value - last) < self._deadband
+        )
+
+
+class GLKVMLedActivitySensor(GLKVMBaseSensor):
+    """Sensor for the share of time an ATX LED was on over a window.
+
+    Computed from the LED history, which records every push event, and
+    written once per window rather than on every coordinator update, so
+    the recorder sees one smoothed value per window. Coordinator updates
+    only write the state when they change the availability.
+    """
+
+    _attr_state_class = SensorStateClass.MEASUREMENT
+
+    def __init__(
+        self, coordinator, unique_id_base, device_name, led, sensor_type, name, icon, window
+    ) -> None:
         """Initialize the sensor."""
         super().__init__(
             coordinator,
             unique_id_base,
-            "atx_power_state",
-            f"{device_name} Power State",
-            icon="mdi:power",
+            sensor_type,
+            f"{device_name} {name}",
+            unit="%",
+            icon=icon,
+        )
+        self._led = led
+        self._window = window
+        self._attr_suggested_display_precision = 1
+        self._value = None
+        self._written_available = None
+
+    async def async_added_to_hass(self) -> None:
+        """Record LED push events and publish the duty cycle once per window."""
+        await super().async_added_to_hass()
+        self.async_on_remove(self.coordinator.led_history.async_track())
+        self.async_on_remove(
+            async_track_time_interval(
+                self.hass, self._async_publish, timedelta(seconds=self._window)
+            )
         )
 
-    @property
-    def available(self):
-        """Return True if the sensor data is available."""
-        atx = self.coordinator.data.get("atx", {}) if self.coordinator.data else {}
-        return "leds" in atx or "power" in atx
-
-    @property
-    def state(self):
-        """Return the power state."""
-        atx = self.coordinator.data.get("atx", {}) if self.coordinator.data else {}
-
-        # Check atx.power first (string "on"/"off")
-        if "power" in atx:
-            power_value = atx["power"]
-            return self._parse_power_value(power_value)
+    @callback
+    def _async_publish(self, _now) -> None:
+        """Compute and write the duty cycle of the last window."""
+        self._value = self.coordinator.led_history.duty_cycle(self._led, self._window)
+        self._written_available = self.available
+        self.async_write_ha_state()
 
-        return None
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Write the state when the device becomes reachable or unreachable."""
+        if self.available != self._written_available:
+            self._written_available = self.available
+            self.async_write_ha_state()
 
-    def _parse_power_value(self, value):
-        """Parse various power value formats and return 'on' or 'off'."""
-        # Handle string values
-        if isinstance(value, str):
-            return "on" if value.lower() in ("on", "true", "1", "yes") else "off"
-        # Handle boolean and numeric values
-        return "on" if value else "off"
+    @property
+    def native_value(self):
+        """Return the duty cycle of the last window."""
+        return self._value
 
     @property
     def extra_state_attributes(self):
         """Return the state attributes."""
         attributes = super().extra_state_attributes
-        atx = self.coordinator.data.get("atx", {}) if self.coordinator.data else {}
-        if atx:
-            leds = atx.get("leds", {})
-            if leds:
-                attributes["power_led"] = leds.get("power")
-                attributes["hdd_led"] = leds.get("hdd")
-            # Include any other ATX data
-            for key, value in atx.items():
-                if key != "leds" and not isinstance(value, dict):
-                    attributes[key] = value
+        attributes["window"] = self._window
+        attributes["transitions"] = len(self.coordinator.led_history.leds[self._led])
         return attributes
 
 
-class GLKVMHDDActivitySensor(GLKVMBaseSensor):
-    """Sensor for HDD activity LED state."""
+def _streamer(path, key, name, unit, icon):
+    """Describe a sensor for a value of the streamer state."""
+    section, value = path
+    return GLKVMSensorEntityDescription(
+        key=key,
+        name=name,
+        native_unit_of_measurement=unit,
+        icon=icon,
+        entity_registry_enabled_default=False,
+        # Read directly: 0 clients or 0 fps is a value, not a missing one
+        value_fn=lambda data: (data.get(section) or {}).get(value),
+    )
+
+
+def _resolution(data: dict) -> str | None:
+    """Return the source resolution as WIDTHxHEIGHT."""
+    resolution = get_nested_value(data, ("source", "resolution"))
+    if not resolution:
+        return None
+    return f"{resolution.get('width')}x{resolution.get('height')}"
+
+
+# Streamer state mapped to sensors
+STREAMER_SENSORS = (
+    GLKVMSensorEntityDescription(
+        key="streamer_resolution",
+        name="Source Resolution",
+        icon="mdi:monitor-screenshot",
+        entity_registry_enabled_default=False,
+        value_fn=_resolution,
+    ),
+    _streamer(
+        ("source", "captured_fps"), "streamer_captured_fps", "Captured FPS", "fps", "mdi:speedometer"
+    ),
+    _streamer(
+        ("stream", "clients"), "streamer_clients", "Stream Clients", None, "mdi:account-multiple"
+    ),
+    _streamer(("encoder", "type"), "streamer_encoder", "Video Encoder", None, "mdi:video"),
+)
+
+
+class GLKVMOnDemandSensor(GLKVMSensor):
+    """Sensor backed by a coordinator that only refreshes while it is listened to.
+
+    These sensors are added without update_before_add, so a disabled sensor
+    never triggers a fetch; the first refresh happens once one is enabled.
+    """
+
+    async def async_added_to_hass(self) -> None:
+        """Fetch the data as soon as the sensor is enabled."""
+        await super().async_added_to_hass()
+        await self.coordinator.async_request_refresh()
+
+
+class GLKVMStreamerSensor(GLKVMOnDemandSensor):
+    """Sensor for a value of the video streamer state.
+
+    Backed by the streamer coordinator, which only polls while at least one
+    of these sensors is enabled. They are disabled by default.
+    """
+
+
+class GLKVMMsdTransferSensor(GLKVMBaseSensor):
+    """Sensor for the progress of a virtual media image transfer."""
 
     def __init__(self, coordinator, unique_id_base, device_name) -> None:
         """Initialize the sensor."""
         super().__init__(
             coordinator,
             unique_id_base,
-            "atx_hdd_activity",
-            f"{device_name} HDD Activity",
-            icon="mdi:harddisk",
+            "msd_transfer",
+            f"{device_name} MSD Transfer",
+            unit="%",
+            icon="mdi:upload",
         )
 
     @property
     def available(self):
-        """Return True if the sensor data is available."""
-        atx = self.coordinator.data.get("atx", {}) if self.coordinator.data else {}
-        leds = atx.get("leds", {})
-        return "hdd" in leds
+        """The sensor is available even while the device is unreachable."""
+        return True
 
     @property
-    def state(self):
-        """Return the HDD activity state."""
-        atx = self.coordinator.data.get("atx", {}) if self.coordinator.data else {}
-        leds = atx.get("leds", {})
-        if "hdd" in leds:
-            return "active" if leds["hdd"] else "idle"
-        return None
+    def native_value(self):
+        """Return the progress of the last transfer in percent."""
+        transfer = self.coordinator.msd_transfer
+        return transfer.percent if transfer else None
+
+    @property
+    def extra_state_attributes(self):
+        """Return the state attributes."""
+        attributes = super().extra_state_attributes
+        transfer = self.coordinator.msd_transfer
+        if transfer:
+            attributes.update(transfer.as_dict())
+        return attributes
+
+
+# Backed by the screen coordinator, which only samples snapshots while
+# this sensor is enabled
+SCREEN_CHANGED = GLKVMSensorEntityDescription(
+    key="screen_last_changed",
+    name="Screen Last Changed",
+    icon="mdi:monitor-eye",
+    device_class=SensorDeviceClass.TIMESTAMP,
+    entity_registry_enabled_default=False,
+    value_fn=lambda data: data.get("last_changed"),
+    attrs_fn=lambda data: {
+        key: data.get(key) for key in ("hash", "distance", "static_for")
+    },
+)
+
+
+def ocr_region_description(region: str, box: Region) -> GLKVMSensorEntityDescription:
+    """Describe the sensor for the text recognized in one screen region."""
+
+    def value(data: dict) -> str | None:
+        text = data.get(region)
+        return text[:OCR_STATE_MAX_LENGTH] if text is not None else None
+
+    return GLKVMSensorEntityDescription(
+        key=f"ocr_{slugify(region)}",
+        name=f"{region} Text",
+        icon="mdi:text-recognition",
+        value_fn=value,
+        attrs_fn=lambda data: {"region": list(box), "text": data.get(region)},
+    )
+
+
+class GLKVMOcrSensor(GLKVMOnDemandSensor):
+    """Sensor for the text recognized in one screen region.
+
+    The request and cache counters are kept on the coordinator rather than
+    in its data, so they are read when the state is written.
+    """
+
+    @property
+    def extra_state_attributes(self):
+        """Return the state attributes with the recognition counters."""
+        return {
+            **super().extra_state_attributes,
+            "ocr_requests": self.coordinator.ocr_requests,
+            "cache_hits": self.coordinator.cache_hits,
+        }
 
 
 async def async_setup_entry(
@@ -143,21 +498,67 @@ async def async_setup_entry(
 ) -> None:
     """Set up GLKVM sensors from a config entry."""
     _LOGGER.debug("Setting up GLKVM sensors from config entry")
-    coordinator = hass.data[DOMAIN][config_entry.entry_id]
-
-    # Get unique ID base
-    serial = config_entry.data.get("serial", config_entry.entry_id)
-    unique_id_base = f"{config_entry.entry_id}_{serial}"
-
-    # Get device name
-    device_name = config_entry.title or "GLKVM"
+    runtime = hass.data[DOMAIN][config_entry.entry_id]
+    coordinator = runtime.coordinator
 
     sensors = [
-        GLKVMPowerStateSensor(coordinator, unique_id_base, device_name),
-        GLKVMHDDActivitySensor(coordinator, unique_id_base, device_name),
+        *(runtime.create(GLKVMSensor, description) for description in ATX_SENSORS),
+        runtime.create(GLKVMMsdTransferSensor),
     ]
 
+    window = int(config_entry.options.get(CONF_ACTIVITY_WINDOW, DEFAULT_ACTIVITY_WINDOW))
+    sensors.extend(
+        runtime.create(GLKVMLedActivitySensor, *description, window)
+        for description in (
+            ("hdd", "atx_disk_activity", "Disk Activity", "mdi:harddisk"),
+            ("power", "atx_power_duty", "Power LED On Time", "mdi:led-on"),
+        )
+    )
+
+    deadband = float(
+        config_entry.options.get(CONF_HEALTH_DEADBAND, DEFAULT_HEALTH_DEADBAND)
+    )
+    # Skip health values the device already exports as metrics
+    metrics = (coordinator.data or {}).get("metrics") or {}
+    sensors.extend(
+        runtime.create(GLKVMHealthSensor, description, deadband)
+        for description in HEALTH_SENSORS
+        if HEALTH_METRICS.get(description.key) not in metrics
+    )
+
+    # Only expose metrics the device actually exports
+    sensors.extend(
+        runtime.create(GLKVMSensor, description)
+        for description in METRIC_SENSORS
+        if description.available_fn(coordinator.data or {})
+    )
+
     async_add_entities(sensors, True)
-    _LOGGER.debug("%d GLKVM sensors added to Home Assistant", len(sensors))
+
+    # Added without update_before_add, so disabled sensors never trigger a fetch
+    streamer = coordinator.streamer
+    on_demand_sensors = [
+        *(
+            runtime.create(GLKVMStreamerSensor, description, coordinator=streamer)
+            for description in STREAMER_SENSORS
+        ),
+        runtime.create(
+            GLKVMOnDemandSensor, SCREEN_CHANGED, coordinator=coordinator.screen
+        ),
+    ]
+    if coordinator.ocr is not None:
+        on_demand_sensors.extend(
+            runtime.create(
+                GLKVMOcrSensor,
+                ocr_region_description(region, box),
+                coordinator=coordinator.ocr,
+            )
+            for region, box in coordinator.ocr.regions.items()
+        )
+    async_add_entities(on_demand_sensors)
+    _LOGGER.debug(
+        "%d GLKVM sensors added to Home Assistant",
+        len(sensors) + len(on_demand_sensors),
+    )
 
 
@@ -0,0 +1,504 @@
+"""Services for the GL.iNet KVM integration."""
+
+import asyncio
+import logging
+import os
+import re
+import time
+from urllib.parse import urlparse
+
+import aiohttp
+import requests
+import voluptuous as vol
+
+from homeassistant.core import (
+    HomeAssistant,
+    ServiceCall,
+    ServiceResponse,
+    SupportsResponse,
+)
+from homeassistant.exceptions import HomeAssistantError, ServiceValidationError
+from homeassistant.helpers import device_registry as dr
+import homeassistant.helpers.config_validation as cv
+
+from .const import (
+    API_HID_PRINT,
+    API_HID_SEND_KEY,
+    API_HID_SEND_SHORTCUT,
+    ATTR_ACTIONS,
+    ATTR_BUTTON,
+    ATTR_CHUNK_DELAY,
+    ATTR_CHUNK_SIZE,
+    ATTR_DEVICE_ID,
+    ATTR_HOLD,
+    ATTR_IMAGE,
+    ATTR_INTERVAL,
+    ATTR_KEYMAP,
+    ATTR_KEYS,
+    ATTR_MAX_PARALLEL,
+    ATTR_METHOD,
+    ATTR_MOVE,
+    ATTR_MOVE_BY,
+    ATTR_NAME,
+    ATTR_PATH,
+    ATTR_REPEAT,
+    ATTR_SLOW,
+    ATTR_STATE,
+    ATTR_STEPS,
+    ATTR_TEXT,
+    ATTR_URL,
+    ATTR_WAIT,
+    ATTR_WHEEL,
+    DEFAULT_KEYMAP,
+    DOMAIN,
+    HID_PRINT_CHUNK_DELAY,
+    HID_PRINT_CHUNK_SIZE,
+    MOUSE_ABS_MAX,
+    MOUSE_ABS_MIN,
+    MOUSE_BUTTONS,
+    MOUSE_CLICK,
+    MOUSE_PRESS,
+    MOUSE_RELEASE,
+    MSD_REMOTE_MAX_PARALLEL,
+    SERVICE_DELETE_MACRO,
+    SERVICE_MSD_CANCEL,
+    SERVICE_MSD_UPLOAD,
+    SERVICE_MOUSE,
+    SERVICE_MSD_WRITE_REMOTE,
+    SERVICE_RUN_MACRO,
+    SERVICE_SAVE_MACRO,
+    SERVICE_SEND_KEYS,
+    SERVICE_TYPE_TEXT,
+    TYPE_METHOD_KEYS,
+    TYPE_METHOD_PRINT,
+)
+from .coordinator import GLKVMDataUpdateCoordinator
+from .entity import GLKVMEntryRuntime
+from .hid import KEYMAP_EN_US, chunk_text, unmapped_characters
+from .hid_sender import EVENT_BUTTON, EVENT_KEY, EVENT_MOVE, EVENT_MOVE_BY, EVENT_WHEEL
+from .macro import GLKVMMacroStore, async_play, compile_steps
+from .msd import (
+    async_upload_image,
+    async_write_remote_many,
+    image_size,
+    queue_remote_writes,
+    start_transfer,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+TYPE_TEXT_SCHEMA = vol.Schema(
+    {
+        vol.Required(ATTR_DEVICE_ID): cv.string,
+        vol.Required(ATTR_TEXT): cv.string,
+        vol.Optional(ATTR_KEYMAP, default=DEFAULT_KEYMAP): cv.string,
+        vol.Optional(ATTR_METHOD, default=TYPE_METHOD_PRINT): vol.In(
+            [TYPE_METHOD_PRINT, TYPE_METHOD_KEYS]
+        ),
+        vol.Optional(ATTR_CHUNK_SIZE, default=HID_PRINT_CHUNK_SIZE): vol.All(
+            vol.Coerce(int), vol.Range(min=1, max=4096)
+        ),
+        vol.Optional(ATTR_CHUNK_DELAY, default=HID_PRINT_CHUNK_DELAY): vol.All(
+            vol.Coerce(float), vol.Range(min=0, max=10)
+        ),
+        vol.Optional(ATTR_SLOW, default=False): cv.boolean,
+    }
+)
+
+MSD_UPLOAD_SCHEMA = vol.Schema(
+    {
+        vol.Required(ATTR_DEVICE_ID): cv.string,
+        vol.Required(ATTR_PATH): cv.string,
+        vol.Optional(ATTR_IMAGE): cv.string,
+    }
+)
+
+MSD_WRITE_REMOTE_SCHEMA = vol.Schema(
+    {
+        vol.Required(ATTR_DEVICE_ID): vol.All(cv.ensure_list, [cv.string]),
+        vol.Required(ATTR_URL): cv.url,
+        vol.Optional(ATTR_IMAGE): cv.string,
+        vol.Optional(ATTR_MAX_PARALLEL, default=MSD_REMOTE_MAX_PARALLEL): vol.All(
+            vol.Coerce(int), vol.Range(min=1, max=64)
+        ),
+    }
+)
+
+DEVICE_SCHEMA = vol.Schema({vol.Required(ATTR_DEVICE_ID): cv.string})
+
+_KEY_CODE = re.compile(r"^[A-Za-z0-9]+$")
+
+
+def key_list(value) -> list[str]:
+    """Validate a key code or a chord given as a list or 'KeyA+KeyB'."""
+    keys = value.split("+") if isinstance(value, str) else cv.ensure_list(value)
+    keys = [str(key).strip() for key in keys]
+    if not keys or not all(_KEY_CODE.match(key) for key in keys):
+        raise vol.Invalid(f"Expected key codes such as 'ControlLeft+KeyC', got {value!r}")
+    return keys
+
+
+_MILLISECONDS = vol.All(vol.Coerce(int), vol.Range(min=0, max=60000))
+_KEY_TIMING = {
+    vol.Optional(ATTR_HOLD): _MILLISECONDS,
+    vol.Optional(ATTR_INTERVAL): _MILLISECONDS,
+}
+MACRO_STEP_SCHEMA = vol.Any(
+    vol.Schema({vol.Required(ATTR_WAIT): _MILLISECONDS}),
+    vol.Schema(
+        {
+            vol.Required(ATTR_KEYS): key_list,
+            vol.Optional(ATTR_REPEAT, default=1): vol.All(
+                vol.Coerce(int), vol.Range(min=1, max=1000)
+            ),
+            **_KEY_TIMING,
+        }
+    ),
+    vol.Schema({vol.Required(ATTR_TEXT): cv.string, **_KEY_TIMING}),
+)
+
+SAVE_MACRO_SCHEMA = vol.Schema(
+    {
+        vol.Required(ATTR_NAME): cv.string,
+        vol.Required(ATTR_STEPS): vol.All(cv.ensure_list, [MACRO_STEP_SCHEMA]),
+    }
+)
+
+DELETE_MACRO_SCHEMA = vol.Schema({vol.Required(ATTR_NAME): cv.string})
+
+RUN_MACRO_SCHEMA = vol.Schema(
+    {
+        vol.Required(ATTR_DEVICE_ID): cv.string,
+        vol.Required(ATTR_NAME): cv.string,
+    }
+)
+
+SEND_KEYS_SCHEMA = vol.Schema(
+    {
+        vol.Required(ATTR_DEVICE_ID): cv.string,
+        vol.Required(ATTR_KEYS): vol.All(cv.ensure_list, [key_list]),
+    }
+)
+
+
+def _xy(minimum: int, maximum: int, default: int | None = None) -> vol.Schema:
+    """Return the schema of an {x, y} pair within a range."""
+    coordinate = vol.All(vol.Coerce(int), vol.Range(min=minimum, max=maximum))
+    if default is None:
+        return vol.Schema({vol.Required("x"): coordinate, vol.Required("y"): coordinate})
+    return vol.Schema(
+        {
+            vol.Optional("x", default=default): coordinate,
+            vol.Optional("y", default=default): coordinate,
+        }
+    )
+
+
+MOUSE_ACTION_SCHEMA = vol.Any(
+    vol.Schema({vol.Required(ATTR_MOVE): _xy(MOUSE_ABS_MIN, MOUSE_ABS_MAX)}),
+    vol.Schema({vol.Required(ATTR_MOVE_BY): _xy(-MOUSE_ABS_MAX, MOUSE_ABS_MAX)}),
+    vol.Schema(
+        {
+            vol.Required(ATTR_BUTTON): vol.In(MOUSE_BUTTONS),
+            vol.Optional(ATTR_STATE, default=MOUSE_CLICK): vol.In(
+                [MOUSE_CLICK, MOUSE_PRESS, MOUSE_RELEASE]
+            ),
+        }
+    ),
+    vol.Schema({vol.Required(ATTR_WHEEL): _xy(-127, 127, default=0)}),
+)
+
+MOUSE_SCHEMA = vol.Schema(
+    {
+        vol.Required(ATTR_DEVICE_ID): cv.string,
+        vol.Required(ATTR_ACTIONS): vol.All(cv.ensure_list, [MOUSE_ACTION_SCHEMA]),
+    }
+)
+
+
+def key_events(chords: list[list[str]]) -> list[tuple[str, tuple]]:
+    """Return the press and release events typing each chord in turn."""
+    events = []
+    for chord in chords:
+        events.extend((EVENT_KEY, (key, True)) for key in chord)
+        events.extend((EVENT_KEY, (key, False)) for key in reversed(chord))
+    return events
+
+
+def mouse_events(actions: list[dict]) -> list[tuple[str, tuple]]:
+    """Return the events of validated mouse actions."""
+    events = []
+    for action in actions:
+        if ATTR_MOVE in action:
+            events.append((EVENT_MOVE, (action[ATTR_MOVE]["x"], action[ATTR_MOVE]["y"])))
+        elif ATTR_MOVE_BY in action:
+            move = action[ATTR_MOVE_BY]
+            events.append((EVENT_MOVE_BY, (move["x"], move["y"])))
+        elif ATTR_WHEEL in action:
+            events.append((EVENT_WHEEL, (action[ATTR_WHEEL]["x"], action[ATTR_WHEEL]["y"])))
+        else:
+            button, state = action[ATTR_BUTTON], action[ATTR_STATE]
+            if state != MOUSE_RELEASE:
+                events.append((EVENT_BUTTON, (button, True)))
+            if state != MOUSE_PRESS:
+                events.append((EVENT_BUTTON, (button, False)))
+    return events
+
+
+def get_coordinator(hass: HomeAssistant, device_id: str) -> GLKVMDataUpdateCoordinator:
+    """Return the coordinator of the loaded config entry owning a device."""
+    device = dr.async_get(hass).async_get(device_id)
+    if device is not None:
+        for entry_id in device.config_entries:
+            runtime = hass.data.get(DOMAIN, {}).get(entry_id)
+            if isinstance(runtime, GLKVMEntryRuntime):
+                return runtime.coordinator
+    raise ServiceValidationError(f"No loaded GLKVM device with id {device_id}")
+
+
+async def async_setup_services(hass: HomeAssistant) -> None:
+    """Register the GLKVM services."""
+
+    async def async_type_text(call: ServiceCall) -> ServiceResponse:
+        """Type text on the host."""
+        coordinator = get_coordinator(hass, call.data[ATTR_DEVICE_ID])
+        return await _async_type_text(coordinator, call.data)
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_TYPE_TEXT,
+        async_type_text,
+        schema=TYPE_TEXT_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+
+    async def async_msd_upload(call: ServiceCall) -> None:
+        """Start streaming a local image to the device's mass storage."""
+        coordinator = get_coordinator(hass, call.data[ATTR_DEVICE_ID])
+        path = call.data[ATTR_PATH]
+        if not hass.config.is_allowed_path(path):
+            raise ServiceValidationError(f"Access to {path} is not allowed")
+        try:
+            size = await hass.async_add_executor_job(image_size, path)
+        except OSError as err:
+            raise ServiceValidationError(f"Cannot read {path}: {err}") from err
+        image = call.data.get(ATTR_IMAGE) or os.path.basename(path)
+        # Registered before the task starts, so a busy device fails the call
+        try:
+            transfer = start_transfer(coordinator, image, size, path)
+        except HomeAssistantError as err:
+            raise ServiceValidationError(str(err)) from err
+        # Transfers take minutes; progress is reported by the transfer sensor
+        hass.async_create_background_task(
+            async_upload_image(coordinator, transfer),
+            f"{DOMAIN} msd upload {image}",
+        )
+
+    async def async_msd_cancel(call: ServiceCall) -> None:
+        """Cancel the running image transfer."""
+        coordinator = get_coordinator(hass, call.data[ATTR_DEVICE_ID])
+        if coordinator.msd_transfer is None or not coordinator.msd_transfer.running:
+            raise ServiceValidationError("No image transfer is running")
+        coordinator.msd_transfer.cancel_event.set()
+
+    async def async_msd_write_remote(call: ServiceCall) -> None:
+        """Have one or more devices download an image from a URL."""
+        # A device listed twice would otherwise get a second, stranded transfer
+        coordinators = list(
+            dict.fromkeys(
+                get_coordinator(hass, device_id)
+                for device_id in call.data[ATTR_DEVICE_ID]
+            )
+        )
+        url = call.data[ATTR_URL]
+        image = call.data.get(ATTR_IMAGE) or os.path.basename(urlparse(url).path)
+        if not image:
+            raise ServiceValidationError(f"Cannot derive an image name from {url}")
+        try:
+            transfers = queue_remote_writes(coordinators, url, image)
+        except HomeAssistantError as err:
+            raise ServiceValidationError(str(err)) from err
+        hass.async_create_background_task(
+            async_write_remote_many(
+                coordinators, transfers, url, call.data[ATTR_MAX_PARALLEL]
+            ),
+            f"{DOMAIN} msd write_remote {image}",
+        )
+
+    hass.services.async_register(
+        DOMAIN, SERVICE_MSD_UPLOAD, async_msd_upload, schema=MSD_UPLOAD_SCHEMA
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_MSD_WRITE_REMOTE,
+        async_msd_write_remote,
+        schema=MSD_WRITE_REMOTE_SCHEMA,
+    )
+    hass.services.async_register(
+        DOMAIN, SERVICE_MSD_CANCEL, async_msd_cancel, schema=DEVICE_SCHEMA
+    )
+
+    macros = GLKVMMacroStore(hass)
+    await macros.async_load()
+
+    async def async_save_macro(call: ServiceCall) -> ServiceResponse:
+        """Compile and save a keyboard macro."""
+        try:
+            rows = compile_steps(call.data[ATTR_STEPS])
+        except ValueError as err:
+            raise ServiceValidationError(str(err)) from err
+        if not rows:
+            raise ServiceValidationError("The macro presses no keys")
+        macro = await macros.async_save(call.data[ATTR_NAME], rows)
+        return {"events": len(macro.events), "duration": macro.duration}
+
+    async def async_delete_macro(call: ServiceCall) -> None:
+        """Delete a saved keyboard macro."""
+        if not await macros.async_delete(call.data[ATTR_NAME]):
+            raise ServiceValidationError(f"No macro named {call.data[ATTR_NAME]}")
+
+    async def async_run_macro(call: ServiceCall) -> ServiceResponse:
+        """Replay a saved keyboard macro on a device."""
+        coordinator = get_coordinator(hass, call.data[ATTR_DEVICE_ID])
+        if (macro := macros.get(call.data[ATTR_NAME])) is None:
+            raise ServiceValidationError(f"No macro named {call.data[ATTR_NAME]}")
+        try:
+            result = await async_play(coordinator.events, macro)
+        except (aiohttp.ClientError, ConnectionError) as err:
+            raise HomeAssistantError(f"Failed to run macro: {err}") from err
+        _LOGGER.debug("Ran macro %s on %s: %s", call.data[ATTR_NAME], coordinator.url, result)
+        return result
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_SAVE_MACRO,
+        async_save_macro,
+        schema=SAVE_MACRO_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+    hass.services.async_register(
+        DOMAIN, SERVICE_DELETE_MACRO, async_delete_macro, schema=DELETE_MACRO_SCHEMA
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_RUN_MACRO,
+        async_run_macro,
+        schema=RUN_MACRO_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+
+    async def async_send_keys(call: ServiceCall) -> ServiceResponse:
+        """Press and release keys and chords on the host."""
+        coordinator = get_coordinator(hass, call.data[ATTR_DEVICE_ID])
+        return await _async_send_hid(coordinator, key_events(call.data[ATTR_KEYS]))
+
+    async def async_mouse(call: ServiceCall) -> ServiceResponse:
+        """Move, click and scroll the host's pointer."""
+        coordinator = get_coordinator(hass, call.data[ATTR_DEVICE_ID])
+        return await _async_send_hid(coordinator, mouse_events(call.data[ATTR_ACTIONS]))
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_SEND_KEYS,
+        async_send_keys,
+        schema=SEND_KEYS_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_MOUSE,
+        async_mouse,
+        schema=MOUSE_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+
+
+async def _async_send_hid(
+    coordinator: GLKVMDataUpdateCoordinator, events: list[tuple[str, tuple]]
+) -> ServiceResponse:
+    """Send HID events over the device's websocket and report their latency."""
+    try:
+        result = await coordinator.hid.async_send(events)
+    except (aiohttp.ClientError, ConnectionError) as err:
+        raise HomeAssistantError(f"Failed to send input: {err}") from err
+    _LOGGER.debug("Sent input to %s: %s", coordinator.url, result)
+    return result
+
+
+async def _async_type_text(
+    coordinator: GLKVMDataUpdateCoordinator, data: dict
+) -> ServiceResponse:
+    """Send text in paced chunks and report the achieved throughput.
+
+    Text the keys method cannot type is rejected before anything is sent,
+    so a completed result always means every character was typed.
+    """
+    text = data[ATTR_TEXT]
+    if data[ATTR_METHOD] == TYPE_METHOD_KEYS:
+        if data[ATTR_KEYMAP] != DEFAULT_KEYMAP:
+            raise ServiceValidationError(
+                f"The keys method only supports the {DEFAULT_KEYMAP} keymap"
+            )
+        if missing := unmapped_characters(text):
+            raise ServiceValidationError(
+                f"No key for characters {''.join(missing)!r}; use the print method"
+            )
+    chunks = chunk_text(text, data[ATTR_CHUNK_SIZE])
+    sent = 0
+    error = None
+    start = time.monotonic()
+
+    try:
+        for index, chunk in enumerate(chunks):
+            if data[ATTR_METHOD] == TYPE_METHOD_KEYS:
+                await _async_send_chunk_as_keys(coordinator, chunk)
+            else:
+                response = await coordinator.async_post(
+                    API_HID_PRINT,
+                    params={
+                        "limit": 0,
+                        "keymap": data[ATTR_KEYMAP],
+                        "slow": int(data[ATTR_SLOW]),
+                    },
+                    data=chunk.encode("utf-8"),
+                )
+                response.raise_for_status()
+            sent += len(chunk)
+            # Give the device time to drain its HID queue before the next burst
+            if index < len(chunks) - 1 and data[ATTR_CHUNK_DELAY]:
+                await asyncio.sleep(data[ATTR_CHUNK_DELAY])
+    except requests.exceptions.RequestException as err:
+        if not sent:
+            raise HomeAssistantError(f"Failed to type text: {err}") from err
+        _LOGGER.error("Typing stopped after %d of %d characters: %s", sent, len(text), err)
+        error = str(err)
+
+    elapsed = time.monotonic() - start
+    result = {
+        "completed": sent == len(text),
+        "characters": sent,
+        "chunks": len(chunks),
+        "elapsed": round(elapsed, 3),
+        "chars_per_second": round(sent / elapsed, 1) if elapsed else None,
+    }
+    if error:
+        result["error"] = error
+    _LOGGER.debug("Typed text on %s: %s", coordinator.url, result)
+    return result
+
+
+async def _async_send_chunk_as_keys(
+    coordinator: GLKVMDataUpdateCoordinator, chunk: str
+) -> None:
+    """Type a chunk one key event at a time using the US keymap table."""
+    for char in chunk:
+        code, shift = KEYMAP_EN_US[char]
+        if shift:
+            response = await coordinator.async_post(
+                API_HID_SEND_SHORTCUT, params={"keys": f"ShiftLeft,{code}"}
+            )
+        else:
+            response = await coordinator.async_post(
+                API_HID_SEND_KEY, params={"key": code}
+            )
+        response.raise_for_status()
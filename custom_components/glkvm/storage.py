@@ -0,0 +1,55 @@
+"""Last known device state, kept across restarts.
+
+The coordinator's last good data is saved through Home Assistant's storage
+helper so that on the next start entities and the device registry entry can
+be set up from it immediately, instead of waiting for the device to answer.
+Only the parts entities are built from are kept, and writes are debounced so
+a 30 second poll does not turn into a disk write every 30 seconds.
+"""
+
+from typing import Any
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.storage import Store
+
+from .const import DOMAIN, STORAGE_SAVE_DELAY, STORAGE_VERSION
+
+# Parts of the coordinator data entities and device info are built from
+RESTORED_KEYS = ("system", "hw", "atx", "gpio", "metrics")
+
+
+def compact_data(data: dict[str, Any]) -> dict[str, Any]:
+    """Return the parts of the coordinator data worth restoring."""
+    return {key: data[key] for key in RESTORED_KEYS if data.get(key)}
+
+
+class GLKVMDataStore:
+    """Persist the last good coordinator data of one config entry."""
+
+    def __init__(self, hass: HomeAssistant, entry_id: str) -> None:
+        """Initialize the store."""
+        self._store: Store[dict[str, Any]] = Store(
+            hass, STORAGE_VERSION, f"{DOMAIN}.{entry_id}", private=True
+        )
+        self._data: dict[str, Any] = {}
+
+    async def async_load(self) -> dict[str, Any] | None:
+        """Return the saved data, marked as restored, or None."""
+        stored = await self._store.async_load()
+        if not stored:
+            return None
+        self._data = stored
+        return {**stored, "restored": True}
+
+    @callback
+    def async_save(self, data: dict[str, Any]) -> None:
+        """Schedule saving the data if it changed."""
+        compact = compact_data(data)
+        if compact == self._data:
+            return
+        self._data = compact
+        self._store.async_delay_save(lambda: self._data, STORAGE_SAVE_DELAY)
+
+    async def async_remove(self) -> None:
+        """Delete the saved data."""
+        await self._store.async_remove()
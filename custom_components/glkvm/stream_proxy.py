@@ -0,0 +1,164 @@
+"""Shared MJPEG stream proxy for the GLKVM camera.
+
+Every viewer of the camera stream is served from a single upstream MJPEG
+connection per device. The upstream is read frame by frame on the event loop
+with aiohttp; each frame is read into one bytes object that is handed to
+every viewer as is, so adding viewers never copies frame data. Each viewer
+has a small bounded queue, and a viewer that falls behind loses its oldest
+frames rather than growing memory. The upstream connection is closed as soon
+as the last viewer goes away, by cancelling the task reading it, so a stalled
+upstream never blocks the event loop or holds an executor thread.
+"""
+
+import asyncio
+import logging
+
+import aiohttp
+from aiohttp import web
+
+from homeassistant.core import callback
+
+from .cert_handler import create_aiohttp_session
+from .const import API_STREAMER_STREAM, STREAM_QUEUE_SIZE
+
+_LOGGER = logging.getLogger(__name__)
+
+BOUNDARY = "glkvmframe"
+
+# A stream with no frame for this long is treated as dropped
+STREAM_TIMEOUT = aiohttp.ClientTimeout(total=None, connect=10, sock_read=30)
+
+
+class MjpegStreamProxy:
+    """Fan one upstream MJPEG stream out to any number of viewers."""
+
+    def __init__(self, coordinator) -> None:
+        """Initialize the proxy."""
+        self.coordinator = coordinator
+        self._subscribers: set[asyncio.Queue] = set()
+        self._reader: asyncio.Task | None = None
+        self.frames = 0
+        self.dropped = 0
+
+    @property
+    def viewers(self) -> int:
+        """Return the number of connected viewers."""
+        return len(self._subscribers)
+
+    async def async_handle_request(self, request: web.Request) -> web.StreamResponse:
+        """Stream frames from the shared upstream to one HTTP client."""
+        queue = self._subscribe()
+        try:
+            response = web.StreamResponse(
+                headers={
+                    "Content-Type": f"multipart/x-mixed-replace;boundary={BOUNDARY}"
+                }
+            )
+            await response.prepare(request)
+            while (frame := await queue.get()) is not None:
+                await response.write(
+                    f"--{BOUNDARY}\r\nContent-Type: image/jpeg\r\n"
+                    f"Content-Length: {len(frame)}\r\n\r\n".encode()
+                )
+                await response.write(frame)
+                await response.write(b"\r\n")
+            return response
+        finally:
+            await self._async_unsubscribe(queue)
+
+    @callback
+    def _subscribe(self) -> asyncio.Queue:
+        """Register a viewer and start the upstream if needed."""
+        queue: asyncio.Queue = asyncio.Queue(maxsize=STREAM_QUEUE_SIZE)
+        self._subscribers.add(queue)
+        if self._reader is None or self._reader.done():
+            _LOGGER.debug("Opening upstream stream for %s", self.coordinator.url)
+            self._reader = self.coordinator.hass.async_create_background_task(
+                self._async_read_upstream(),
+                f"glkvm stream {self.coordinator.url}",
+            )
+        return queue
+
+    async def _async_unsubscribe(self, queue: asyncio.Queue) -> None:
+        """Unregister a viewer and stop the upstream after the last one."""
+        self._subscribers.discard(queue)
+        if not self._subscribers:
+            await self.async_close()
+
+    async def async_close(self) -> None:
+        """Close the upstream connection and end every viewer's stream."""
+        # A viewer arriving while the old run winds down starts a new one
+        reader, self._reader = self._reader, None
+        for queue in self._subscribers:
+            self._offer(queue, None)
+        if reader is not None and not reader.done():
+            reader.cancel()
+            try:
+                await reader
+            except asyncio.CancelledError:
+                pass
+
+    @callback
+    def _publish(self, frame: bytes | None) -> None:
+        """Hand a frame (or the end-of-stream marker) to every viewer."""
+        if frame is not None:
+            self.frames += 1
+        for queue in self._subscribers:
+            self._offer(queue, frame)
+
+    def _offer(self, queue: asyncio.Queue, frame: bytes | None) -> None:
+        """Queue a frame, dropping the viewer's oldest frame if it is behind."""
+        if queue.full():
+            queue.get_nowait()
+            self.dropped += 1
+        queue.put_nowait(frame)
+
+    async def _async_read_upstream(self) -> None:
+        """Read MJPEG frames from the device until the stream ends."""
+        coordinator = self.coordinator
+        try:
+            async with (
+                create_aiohttp_session(coordinator.cert, coordinator.resolver) as session,
+                session.get(
+                    f"{coordinator.url}{API_STREAMER_STREAM}",
+                    auth=aiohttp.BasicAuth(coordinator.username, coordinator.password),
+                    timeout=STREAM_TIMEOUT,
+                ) as response,
+            ):
+                response.raise_for_status()
+                while (frame := await _read_frame(response.content)) is not None:
+                    self._publish(frame)
+        except (aiohttp.ClientError, TimeoutError, ValueError) as err:
+            _LOGGER.warning("MJPEG stream from %s ended: %s", coordinator.url, err)
+        finally:
+            _LOGGER.debug("Upstream stream for %s closed", coordinator.url)
+            # Only the current run ends the viewers' streams
+            if self._reader is asyncio.current_task():
+                self._reader = None
+                self._publish(None)
+
+
+async def _read_frame(content: aiohttp.StreamReader) -> bytes | None:
+    """Read the next multipart part from the stream and return its body.
+
+    The streamer sends a Content-Length header with every part, so the body
+    is read with a single sized read instead of scanning for the boundary.
+    """
+    length = None
+    while True:
+        line = await content.readline()
+        if not line:
+            return None
+        line = line.strip()
+        if not line:
+            if length is not None:
+                break
+            # Blank line between parts
+            continue
+        name, _, value = line.partition(b":")
+        if name.strip().lower() == b"content-length":
+            length = int(value)
+    try:
+        return await content.readexactly(length)
+    except asyncio.IncompleteReadError:
+        return None
@@ -1,7 +1,12 @@
 """Switch platform for GL.iNet KVM power control."""
 
-import functools
+from collections.abc import Mapping
+from dataclasses import dataclass
+from types import MappingProxyType
 import logging
+from typing import Any
+
+import requests
 
 from homeassistant.components.switch import SwitchEntity, SwitchDeviceClass
 from homeassistant.config_entries import ConfigEntry
@@ -10,98 +15,140 @@ from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
 from .const import (
     API_ATX_POWER,
+    API_GPIO_SWITCH,
     ATX_ACTION_POWER_ON,
     ATX_ACTION_POWER_OFF,
     DOMAIN,
 )
-from .entity import GLKVMEntity
+from .entity import GLKVMDescribedEntity, GLKVMEntityDescription
+from .utils import get_gpio_channels, get_gpio_state, parse_power_value
 
 _LOGGER = logging.getLogger(__name__)
 
 
-class GLKVMPowerSwitch(GLKVMEntity, SwitchEntity):
-    """Switch to control computer power state."""
+@dataclass(frozen=True, kw_only=True)
+class GLKVMSwitchEntityDescription(GLKVMEntityDescription):
+    """Describes a GLKVM switch and the commands that set it."""
 
-    _attr_device_class = SwitchDeviceClass.SWITCH
+    command_path: str
+    on_params: Mapping[str, Any]
+    off_params: Mapping[str, Any]
 
-    def __init__(
-        self,
-        coordinator,
-        unique_id_base: str,
-        device_name: str,
-    ) -> None:
-        """Initialize the power switch."""
-        super().__init__(coordinator, unique_id_base)
-        self._attr_unique_id = f"{unique_id_base}_power_switch"
-        self._attr_name = f"{device_name} Power"
-        self._attr_icon = "mdi:power"
 
-    @property
-    def available(self) -> bool:
-        """Return True if the switch data is available."""
-        atx = self.coordinator.data.get("atx", {}) if self.coordinator.data else {}
-        return "power" in atx
+class GLKVMSwitch(GLKVMDescribedEntity, SwitchEntity):
+    """Switch driven by an entity description."""
+
+    entity_description: GLKVMSwitchEntityDescription
 
     @property
     def is_on(self) -> bool | None:
-        """Return True if the system is powered on."""
-        atx = self.coordinator.data.get("atx", {}) if self.coordinator.data else {}
-        if "power" not in atx:
-            return None
-        power_value = atx["power"]
-        return self._parse_power_value(power_value)
-
-    def _parse_power_value(self, value) -> bool:
-        """Parse various power value formats and return boolean."""
-        if isinstance(value, str):
-            return value.lower() in ("on", "true", "1", "yes")
-        return bool(value)
+        """Return the evaluated value."""
+        return self.value
 
     async def async_turn_on(self, **kwargs) -> None:
-        """Turn on the system (only if currently off)."""
-        if not self.is_on:
-            _LOGGER.debug("System is off, sending power on command")
-            await self._send_atx_command(ATX_ACTION_POWER_ON)
-        else:
-            _LOGGER.debug("System is already on, skipping power on command")
+        """Send the on command."""
+        description = self.entity_description
+        await self.coordinator.async_send_command(
+            description.command_path, dict(description.on_params)
+        )
 
     async def async_turn_off(self, **kwargs) -> None:
-        """Turn off the system (graceful shutdown)."""
-        if self.is_on:
-            _LOGGER.debug("System is on, sending power off command")
-            await self._send_atx_command(ATX_ACTION_POWER_OFF)
-        else:
-            _LOGGER.debug("System is already off, skipping power off command")
+        """Send the off command."""
+        description = self.entity_description
+        await self.coordinator.async_send_command(
+            description.command_path, dict(description.off_params)
+        )
+
+
+POWER_SWITCH = GLKVMSwitchEntityDescription(
+    key="power_switch",
+    name="Power",
+    icon="mdi:power",
+    device_class=SwitchDeviceClass.SWITCH,
+    available_fn=lambda data: "power" in (data.get("atx") or {}),
+    value_fn=lambda data: parse_power_value(data["atx"]["power"]),
+    command_path=API_ATX_POWER,
+    on_params=MappingProxyType({"action": ATX_ACTION_POWER_ON}),
+    off_params=MappingProxyType({"action": ATX_ACTION_POWER_OFF}),
+)
+
+
+class GLKVMPowerSwitch(GLKVMSwitch):
+    """Switch to control computer power state.
+
+    The ATX power button toggles, so commands are only sent when the
+    system is not already in the requested state. That state is read
+    fresh from the device (within ATX_STATE_TTL seconds) rather than taken
+    from the last poll, so a host that just changed state is not skipped.
+    The read and the decision happen under the coordinator's command lock,
+    so two commands cannot both act on the state from before either ran.
+    """
 
-    async def _send_atx_command(self, action: str) -> None:
-        """Send ATX power command to the device."""
+    async def _async_fresh_is_on(self) -> bool | None:
+        """Return the current power state, or the polled one if unreadable."""
         try:
-            url = f"{self.coordinator.url}{API_ATX_POWER}"
-            _LOGGER.debug("Sending ATX command: %s to %s", action, url)
-
-            response = await self.coordinator.hass.async_add_executor_job(
-                functools.partial(
-                    self.coordinator.session.post,
-                    url,
-                    params={"action": action},
-                    auth=self.coordinator.auth,
-                    timeout=10,
-                )
-            )
-
-            if response.status_code == 200:
-                _LOGGER.info("ATX command '%s' sent successfully", action)
-                await self.coordinator.async_request_refresh()
-            else:
-                _LOGGER.error(
-                    "ATX command '%s' failed with status %s: %s",
-                    action,
-                    response.status_code,
-                    response.text,
-                )
-
-        except Exception as err:
-            _LOGGER.error("Error sending ATX command '%s': %s", action, err)
+            atx = await self.coordinator.async_get_atx_state()
+        except (requests.exceptions.RequestException, ValueError) as err:
+            _LOGGER.debug("Could not read the power state, using the last poll: %s", err)
+            return self.is_on
+        data = {"atx": atx}
+        if not self.entity_description.available_fn(data):
+            return self.is_on
+        return self.entity_description.value_fn(data)
+
+    async def _async_is_off(self) -> bool:
+        """Return True if the power on command should be sent."""
+        if await self._async_fresh_is_on():
+            _LOGGER.debug("System is already on, skipping power on command")
+            return False
+        _LOGGER.debug("System is off, sending power on command")
+        return True
+
+    async def _async_is_on(self) -> bool:
+        """Return True if the power off command should be sent."""
+        if not await self._async_fresh_is_on():
+            _LOGGER.debug("System is already off, skipping power off command")
+            return False
+        _LOGGER.debug("System is on, sending power off command")
+        return True
+
+    async def async_turn_on(self, **kwargs) -> None:
+        """Turn on the system (only if currently off)."""
+        description = self.entity_description
+        await self.coordinator.async_send_command(
+            description.command_path,
+            dict(description.on_params),
+            condition=self._async_is_off,
+        )
+
+    async def async_turn_off(self, **kwargs) -> None:
+        """Turn off the system (graceful shutdown)."""
+        description = self.entity_description
+        await self.coordinator.async_send_command(
+            description.command_path,
+            dict(description.off_params),
+            condition=self._async_is_on,
+        )
+
+
+def gpio_switch_description(channel: str) -> GLKVMSwitchEntityDescription:
+    """Describe the switch of a kvmd GPIO output channel."""
+    return GLKVMSwitchEntityDescription(
+        key=f"gpio_{channel}",
+        name=f"GPIO {channel}",
+        icon="mdi:electric-switch",
+        available_fn=lambda data: bool(
+            get_gpio_state(data, "outputs", channel).get("online")
+        ),
+        value_fn=lambda data: (
+            bool(state["state"])
+            if "state" in (state := get_gpio_state(data, "outputs", channel))
+            else None
+        ),
+        command_path=API_GPIO_SWITCH,
+        on_params=MappingProxyType({"channel": channel, "state": 1}),
+        off_params=MappingProxyType({"channel": channel, "state": 0}),
+    )
 
 
 async def async_setup_entry(
@@ -111,16 +158,17 @@ async def async_setup_entry(
 ) -> None:
     """Set up GLKVM switches from a config entry."""
     _LOGGER.debug("Setting up GLKVM power switch from config entry")
-    coordinator = hass.data[DOMAIN][config_entry.entry_id]
-
-    serial = config_entry.data.get("serial", config_entry.entry_id)
-    unique_id_base = f"{config_entry.entry_id}_{serial}"
-
-    device_name = config_entry.title or "GLKVM"
+    runtime = hass.data[DOMAIN][config_entry.entry_id]
+    coordinator = runtime.coordinator
 
     switches = [
-        GLKVMPowerSwitch(coordinator, unique_id_base, device_name),
+        runtime.create(GLKVMPowerSwitch, POWER_SWITCH),
     ]
+    switches.extend(
+        runtime.create(GLKVMSwitch, gpio_switch_description(channel))
+        for channel, model in get_gpio_channels(coordinator.data, "outputs").items()
+        if model.get("switch")
+    )
 
     async_add_entities(switches, True)
     _LOGGER.debug("%d GLKVM switch(es) added to Home Assistant", len(switches))
@@ -6,12 +6,26 @@ import voluptuous as vol
 
 from homeassistant import config_entries
 from homeassistant.core import HomeAssistant
+from homeassistant.helpers.selector import TextSelector, TextSelectorConfig
 from homeassistant.helpers.translation import async_get_translations
 
 from .const import (
+    CERT_POLICY_ACCEPT,
+    CERT_POLICY_REPAIR,
+    CONF_ACTIVITY_WINDOW,
+    CONF_CERT_POLICY,
+    CONF_HEALTH_DEADBAND,
     CONF_HOST,
+    CONF_HTTP2,
+    CONF_LOG_FOLLOW,
+    CONF_LOG_PATTERNS,
+    CONF_OCR_REGIONS,
     CONF_PASSWORD,
+    DEFAULT_ACTIVITY_WINDOW,
+    DEFAULT_CERT_POLICY,
+    DEFAULT_HEALTH_DEADBAND,
     DEFAULT_HOST,
+    DEFAULT_LOG_PATTERNS,
     DEFAULT_PASSWORD,
     DOMAIN,
 )
@@ -38,6 +52,52 @@ def create_data_schema(user_input):
     )
 
 
+def create_options_schema(options):
+    """Create the schema fields for the integration options."""
+    return {
+        vol.Optional(
+            CONF_LOG_FOLLOW, default=options.get(CONF_LOG_FOLLOW, False)
+        ): bool,
+        vol.Optional(
+            CONF_LOG_PATTERNS,
+            default=options.get(CONF_LOG_PATTERNS, DEFAULT_LOG_PATTERNS),
+        ): TextSelector(TextSelectorConfig(multiline=True)),
+        vol.Optional(
+            CONF_OCR_REGIONS, default=options.get(CONF_OCR_REGIONS, "")
+        ): TextSelector(TextSelectorConfig(multiline=True)),
+        vol.Optional(
+            CONF_ACTIVITY_WINDOW,
+            default=options.get(CONF_ACTIVITY_WINDOW, DEFAULT_ACTIVITY_WINDOW),
+        ): vol.All(vol.Coerce(int), vol.Range(min=10, max=900)),
+        vol.Optional(
+            CONF_CERT_POLICY,
+            default=options.get(CONF_CERT_POLICY, DEFAULT_CERT_POLICY),
+        ): vol.In([CERT_POLICY_REPAIR, CERT_POLICY_ACCEPT]),
+        vol.Optional(CONF_HTTP2, default=options.get(CONF_HTTP2, False)): bool,
+        vol.Optional(
+            CONF_HEALTH_DEADBAND,
+            default=options.get(CONF_HEALTH_DEADBAND, DEFAULT_HEALTH_DEADBAND),
+        ): vol.All(vol.Coerce(float), vol.Range(min=0, max=20)),
+    }
+
+
+def split_options(user_input):
+    """Remove the integration options from user input and return them."""
+    return {
+        key: user_input.pop(key)
+        for key in (
+            CONF_LOG_FOLLOW,
+            CONF_LOG_PATTERNS,
+            CONF_OCR_REGIONS,
+            CONF_ACTIVITY_WINDOW,
+            CONF_CERT_POLICY,
+            CONF_HTTP2,
+            CONF_HEALTH_DEADBAND,
+        )
+        if key in user_input
+    }
+
+
 def update_existing_entry(hass: HomeAssistant | None, existing_entry, user_input):
     """Update an existing config entry."""
     updated_data = existing_entry.data.copy()
@@ -97,6 +157,50 @@ def get_nested_value(data, keys, default=None):
     return data if data else default
 
 
+def get_hw_health(data) -> dict:
+    """Return the hardware health values of an /api/info result.
+
+    kvmd reports temperatures per sensor under hw.health.temp and the
+    Raspberry Pi style throttling flags under hw.health.throttling; builds
+    without them simply leave the values out.
+    """
+    health = {}
+    temps = get_nested_value(data, ["hw", "health", "temp"]) or {}
+    if isinstance(temps, dict) and temps:
+        health["temp"] = temps.get("cpu", next(iter(temps.values())))
+    throttling = get_nested_value(data, ["hw", "health", "throttling"])
+    if isinstance(throttling, dict):
+        health["throttling"] = throttling
+    if version := get_nested_value(data, ["system", "kvmd", "version"]):
+        health["kvmd_version"] = version
+    return health
+
+
+def parse_power_value(value) -> bool:
+    """Parse the various ATX power value formats."""
+    if isinstance(value, str):
+        return value.lower() in ("on", "true", "1", "yes")
+    return bool(value)
+
+
+def get_gpio_channels(data, kind):
+    """Return the GPIO model of the "inputs" or "outputs" channels by name.
+
+    Channels whose names start with "__" are kvmd internals and are skipped.
+    """
+    channels = get_nested_value(data, ["gpio", "model", "scheme", kind], {})
+    return {
+        name: model
+        for name, model in channels.items()
+        if not name.startswith("__")
+    }
+
+
+def get_gpio_state(data, kind, channel):
+    """Return the last known state of a GPIO channel."""
+    return get_nested_value(data, ["gpio", "state", kind, channel], {})
+
+
 def bytes_to_mb(bytes_value):
     """Convert bytes to megabytes."""
     if bytes_value is None:
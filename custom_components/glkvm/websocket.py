@@ -0,0 +1,201 @@
+"""Push events from the kvmd websocket.
+
+kvmd publishes state changes (ATX, GPIO, streamer, ...) on /api/ws. One
+connection per device is kept open while at least one subscriber is
+interested, and every event is dispatched to the callbacks subscribed to its
+event type. The connection is reopened with a delay if it drops.
+
+The same connection carries HID input the other way: senders hold it open
+through ``async_channel`` and write prebuilt JSON frames, which costs no
+request round trip per event. After the last sender the connection lingers
+for WS_IDLE_TIMEOUT seconds, so the next burst of input skips the TLS and
+login handshake.
+"""
+
+import asyncio
+from collections.abc import AsyncIterator, Callable
+from contextlib import asynccontextmanager
+import logging
+
+import aiohttp
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+
+from .cert_handler import create_aiohttp_session
+from .const import (
+    API_WS,
+    WS_CONNECT_TIMEOUT,
+    WS_HEARTBEAT,
+    WS_IDLE_TIMEOUT,
+    WS_RECONNECT_DELAY,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class GLKVMEventStream:
+    """Persistent websocket connection to one device."""
+
+    def __init__(self, hass: HomeAssistant, coordinator) -> None:
+        """Initialize the event stream."""
+        self.hass = hass
+        self.coordinator = coordinator
+        self.connected = False
+        self._subscribers: dict[str, list[Callable[[dict], None]]] = {}
+        self._session: aiohttp.ClientSession | None = None
+        self._ws: aiohttp.ClientWebSocketResponse | None = None
+        self._task: asyncio.Task | None = None
+        self._holds = 0
+        self._idle_close: asyncio.TimerHandle | None = None
+        self._ready = asyncio.Event()
+        # Serializes senders, so key sequences of two callers never interleave
+        self.hid_lock = asyncio.Lock()
+
+    @property
+    def _wanted(self) -> bool:
+        """Return True while a subscriber or sender needs the connection."""
+        return bool(self._holds) or any(self._subscribers.values())
+
+    @callback
+    def _async_ensure_running(self) -> None:
+        """Start the connection task if it is not running."""
+        if self._task is None or self._task.done():
+            self._task = self.hass.async_create_background_task(
+                self._async_run(), f"glkvm websocket {self.coordinator.url}"
+            )
+
+    @callback
+    def async_subscribe(
+        self, event_type: str, event_callback: Callable[[dict], None]
+    ) -> CALLBACK_TYPE:
+        """Subscribe to an event type and connect if not connected yet."""
+        self._subscribers.setdefault(event_type, []).append(event_callback)
+        self._async_ensure_running()
+
+        @callback
+        def unsubscribe() -> None:
+            callbacks = self._subscribers.get(event_type, [])
+            if event_callback in callbacks:
+                callbacks.remove(event_callback)
+            if not self._wanted:
+                self.hass.async_create_task(self._async_close_if_unused())
+
+        return unsubscribe
+
+    @asynccontextmanager
+    async def async_channel(self) -> AsyncIterator["GLKVMEventStream"]:
+        """Hold the connection open for sending and wait until it is up.
+
+        Raises aiohttp.ClientConnectionError if the device cannot be reached
+        within WS_CONNECT_TIMEOUT seconds.
+        """
+        self._holds += 1
+        self._async_cancel_idle_close()
+        try:
+            self._async_ensure_running()
+            try:
+                await asyncio.wait_for(self._ready.wait(), WS_CONNECT_TIMEOUT)
+            except TimeoutError as err:
+                raise aiohttp.ClientConnectionError(
+                    f"No websocket connection to {self.coordinator.url}"
+                ) from err
+            yield self
+        finally:
+            self._holds -= 1
+            if not self._wanted:
+                self._idle_close = self.hass.loop.call_later(
+                    WS_IDLE_TIMEOUT,
+                    lambda: self.hass.async_create_task(self._async_close_if_unused()),
+                )
+
+    @callback
+    def _async_cancel_idle_close(self) -> None:
+        """Keep the connection open past its idle timeout."""
+        if self._idle_close is not None:
+            self._idle_close.cancel()
+            self._idle_close = None
+
+    async def async_send_str(self, frame: str) -> None:
+        """Send a text frame on the open connection."""
+        if self._ws is None or self._ws.closed:
+            raise aiohttp.ClientConnectionError(
+                f"Websocket to {self.coordinator.url} is not connected"
+            )
+        await self._ws.send_str(frame)
+
+    async def async_close(self) -> None:
+        """Close the connection and stop reconnecting."""
+        self._async_cancel_idle_close()
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    async def _async_close_if_unused(self) -> None:
+        """Close the connection unless it was wanted again meanwhile."""
+        if not self._wanted:
+            await self.async_close()
+
+    async def async_reconnect(self) -> None:
+        """Drop the connection so it is reopened with the current certificate."""
+        if self._session is not None:
+            session, self._session = self._session, None
+            await session.close()
+
+    async def _async_run(self) -> None:
+        """Keep the websocket open, dispatching events, until cancelled."""
+        while self._wanted:
+            try:
+                await self._async_listen()
+            except (aiohttp.ClientError, TimeoutError) as err:
+                _LOGGER.debug(
+                    "Websocket to %s failed: %s. Reconnecting in %s seconds",
+                    self.coordinator.url,
+                    err,
+                    WS_RECONNECT_DELAY,
+                )
+            finally:
+                self.connected = False
+                self._ready.clear()
+                self._ws = None
+            await asyncio.sleep(WS_RECONNECT_DELAY)
+
+    async def _async_listen(self) -> None:
+        """Open the websocket and dispatch messages until it closes."""
+        if self._session is None:
+            self._session = create_aiohttp_session(
+                self.coordinator.cert, self.coordinator.resolver
+            )
+        url = self.coordinator.url.replace("https://", "wss://", 1).replace(
+            "http://", "ws://", 1
+        )
+        async with self._session.ws_connect(
+            f"{url}{API_WS}",
+            params={"stream": 0},
+            headers={
+                "X-KVMD-User": self.coordinator.username,
+                "X-KVMD-Passwd": self.coordinator.password,
+            },
+            heartbeat=WS_HEARTBEAT,
+        ) as ws:
+            self._ws = ws
+            self.connected = True
+            self._ready.set()
+            _LOGGER.debug("Websocket to %s connected", self.coordinator.url)
+            async for message in ws:
+                if message.type != aiohttp.WSMsgType.TEXT:
+                    continue
+                try:
+                    data = message.json()
+                except ValueError:
+                    continue
+                for event_callback in list(
+                    self._subscribers.get(data.get("event_type"), ())
+                ):
+                    event_callback(data.get("event") or {})
@@ -1,8 +1,22 @@
 """Global pytest fixtures for PiKVM integration tests."""
 
+import asyncio
+from types import SimpleNamespace
 from unittest.mock import AsyncMock, patch
 
+from aiohttp import WSMsgType, web
 import pytest
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.glkvm.const import (
+    CONF_CERTIFICATE,
+    CONF_HOST,
+    CONF_PASSWORD,
+    CONF_SERIAL,
+    DOMAIN,
+)
+from custom_components.glkvm.coordinator import GLKVMDataUpdateCoordinator
+from custom_components.glkvm.entity import GLKVMEntryRuntime
 
 pytest_plugins = "pytest_homeassistant_custom_component"
 
@@ -44,3 +58,96 @@ def pikvm_cert():
         "0JVpaz6RtNkCIQCNux41DmvNmO6PsK0uFUxnCLzpSw0eVUsVTNff7kwhWA==\n"
         "-----END CERTIFICATE-----"
     )
+
+
+@pytest.fixture
+def add_entry(hass):
+    """Return a function adding a loaded GLKVM config entry for a serial.
+
+    The entry's runtime is registered like at setup, so platforms and
+    services find it. A coordinator without any data is created for the
+    entry unless one is passed.
+    """
+
+    def add(serial="kvm", coordinator=None) -> MockConfigEntry:
+        entry = MockConfigEntry(
+            domain=DOMAIN,
+            title=serial,
+            data={
+                CONF_HOST: f"https://{serial}",
+                CONF_PASSWORD: "password",
+                CONF_SERIAL: serial,
+                CONF_CERTIFICATE: "cert",
+            },
+        )
+        entry.add_to_hass(hass)
+        if coordinator is None:
+            coordinator = GLKVMDataUpdateCoordinator(
+                hass, entry.data[CONF_HOST], "admin", "password", "cert"
+            )
+        hass.data.setdefault(DOMAIN, {})[entry.entry_id] = GLKVMEntryRuntime(
+            entry, coordinator
+        )
+        return entry
+
+    return add
+
+
+@pytest.fixture
+def config_entry(add_entry) -> MockConfigEntry:
+    """Return a loaded GLKVM config entry."""
+    return add_entry()
+
+
+@pytest.fixture
+def runtime(hass, config_entry) -> GLKVMEntryRuntime:
+    """Return the runtime of the loaded config entry."""
+    return hass.data[DOMAIN][config_entry.entry_id]
+
+
+@pytest.fixture
+def coordinator(runtime) -> GLKVMDataUpdateCoordinator:
+    """Return the coordinator of the loaded config entry, without any data."""
+    return runtime.coordinator
+
+
+@pytest.fixture
+async def fake_kvmd_ws(socket_enabled):
+    """Serve a kvmd-like /api/ws endpoint that records received frames.
+
+    Yields a namespace with the device ``url``, ``frames``, a list of
+    (loop time, decoded JSON) tuples in arrival order, ``connections``, the
+    number of websockets opened, ``sockets``, the open websockets for
+    pushing events, and ``keys``, the keys sent through the HTTP send_key
+    endpoint.
+    """
+    loop = asyncio.get_running_loop()
+    device = SimpleNamespace(url=None, frames=[], connections=0, sockets=[], keys=[])
+
+    async def handle(request):
+        device.connections += 1
+        ws = web.WebSocketResponse()
+        await ws.prepare(request)
+        device.sockets.append(ws)
+        try:
+            async for message in ws:
+                if message.type == WSMsgType.TEXT:
+                    device.frames.append((loop.time(), message.json()))
+        finally:
+            device.sockets.remove(ws)
+        return ws
+
+    async def send_key(request):
+        device.keys.append(request.query["key"])
+        return web.json_response({"ok": True, "result": {}})
+
+    app = web.Application()
+    app.router.add_get("/api/ws", handle)
+    app.router.add_post("/api/hid/events/send_key", send_key)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    device.url = f"http://127.0.0.1:{site._server.sockets[0].getsockname()[1]}"
+    yield device
+    await runner.cleanup()
@@ -0,0 +1,66 @@
+"""Tests for the GLKVM TTL cache."""
+
+import asyncio
+
+import pytest
+
+from custom_components.glkvm.cache import TTLCache
+
+
+@pytest.mark.asyncio
+async def test_concurrent_callers_share_one_load():
+    """Ensure concurrent misses for one key trigger a single loader call."""
+    cache = TTLCache(ttl=60)
+    calls = 0
+
+    async def loader():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return b"jpeg"
+
+    results = await asyncio.gather(*(cache.async_get("key", loader) for _ in range(10)))
+
+    assert results == [b"jpeg"] * 10
+    assert calls == 1
+    assert await cache.async_get("key", loader) == b"jpeg"
+    assert calls == 1
+
+
+@pytest.mark.asyncio
+async def test_failed_load_is_not_cached():
+    """Ensure a failing loader is retried on the next call."""
+    cache = TTLCache(ttl=60)
+
+    async def failing():
+        raise OSError("boom")
+
+    async def working():
+        return 1
+
+    with pytest.raises(OSError):
+        await cache.async_get("key", failing)
+    assert await cache.async_get("key", working) == 1
+
+
+@pytest.mark.asyncio
+async def test_load_in_flight_during_invalidate_is_not_stored():
+    """Ensure a value read before an invalidation is not served after it."""
+    cache = TTLCache(ttl=60)
+    release = asyncio.Event()
+
+    async def stale():
+        await release.wait()
+        return "off"
+
+    async def fresh():
+        return "on"
+
+    task = asyncio.ensure_future(cache.async_get("atx", stale))
+    await asyncio.sleep(0.01)
+    cache.invalidate()
+    release.set()
+
+    assert await task == "off"
+    assert cache.get_fresh("atx") is None
+    assert await cache.async_get("atx", fresh) == "on"
@@ -0,0 +1,140 @@
+"""Tests for GLKVM certificate pinning and rotation."""
+
+import http.server
+import ssl
+import threading
+from unittest.mock import AsyncMock, patch
+
+import OpenSSL
+import pytest
+import requests
+from homeassistant.helpers import issue_registry as ir
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.glkvm.cert_handler import (
+    cert_fingerprint,
+    create_session_with_cert,
+)
+from custom_components.glkvm.const import (
+    CERT_POLICY_ACCEPT,
+    CONF_CERT_POLICY,
+    CONF_CERTIFICATE,
+    DOMAIN,
+)
+from custom_components.glkvm.coordinator import GLKVMDataUpdateCoordinator
+
+
+def _self_signed(tmp_path, name):
+    """Write a self-signed certificate and key, returning the PEM and paths."""
+    key = OpenSSL.crypto.PKey()
+    key.generate_key(OpenSSL.crypto.TYPE_RSA, 2048)
+    cert = OpenSSL.crypto.X509()
+    cert.get_subject().CN = name
+    cert.set_serial_number(1)
+    cert.gmtime_adj_notBefore(0)
+    cert.gmtime_adj_notAfter(3600)
+    cert.set_issuer(cert.get_subject())
+    cert.set_pubkey(key)
+    cert.sign(key, "sha256")
+    pem = OpenSSL.crypto.dump_certificate(OpenSSL.crypto.FILETYPE_PEM, cert).decode()
+    cert_path = tmp_path / f"{name}.pem"
+    key_path = tmp_path / f"{name}.key"
+    cert_path.write_text(pem)
+    key_path.write_bytes(OpenSSL.crypto.dump_privatekey(OpenSSL.crypto.FILETYPE_PEM, key))
+    return pem, cert_path, key_path
+
+
+class _Handler(http.server.BaseHTTPRequestHandler):
+    """Answer every request with an empty kvmd result."""
+
+    def do_GET(self):
+        body = b'{"ok": true, "result": {}}'
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def tls_server(socket_enabled, tmp_path):
+    """Serve HTTPS with a self-signed certificate, returning its URL and PEM."""
+    pem, cert_path, key_path = _self_signed(tmp_path, "glkvm")
+    context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+    context.load_cert_chain(cert_path, key_path)
+    server = http.server.HTTPServer(("127.0.0.1", 0), _Handler)
+    server.socket = context.wrap_socket(server.socket, server_side=True)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"https://127.0.0.1:{server.server_address[1]}", pem
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.mark.asyncio
+async def test_session_is_pinned_to_the_recorded_certificate(hass, tls_server, tmp_path):
+    """Ensure the recorded certificate connects and any other one is refused."""
+    url, pem = tls_server
+    other, _, _ = _self_signed(tmp_path, "other")
+
+    session, _ = await create_session_with_cert(hass, pem)
+    response = await hass.async_add_executor_job(session.get, url)
+    assert response.status_code == 200
+
+    session, _ = await create_session_with_cert(hass, other)
+    with pytest.raises(requests.exceptions.SSLError):
+        await hass.async_add_executor_job(session.get, url)
+
+
+@pytest.mark.asyncio
+async def test_rotated_certificate_raises_repair_issue(hass, tls_server, tmp_path):
+    """Ensure a rotated certificate raises a fixable issue by default."""
+    url, pem = tls_server
+    old, _, _ = _self_signed(tmp_path, "old")
+    entry = MockConfigEntry(domain=DOMAIN, data={CONF_CERTIFICATE: old})
+    entry.add_to_hass(hass)
+    coordinator = GLKVMDataUpdateCoordinator(hass, url, "admin", "admin", old)
+    coordinator.config_entry = entry
+    await coordinator.async_setup()
+
+    with patch(
+        "custom_components.glkvm.coordinator.fetch_serialized_cert",
+        new=AsyncMock(return_value=pem),
+    ):
+        await coordinator.async_refresh()
+
+    assert not coordinator.last_update_success
+    issue = ir.async_get(hass).async_get_issue(
+        DOMAIN, f"certificate_changed_{entry.entry_id}"
+    )
+    assert issue.is_fixable
+    assert issue.translation_placeholders["fingerprint"] == cert_fingerprint(pem)
+    assert entry.data[CONF_CERTIFICATE] == old
+
+
+@pytest.mark.asyncio
+async def test_rotated_certificate_is_accepted_in_one_poll(hass, tls_server, tmp_path):
+    """Ensure the accept policy re-pins within the failing poll."""
+    url, pem = tls_server
+    old, _, _ = _self_signed(tmp_path, "old")
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        data={CONF_CERTIFICATE: old},
+        options={CONF_CERT_POLICY: CERT_POLICY_ACCEPT},
+    )
+    entry.add_to_hass(hass)
+    coordinator = GLKVMDataUpdateCoordinator(hass, url, "admin", "admin", old)
+    coordinator.config_entry = entry
+    await coordinator.async_setup()
+
+    with patch(
+        "custom_components.glkvm.coordinator.fetch_serialized_cert",
+        new=AsyncMock(return_value=pem),
+    ):
+        await coordinator.async_refresh()
+
+    assert coordinator.last_update_success
+    assert coordinator.cert == pem
+    assert entry.data[CONF_CERTIFICATE] == pem
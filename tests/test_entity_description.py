@@ -0,0 +1,29 @@
+"""Tests for GLKVM entities driven by entity descriptions."""
+
+from unittest.mock import MagicMock
+
+import pytest
+
+from custom_components.glkvm.sensor import ATX_SENSORS, GLKVMSensor
+
+
+@pytest.mark.asyncio
+async def test_state_is_written_only_when_the_value_changes(runtime, coordinator):
+    """Ensure updates with an unchanged evaluation do not write the state."""
+    coordinator.data = {"atx": {"power": "on", "leds": {"power": True, "hdd": False}}}
+    sensor = runtime.create(GLKVMSensor, ATX_SENSORS[0])
+    sensor.async_write_ha_state = MagicMock()
+
+    assert sensor.unique_id.endswith("_atx_power_state")
+    assert sensor.state == "on"
+
+    sensor._handle_coordinator_update()
+    coordinator.data = {"atx": {"power": "on", "leds": {"power": True, "hdd": False}}}
+    sensor._handle_coordinator_update()
+    assert sensor.async_write_ha_state.call_count == 1
+
+    coordinator.data = {"atx": {"power": "off", "leds": {"power": False, "hdd": False}}}
+    sensor._handle_coordinator_update()
+    assert sensor.async_write_ha_state.call_count == 2
+    assert sensor.state == "off"
+    assert sensor.extra_state_attributes["power_led"] is False
@@ -0,0 +1,112 @@
+"""Tests for setting up many GLKVM config entries."""
+
+from time import perf_counter
+from unittest.mock import patch
+
+import pytest
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from homeassistant.helpers.device_registry import DeviceInfo
+
+from custom_components.glkvm import binary_sensor, button, camera, sensor, switch
+from custom_components.glkvm.const import (
+    CONF_CERTIFICATE,
+    CONF_HOST,
+    CONF_PASSWORD,
+    CONF_SERIAL,
+    DOMAIN,
+)
+from custom_components.glkvm.coordinator import GLKVMDataUpdateCoordinator
+from custom_components.glkvm.entity import GLKVMEntryRuntime
+
+ENTRIES = 500
+# Per-entry setup cost may grow this much from ENTRIES / 10 to ENTRIES entries
+SCALING_LIMIT = 3
+PLATFORMS = (sensor, binary_sensor, button, switch, camera)
+
+# One GPIO input and output, so the GPIO entities are set up as well
+GPIO = {
+    "model": {
+        "scheme": {
+            "inputs": {"sense": {}},
+            "outputs": {"relay": {"switch": True, "pulse": {"delay": 0.1}}},
+        }
+    },
+    "state": {
+        "inputs": {"sense": {"online": True, "state": False}},
+        "outputs": {"relay": {"online": True, "state": True}},
+    },
+}
+
+
+async def _async_setup_entries(hass, start, count):
+    """Set up count entries from index start and return their entities by serial."""
+    entities_by_serial = {}
+    for index in range(start, start + count):
+        serial = f"glkvm-{index}"
+        entry = MockConfigEntry(
+            domain=DOMAIN,
+            title=f"KVM {index}",
+            data={
+                CONF_HOST: f"https://kvm-{index}.local",
+                CONF_PASSWORD: "password",
+                CONF_SERIAL: serial,
+                CONF_CERTIFICATE: "cert",
+            },
+        )
+        coordinator = GLKVMDataUpdateCoordinator(
+            hass, entry.data[CONF_HOST], "admin", "password", "cert"
+        )
+        coordinator.data = {
+            "system": {"kvmd": {"version": f"4.{index}"}},
+            "atx": {},
+            "gpio": GPIO,
+        }
+        hass.data.setdefault(DOMAIN, {})[entry.entry_id] = GLKVMEntryRuntime(
+            entry, coordinator
+        )
+
+        added = []
+        for platform in PLATFORMS:
+            await platform.async_setup_entry(
+                hass,
+                entry,
+                lambda entities, update=False, added=added: added.extend(entities),
+            )
+        entities_by_serial[serial] = added
+    return entities_by_serial
+
+
+@pytest.mark.asyncio
+async def test_many_entries_keep_their_own_device_info(hass):
+    """Ensure each entry's entities use its own device, built once per entry."""
+    with patch(
+        "custom_components.glkvm.entity.DeviceInfo", wraps=DeviceInfo
+    ) as device_info:
+        entities_by_serial = await _async_setup_entries(hass, 0, ENTRIES)
+
+    assert device_info.call_count == ENTRIES
+    for index, (serial, entities) in enumerate(entities_by_serial.items()):
+        platforms = {type(entity).__module__.rsplit(".", 1)[1] for entity in entities}
+        assert platforms == {platform.__name__.rsplit(".", 1)[1] for platform in PLATFORMS}
+        for entity in entities:
+            assert entity.device_info["identifiers"] == {(DOMAIN, serial)}
+            assert entity.device_info["sw_version"] == f"4.{index}"
+    unique_ids = [e.unique_id for entities in entities_by_serial.values() for e in entities]
+    assert len(unique_ids) == len(set(unique_ids))
+
+
+@pytest.mark.asyncio
+async def test_entry_setup_cost_scales_linearly(hass):
+    """Ensure setting up an entry does not get slower as more entries exist."""
+    # Warm up imports and caches so they do not count against the small run
+    await _async_setup_entries(hass, 0, ENTRIES // 10)
+
+    per_entry = []
+    for start, count in ((ENTRIES, ENTRIES // 10), (2 * ENTRIES, ENTRIES)):
+        began = perf_counter()
+        await _async_setup_entries(hass, start, count)
+        per_entry.append((perf_counter() - began) / count)
+
+    small, large = per_entry
+    assert large < small * SCALING_LIMIT
@@ -0,0 +1,120 @@
+"""Tests for the GLKVM GPIO entities."""
+
+import asyncio
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from custom_components.glkvm import binary_sensor, button, switch
+from custom_components.glkvm.const import (
+    API_GPIO_PULSE,
+    API_GPIO_SWITCH,
+)
+
+# /api/gpio result: kvmd internals start with "__", "led" has no pulse delay
+GPIO = {
+    "model": {
+        "scheme": {
+            "inputs": {"__v3_usb_breaker__": {}, "relay_in": {}},
+            "outputs": {
+                "__v4_locator__": {"switch": True, "pulse": {"delay": 0.1}},
+                "relay": {"switch": True, "pulse": {"delay": 0.1}},
+                "led": {"switch": True, "pulse": {"delay": 0}},
+                "button": {"switch": False, "pulse": {"delay": 0.5}},
+            },
+        }
+    },
+    "state": {
+        "inputs": {
+            "__v3_usb_breaker__": {"online": True, "state": True},
+            "relay_in": {"online": True, "state": False},
+        },
+        "outputs": {
+            "relay": {"online": True, "state": True},
+            "led": {"online": False, "state": False},
+            "button": {"online": True, "state": False},
+        },
+    },
+}
+
+
+@pytest.fixture
+def coordinator(coordinator):
+    """Return a coordinator whose last poll returned the GPIO stub."""
+    coordinator.data = {"atx": {}, "gpio": GPIO}
+    return coordinator
+
+
+async def _entities(hass, config_entry, platform) -> dict:
+    """Set up a platform and return its GPIO entities by description key."""
+    added = []
+    await platform.async_setup_entry(
+        hass,
+        config_entry,
+        lambda entities, update=False: added.extend(entities),
+    )
+    return {
+        entity.entity_description.key: entity
+        for entity in added
+        if entity.entity_description.key.startswith("gpio_")
+    }
+
+
+async def test_channels_are_discovered_without_kvmd_internals(
+    hass, config_entry, coordinator
+):
+    """Ensure each platform picks its channels and skips "__" names."""
+    inputs = await _entities(hass, config_entry, binary_sensor)
+    switches = await _entities(hass, config_entry, switch)
+    buttons = await _entities(hass, config_entry, button)
+
+    assert list(inputs) == ["gpio_relay_in"]
+    assert list(switches) == ["gpio_relay", "gpio_led"]
+    assert list(buttons) == ["gpio_relay_pulse", "gpio_button_pulse"]
+
+    assert inputs["gpio_relay_in"].is_on is False
+    assert switches["gpio_relay"].is_on is True
+    assert not switches["gpio_led"].available
+
+
+async def test_switches_and_pulses_send_their_channel(hass, config_entry, coordinator):
+    """Ensure GPIO commands carry the channel and the requested state."""
+    coordinator.async_send_command = AsyncMock(return_value=True)
+    switches = await _entities(hass, config_entry, switch)
+    buttons = await _entities(hass, config_entry, button)
+
+    await switches["gpio_relay"].async_turn_off()
+    await switches["gpio_relay"].async_turn_on()
+    await buttons["gpio_button_pulse"].async_press()
+
+    assert [c.args for c in coordinator.async_send_command.await_args_list] == [
+        (API_GPIO_SWITCH, {"channel": "relay", "state": 0}),
+        (API_GPIO_SWITCH, {"channel": "relay", "state": 1}),
+        (API_GPIO_PULSE, {"channel": "button"}),
+    ]
+
+
+async def test_commands_to_one_device_are_serialized(coordinator):
+    """Ensure concurrent commands never overlap on the device."""
+    running = peak = 0
+
+    async def post(path, params=None, **kwargs):
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.01)
+        running -= 1
+        return MagicMock(status_code=200)
+
+    coordinator.async_post = post
+    coordinator.async_request_refresh = AsyncMock()
+
+    results = await asyncio.gather(
+        *(
+            coordinator.async_send_command(API_GPIO_PULSE, {"channel": channel})
+            for channel in ("relay", "button", "relay")
+        )
+    )
+
+    assert results == [True, True, True]
+    assert peak == 1
@@ -0,0 +1,102 @@
+"""Tests for the GLKVM hardware health sensors."""
+
+from unittest.mock import MagicMock
+
+import pytest
+
+from homeassistant.components.sensor import SensorDeviceClass, SensorStateClass
+from homeassistant.const import UnitOfTemperature
+
+from custom_components.glkvm import sensor
+from custom_components.glkvm.sensor import HEALTH_SENSORS, GLKVMHealthSensor
+from custom_components.glkvm.utils import get_hw_health
+
+INFO = {
+    "hw": {
+        "health": {
+            "temp": {"cpu": 47.2, "gpu": 46.0},
+            "throttling": {
+                "raw_flags": 0x50005,
+                "parsed_flags": {
+                    "undervoltage": {"now": True, "past": True},
+                    "freq_capped": {"now": False, "past": True},
+                    "throttled": {"now": True, "past": True},
+                },
+            },
+        },
+        "platform": {"serial": "0001"},
+    },
+    "system": {"kvmd": {"version": "4.20"}},
+}
+
+
+def test_hw_health_is_read_from_the_info_result():
+    """Ensure temperature, throttling and version are taken from /api/info."""
+    health = get_hw_health(INFO)
+
+    assert health["temp"] == 47.2
+    assert health["throttling"]["raw_flags"] == 0x50005
+    assert health["kvmd_version"] == "4.20"
+    assert get_hw_health({"hw": {"platform": {}}}) == {}
+
+
+@pytest.mark.asyncio
+async def test_temperature_is_written_only_past_the_deadband(
+    hass, runtime, coordinator
+):
+    """Ensure small temperature moves are not written to the state machine."""
+    coordinator.data = {"health": get_hw_health(INFO)}
+    temperature, throttling, version = (
+        runtime.create(GLKVMHealthSensor, description, 1.0)
+        for description in HEALTH_SENSORS
+    )
+    temperature.hass = hass
+    temperature.async_write_ha_state = MagicMock()
+
+    assert not temperature.entity_registry_enabled_default
+    assert temperature.device_class is SensorDeviceClass.TEMPERATURE
+    assert temperature.state_class is SensorStateClass.MEASUREMENT
+    assert temperature.native_unit_of_measurement == UnitOfTemperature.CELSIUS
+    assert throttling.state == "throttled, undervoltage"
+    assert throttling.extra_state_attributes["since_boot"] == [
+        "freq_capped",
+        "throttled",
+        "undervoltage",
+    ]
+    assert version.state == "4.20"
+
+    temperature._handle_coordinator_update()
+    for temp in (47.6, 46.5, 48.1):
+        coordinator.data = {"health": {"temp": temp}}
+        temperature._handle_coordinator_update()
+        assert temperature.state == 47.2
+
+    coordinator.data = {"health": {"temp": 48.3}}
+    temperature._handle_coordinator_update()
+    assert temperature.state == 48.3
+    assert temperature.async_write_ha_state.call_count == 2
+
+
+@pytest.mark.asyncio
+async def test_health_values_exported_as_metrics_are_not_duplicated(
+    hass, config_entry, coordinator
+):
+    """Ensure temperature and throttling come from the metrics if exported."""
+    coordinator.data = {
+        "atx": {},
+        "health": get_hw_health(INFO),
+        "metrics": {"pikvm_hw_temp_cpu": 47.2, "pikvm_hw_throttling_raw_flags": 5.0},
+    }
+
+    added = []
+    await sensor.async_setup_entry(
+        hass, config_entry, lambda entities, update=False: added.extend(entities)
+    )
+    keys = {
+        entity.entity_description.key
+        for entity in added
+        if hasattr(entity, "entity_description")
+    }
+
+    assert {"metric_hw_temp_cpu", "metric_hw_throttling", "kvmd_version"} <= keys
+    assert not keys & {"hw_temp", "hw_throttling"}
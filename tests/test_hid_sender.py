@@ -0,0 +1,99 @@
+"""Tests for key and mouse input over the websocket."""
+
+import asyncio
+
+import pytest
+
+from custom_components.glkvm.const import API_HID_SEND_KEY
+from custom_components.glkvm.coordinator import GLKVMDataUpdateCoordinator
+from custom_components.glkvm.hid_sender import EVENT_MOVE, EVENT_MOVE_BY
+from custom_components.glkvm.services import key_events, mouse_events
+
+KEYSTROKES = 50
+
+
+@pytest.fixture
+async def coordinator(hass, fake_kvmd_ws):
+    """Return a coordinator of the fake device."""
+    coordinator = GLKVMDataUpdateCoordinator(
+        hass, fake_kvmd_ws.url, "admin", "admin", None
+    )
+    await coordinator.async_setup()
+    yield coordinator
+    await coordinator.async_shutdown()
+
+
+@pytest.mark.asyncio
+async def test_calls_share_one_websocket(coordinator, fake_kvmd_ws):
+    """Ensure consecutive calls reuse the connection and keep event order."""
+    first = await coordinator.hid.async_send(key_events([["ControlLeft", "KeyC"]]))
+    second = await coordinator.hid.async_send(
+        mouse_events([{"button": "left", "state": "click"}])
+    )
+    await asyncio.sleep(0.05)
+
+    assert fake_kvmd_ws.connections == 1
+    assert first["events"] == first["frames"] == 4
+    assert second["events"] == 2
+    assert first["max_latency_ms"] >= first["mean_latency_ms"] >= 0
+    assert [
+        (frame["event_type"], frame["event"].get("key") or frame["event"].get("button"))
+        for _, frame in fake_kvmd_ws.frames
+    ] == [
+        ("key", "ControlLeft"),
+        ("key", "KeyC"),
+        ("key", "KeyC"),
+        ("key", "ControlLeft"),
+        ("mouse_button", "left"),
+        ("mouse_button", "left"),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_queued_moves_are_coalesced(coordinator, fake_kvmd_ws):
+    """Ensure moves waiting for the writer are sent as one frame."""
+    absolute = await asyncio.gather(
+        *(coordinator.hid.async_send([(EVENT_MOVE, (i, -i))]) for i in range(100))
+    )
+    relative = await asyncio.gather(
+        *(coordinator.hid.async_send([(EVENT_MOVE_BY, (100, -3))]) for _ in range(3))
+    )
+    await asyncio.sleep(0.05)
+
+    assert all(result["frames"] == 1 for result in absolute + relative)
+    frames = [frame for _, frame in fake_kvmd_ws.frames]
+    assert frames == [
+        {"event_type": "mouse_move", "event": {"to": {"x": 99, "y": -99}}},
+        {
+            "event_type": "mouse_relative",
+            "event": {
+                "delta": [
+                    {"x": 127, "y": -9},
+                    {"x": 127, "y": 0},
+                    {"x": 46, "y": 0},
+                ],
+                "squash": True,
+            },
+        },
+    ]
+    assert coordinator.hid.events_sent == 103
+    assert coordinator.hid.frames_sent == 2
+
+
+@pytest.mark.asyncio
+async def test_websocket_needs_no_request_per_event(coordinator, fake_kvmd_ws):
+    """Ensure keystrokes take one frame each on one connection, not requests."""
+    keys = [[f"Key{chr(ord('A') + i % 26)}"] for i in range(KEYSTROKES)]
+
+    for (key,) in keys:
+        response = await coordinator.async_post(API_HID_SEND_KEY, params={"key": key})
+        response.raise_for_status()
+    assert len(fake_kvmd_ws.keys) == KEYSTROKES
+
+    result = await coordinator.hid.async_send(key_events(keys))
+    await asyncio.sleep(0.05)
+
+    assert result["events"] == result["frames"] == 2 * KEYSTROKES
+    assert len(fake_kvmd_ws.frames) == 2 * KEYSTROKES
+    assert len(fake_kvmd_ws.keys) == KEYSTROKES
+    assert fake_kvmd_ws.connections == 1
@@ -0,0 +1,174 @@
+"""Benchmark of the HTTP/2 transport against HTTP/1.1 on a high-latency link."""
+
+import asyncio
+from contextlib import asynccontextmanager
+import ssl
+import time
+
+import pytest
+import requests
+
+from custom_components.glkvm.coordinator import GLKVMDataUpdateCoordinator
+from custom_components.glkvm.http2 import GLKVMHttp2Client
+
+from .test_cert_pinning import _self_signed
+
+h2_config = pytest.importorskip("h2.config")
+h2_connection = pytest.importorskip("h2.connection")
+h2_events = pytest.importorskip("h2.events")
+
+# Delay before each response, standing in for the round trip to a remote KVM
+RTT = 0.1
+REFRESHES = 3
+BODY = b'{"ok": true, "result": {}}'
+
+
+async def _serve_http1(reader, writer):
+    """Answer HTTP/1.1 requests one after the other on a kept-alive connection."""
+    while True:
+        try:
+            await reader.readuntil(b"\r\n\r\n")
+        except (asyncio.IncompleteReadError, ConnectionError):
+            return
+        await asyncio.sleep(RTT)
+        writer.write(
+            b"HTTP/1.1 200 OK\r\nContent-Type: application/json\r\n"
+            b"Content-Length: %d\r\n\r\n%s" % (len(BODY), BODY)
+        )
+
+
+async def _serve_h2(reader, writer):
+    """Answer every HTTP/2 stream concurrently."""
+    conn = h2_connection.H2Connection(h2_config.H2Configuration(client_side=False))
+    conn.initiate_connection()
+    writer.write(conn.data_to_send())
+
+    async def respond(stream_id):
+        await asyncio.sleep(RTT)
+        conn.send_headers(
+            stream_id,
+            [
+                (":status", "200"),
+                ("content-type", "application/json"),
+                ("content-length", str(len(BODY))),
+            ],
+        )
+        conn.send_data(stream_id, BODY, end_stream=True)
+        writer.write(conn.data_to_send())
+
+    responses = set()
+    while data := await reader.read(65536):
+        for event in conn.receive_data(data):
+            if isinstance(event, h2_events.RequestReceived):
+                task = asyncio.create_task(respond(event.stream_id))
+                responses.add(task)
+                task.add_done_callback(responses.discard)
+        writer.write(conn.data_to_send())
+
+
+@asynccontextmanager
+async def _device(tmp_path, protocols):
+    """Run a TLS server offering the given ALPN protocols; yield URL and PEM."""
+    pem, cert_path, key_path = _self_signed(tmp_path, "glkvm")
+    context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+    context.load_cert_chain(cert_path, key_path)
+    context.set_alpn_protocols(protocols)
+
+    async def handle(reader, writer):
+        ssl_object = writer.get_extra_info("ssl_object")
+        try:
+            if ssl_object.selected_alpn_protocol() == "h2":
+                await _serve_h2(reader, writer)
+            else:
+                await _serve_http1(reader, writer)
+        finally:
+            writer.close()
+
+    server = await asyncio.start_server(handle, "127.0.0.1", 0, ssl=context)
+    try:
+        yield f"https://127.0.0.1:{server.sockets[0].getsockname()[1]}", pem
+    finally:
+        server.close()
+
+
+async def _refresh_time(coordinator):
+    """Return the mean duration of a warm refresh."""
+    await coordinator.async_setup()
+    # Connection setup and the slow tier happen on the first refresh
+    await coordinator.async_refresh()
+    start = time.monotonic()
+    for _ in range(REFRESHES):
+        await coordinator.async_refresh()
+        assert coordinator.last_update_success
+    elapsed = (time.monotonic() - start) / REFRESHES
+    await coordinator.async_shutdown()
+    return elapsed
+
+
+@pytest.mark.asyncio
+async def test_http2_refresh_takes_one_round_trip(hass, socket_enabled, tmp_path):
+    """Ensure multiplexed refreshes beat sequential HTTP/1.1 requests."""
+    async with _device(tmp_path, ["h2", "http/1.1"]) as (url, pem):
+        http1_time = await _refresh_time(
+            GLKVMDataUpdateCoordinator(hass, url, "admin", "admin", pem)
+        )
+        coordinator = GLKVMDataUpdateCoordinator(
+            hass, url, "admin", "admin", pem, http2=True
+        )
+        http2_time = await _refresh_time(coordinator)
+
+    assert coordinator.http2.http_version == "HTTP/2"
+    # Three requests per refresh: about 3 RTT sequentially, 1 RTT multiplexed
+    assert http1_time >= 3 * RTT
+    assert http2_time < 2 * RTT
+
+
+@pytest.mark.asyncio
+async def test_http2_falls_back_to_http1(hass, socket_enabled, tmp_path):
+    """Ensure a device without h2 is still polled through the HTTP/2 client."""
+    async with _device(tmp_path, ["http/1.1"]) as (url, pem):
+        coordinator = GLKVMDataUpdateCoordinator(
+            hass, url, "admin", "admin", pem, http2=True
+        )
+        await coordinator.async_setup()
+        await coordinator.async_refresh()
+        await coordinator.async_shutdown()
+
+    assert coordinator.last_update_success
+    assert coordinator.http2.http_version == "HTTP/1.1"
+
+
+@pytest.mark.asyncio
+async def test_http2_refuses_another_certificate_before_sending(
+    hass, socket_enabled, tmp_path
+):
+    """Ensure no request, and no credentials, reach another certificate."""
+    _, cert_path, key_path = _self_signed(tmp_path, "glkvm")
+    other, _, _ = _self_signed(tmp_path, "other")
+    context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+    context.load_cert_chain(cert_path, key_path)
+    context.set_alpn_protocols(["h2", "http/1.1"])
+    received = []
+
+    async def handle(reader, writer):
+        # TLS is started here, so the aborted handshake is not logged
+        try:
+            await writer.start_tls(context)
+            received.append(await reader.read(65536))
+        except (ssl.SSLError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    server = await asyncio.start_server(handle, "127.0.0.1", 0)
+    url = f"https://127.0.0.1:{server.sockets[0].getsockname()[1]}"
+    pinned = GLKVMHttp2Client(url, "admin", "secret", other)
+    try:
+        with pytest.raises(requests.exceptions.SSLError):
+            await pinned.async_get("/api/auth/check")
+    finally:
+        await pinned.async_close()
+        server.close()
+        await server.wait_closed()
+
+    assert not any(received)
@@ -0,0 +1,38 @@
+"""Tests for the GLKVM ATX LED history."""
+
+from custom_components.glkvm.led_history import LedRingBuffer
+
+
+def test_duty_cycle_is_time_weighted():
+    """Ensure the duty cycle weighs each state by how long it lasted."""
+    buffer = LedRingBuffer(size=16)
+    buffer.append(0.0, False)
+    buffer.append(50.0, True)
+    buffer.append(60.0, False)
+    buffer.append(90.0, True)
+
+    # Window 40..100: on 50-60 and 90-100
+    assert buffer.duty_cycle(100.0, 60) == round(20 * 100 / 60, 1)
+    assert buffer.duty_cycle(100.0, 10) == 100.0
+
+
+def test_repeated_states_are_not_stored():
+    """Ensure samples repeating the current state do not use buffer slots."""
+    buffer = LedRingBuffer(size=4)
+    for timestamp in range(10):
+        buffer.append(float(timestamp), True)
+
+    assert len(buffer) == 1
+    assert buffer.duty_cycle(20.0, 10) == 100.0
+
+
+def test_overwritten_history_uses_covered_part():
+    """Ensure a full buffer averages over the part of the window it covers."""
+    buffer = LedRingBuffer(size=4)
+    for timestamp in range(8):
+        buffer.append(float(timestamp), timestamp % 2 == 0)
+
+    # Only transitions 4..7 remain, covering 4..8 with the LED on half the time
+    assert len(buffer) == 4
+    assert buffer.duty_cycle(8.0, 60) == 50.0
+    assert LedRingBuffer().duty_cycle(8.0, 60) is None
@@ -0,0 +1,85 @@
+"""Tests for the kvmd log follower."""
+
+import asyncio
+from types import SimpleNamespace
+
+from aiohttp import web
+import pytest
+from pytest_homeassistant_custom_component.common import async_capture_events
+
+from custom_components.glkvm.const import API_LOG, EVENT_LOG
+from custom_components.glkvm.log_follower import (
+    GLKVMLogFollower,
+    async_iter_bounded_lines,
+)
+
+
+@pytest.fixture
+async def fake_log(socket_enabled):
+    """Serve a followed log that writes its lines and then stays silent."""
+    device = SimpleNamespace(url=None, lines=[], closed=asyncio.Event())
+
+    async def log(request):
+        response = web.StreamResponse(headers={"Content-Type": "text/plain"})
+        await response.prepare(request)
+        for line in device.lines:
+            await response.write(line.encode() + b"\n")
+        await device.closed.wait()
+        return response
+
+    app = web.Application()
+    app.router.add_get(API_LOG, log)
+    runner = web.AppRunner(app, shutdown_timeout=0)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    device.url = f"http://127.0.0.1:{site._server.sockets[0].getsockname()[1]}"
+    yield device
+    device.closed.set()
+    await runner.cleanup()
+
+
+async def _chunks(*chunks: bytes):
+    for chunk in chunks:
+        yield chunk
+
+
+async def test_long_lines_are_truncated():
+    """Ensure lines are split across chunks and capped in length."""
+    lines = [
+        line
+        async for line in async_iter_bounded_lines(
+            _chunks(b"short\nvery long li", b"ne indeed\n", b"tail"), 8
+        )
+    ]
+
+    assert lines == [b"short", b"very lon", b"tail"]
+
+
+async def test_stop_returns_while_the_log_is_silent(hass, fake_log):
+    """Ensure stopping does not wait for the device to write another line."""
+    fake_log.lines = ["kvmd started", "ERROR: HID is offline"]
+    events = async_capture_events(hass, EVENT_LOG)
+    follower = GLKVMLogFollower(
+        hass,
+        SimpleNamespace(
+            url=fake_log.url,
+            username="admin",
+            password="admin",
+            cert=None,
+            resolver=None,
+        ),
+        "entry",
+        "^ERROR",
+    )
+    follower.async_start()
+    async with asyncio.timeout(5):
+        while len(follower.buffer) < 2:
+            await asyncio.sleep(0.01)
+
+    async with asyncio.timeout(1):
+        await follower.async_stop()
+
+    assert list(follower.buffer) == fake_log.lines
+    assert follower.matched == 1
+    assert [event.data["line"] for event in events] == ["ERROR: HID is offline"]
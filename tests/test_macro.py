@@ -0,0 +1,97 @@
+"""Tests for GLKVM keyboard macros."""
+
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from custom_components.glkvm.macro import Macro, async_play, compile_steps
+from custom_components.glkvm.websocket import GLKVMEventStream
+
+
+def test_compile_steps_delta_encodes_the_timeline():
+    """Ensure chords, repeats, text and waits become delta rows."""
+    rows = compile_steps(
+        [
+            {"keys": ["Delete"], "repeat": 2, "interval": 100, "hold": 10},
+            {"wait": 500},
+            {"keys": ["ControlLeft", "KeyC"], "hold": 5},
+            {"text": "A"},
+        ]
+    )
+
+    assert rows == [
+        [0, "Delete", 1],
+        [10, "Delete", 0],
+        [100, "Delete", 1],
+        [10, "Delete", 0],
+        [600, "ControlLeft", 1],
+        [0, "KeyC", 1],
+        [5, "KeyC", 0],
+        [0, "ControlLeft", 0],
+        [30, "ShiftLeft", 1],
+        [0, "KeyA", 1],
+        [20, "KeyA", 0],
+        [0, "ShiftLeft", 0],
+    ]
+    assert Macro(rows).duration == pytest.approx(0.775)
+
+
+def test_compile_steps_rejects_unknown_characters():
+    """Ensure text without a US layout key is refused."""
+    with pytest.raises(ValueError):
+        compile_steps([{"text": "é"}])
+
+
+@pytest.mark.asyncio
+async def test_replay_follows_the_macro_timing(hass, fake_kvmd_ws):
+    """Ensure frames reach the device at their offsets from the start."""
+    device = SimpleNamespace(
+        url=fake_kvmd_ws.url,
+        username="admin",
+        password="admin",
+        cert=None,
+        resolver=None,
+    )
+    stream = GLKVMEventStream(hass, device)
+    macro = Macro(
+        compile_steps([{"keys": ["Delete"], "repeat": 10, "hold": 15, "interval": 35}])
+    )
+
+    result = await async_play(stream, macro)
+    await asyncio.sleep(0.05)
+    await stream.async_close()
+
+    assert result["events"] == 20
+    frames = fake_kvmd_ws.frames
+    assert [frame["event"]["state"] for _, frame in frames] == [True, False] * 10
+    start = frames[0][0]
+    for (received, _), (offset, *_) in zip(frames, macro.events):
+        assert received - start == pytest.approx(offset, abs=0.015)
+
+
+@pytest.mark.asyncio
+async def test_interrupted_replay_releases_held_keys(hass, fake_kvmd_ws):
+    """Ensure cancelling a replay mid-chord releases the pressed keys."""
+    device = SimpleNamespace(
+        url=fake_kvmd_ws.url,
+        username="admin",
+        password="admin",
+        cert=None,
+        resolver=None,
+    )
+    stream = GLKVMEventStream(hass, device)
+    macro = Macro(compile_steps([{"keys": ["ControlLeft", "AltLeft"], "hold": 5000}]))
+
+    task = hass.async_create_task(async_play(stream, macro))
+    await asyncio.sleep(0.5)
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+    await asyncio.sleep(0.05)
+    await stream.async_close()
+
+    released = {
+        frame["event"]["key"] for _, frame in fake_kvmd_ws.frames if not frame["event"]["state"]
+    }
+    assert released == {"ControlLeft", "AltLeft"}
@@ -0,0 +1,221 @@
+"""Tests for GLKVM virtual media transfers."""
+
+import asyncio
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import json
+import threading
+from types import SimpleNamespace
+from typing import ClassVar
+from unittest.mock import MagicMock, patch
+
+import pytest
+import requests
+
+from homeassistant.exceptions import ServiceValidationError
+from homeassistant.helpers import device_registry as dr
+
+from custom_components.glkvm.const import DOMAIN, SERVICE_MSD_WRITE_REMOTE
+from custom_components.glkvm.coordinator import GLKVMDataUpdateCoordinator
+from custom_components.glkvm.msd import (
+    TRANSFER_CANCELLED,
+    TRANSFER_DONE,
+    TRANSFER_QUEUED,
+    ChunkedFileBody,
+    MsdTransfer,
+    TransferCancelled,
+    _follow_write_remote,
+    async_write_remote_many,
+)
+from custom_components.glkvm.services import async_setup_services
+
+
+class _FakeKvmdHandler(BaseHTTPRequestHandler):
+    """Answer /api/msd/write_remote like kvmd, with an NDJSON progress stream."""
+
+    records: ClassVar[list[dict]] = []
+
+    def do_POST(self):
+        """Stream the configured progress records."""
+        self.send_response(200)
+        self.send_header("Content-Type", "application/x-ndjson")
+        self.end_headers()
+        for record in self.records:
+            self.wfile.write(json.dumps(record).encode() + b"\n")
+
+    def log_message(self, *args):
+        """Silence request logging."""
+
+
+@pytest.fixture
+def fake_kvmd(socket_enabled):
+    """Run a local HTTP server standing in for the device."""
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _FakeKvmdHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_port}"
+    server.shutdown()
+
+
+def _coordinator(url):
+    return SimpleNamespace(
+        url=url,
+        session=requests.Session(),
+        auth=None,
+        hass=MagicMock(),
+        async_update_listeners=MagicMock(),
+    )
+
+
+def test_follow_write_remote_tracks_progress(fake_kvmd):
+    """Ensure progress records update the transfer."""
+    _FakeKvmdHandler.records = [
+        {"image": {"name": "test.iso", "size": 100, "written": 0}},
+        {"image": {"name": "test.iso", "size": 100, "written": 60}},
+        {"image": {"name": "test.iso", "size": 100, "written": 100}},
+    ]
+    transfer = MsdTransfer("test.iso", None, "http://images/test.iso")
+
+    error = _follow_write_remote(_coordinator(fake_kvmd), transfer, transfer.source)
+
+    assert error is None
+    assert transfer.total == 100
+    assert transfer.percent == 100.0
+
+
+def test_follow_write_remote_reports_device_error(fake_kvmd):
+    """Ensure an error record from the device is returned."""
+    _FakeKvmdHandler.records = [
+        {"image": {"name": "test.iso", "size": 0, "written": 0}},
+        {"error": "MsdError", "error_msg": "Can't fetch image"},
+    ]
+    transfer = MsdTransfer("test.iso", None, "http://images/test.iso")
+
+    error = _follow_write_remote(_coordinator(fake_kvmd), transfer, transfer.source)
+
+    assert error == "Can't fetch image"
+
+
+@pytest.fixture
+def image(tmp_path):
+    """Write a 10 byte image file."""
+    path = tmp_path / "test.iso"
+    path.write_bytes(b"0123456789")
+    return str(path)
+
+
+def test_chunked_body_streams_the_file_through_one_buffer(image):
+    """Ensure the file is sent in fixed-size views of a single buffer."""
+    transfer = MsdTransfer("test.iso", 10, image)
+    progress = MagicMock()
+    body = ChunkedFileBody(image, transfer, progress)
+
+    with patch("custom_components.glkvm.msd.MSD_CHUNK_SIZE", 4):
+        chunks = []
+        buffers = set()
+        for view in body:
+            chunks.append(bytes(view))
+            buffers.add(id(view.obj))
+
+    assert len(body) == 10
+    assert chunks == [b"0123", b"4567", b"89"]
+    assert len(buffers) == 1
+    assert transfer.written == 10
+    assert progress.called
+
+
+def test_chunked_body_stops_when_cancelled(image):
+    """Ensure setting the cancel event aborts the body before the next read."""
+    transfer = MsdTransfer("test.iso", 10, image)
+    body = ChunkedFileBody(image, transfer, MagicMock())
+
+    with patch("custom_components.glkvm.msd.MSD_CHUNK_SIZE", 4):
+        chunks = iter(body)
+        assert bytes(next(chunks)) == b"0123"
+        transfer.cancel_event.set()
+        with pytest.raises(TransferCancelled):
+            next(chunks)
+
+    assert transfer.written == 4
+
+
+def _loaded_device(
+    hass, add_entry, serial: str
+) -> tuple[str, GLKVMDataUpdateCoordinator]:
+    """Register a loaded entry and its device, returning the device ID."""
+    entry = add_entry(serial)
+    device = dr.async_get(hass).async_get_or_create(
+        config_entry_id=entry.entry_id, identifiers={(DOMAIN, serial)}
+    )
+    return device.id, hass.data[DOMAIN][entry.entry_id].coordinator
+
+
+async def test_write_remote_queues_a_repeated_device_once(hass, add_entry):
+    """Ensure a device listed twice gets one transfer, not a stranded second."""
+    first_id, first = _loaded_device(hass, add_entry, "kvm-1")
+    second_id, second = _loaded_device(hass, add_entry, "kvm-2")
+    await async_setup_services(hass)
+
+    with patch(
+        "custom_components.glkvm.services.async_write_remote_many"
+    ) as write_remote_many:
+        await hass.services.async_call(
+            DOMAIN,
+            SERVICE_MSD_WRITE_REMOTE,
+            {"device_id": [first_id, second_id, first_id], "url": "http://images/a.iso"},
+            blocking=True,
+        )
+        await hass.async_block_till_done()
+
+    coordinators, transfers, url, _ = write_remote_many.call_args.args
+    assert coordinators == [first, second]
+    assert transfers == [first.msd_transfer, second.msd_transfer]
+    assert all(t.state == TRANSFER_QUEUED and t.image == "a.iso" for t in transfers)
+    assert url == "http://images/a.iso"
+
+
+async def test_write_remote_refuses_before_queueing_anything(hass, add_entry):
+    """Ensure one busy device fails the call without queueing the others."""
+    idle_id, idle = _loaded_device(hass, add_entry, "kvm-1")
+    busy_id, busy = _loaded_device(hass, add_entry, "kvm-2")
+    busy.msd_transfer = MsdTransfer("b.iso", 10, "/media/b.iso")
+    await async_setup_services(hass)
+
+    with pytest.raises(ServiceValidationError, match="already running"):
+        await hass.services.async_call(
+            DOMAIN,
+            SERVICE_MSD_WRITE_REMOTE,
+            {"device_id": [idle_id, busy_id], "url": "http://images/a.iso"},
+            blocking=True,
+        )
+
+    assert idle.msd_transfer is None
+    assert busy.msd_transfer.image == "b.iso"
+
+
+async def test_write_remote_many_caps_parallel_downloads():
+    """Ensure at most max_parallel devices download at once."""
+    running = peak = 0
+
+    async def write_remote(coordinator, transfer, url):
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.01)
+        running -= 1
+        transfer.finish(TRANSFER_DONE)
+
+    coordinators = [MagicMock() for _ in range(6)]
+    transfers = [MsdTransfer("a.iso", None, "http://images/a.iso") for _ in coordinators]
+    for transfer in transfers:
+        transfer.state = TRANSFER_QUEUED
+    # Cancelled while queued: finished without being started
+    transfers[-1].cancel_event.set()
+
+    with patch(
+        "custom_components.glkvm.msd._async_write_remote", side_effect=write_remote
+    ) as started:
+        await async_write_remote_many(coordinators, transfers, "http://images/a.iso", 2)
+
+    assert peak == 2
+    assert started.call_count == 5
+    assert [t.state for t in transfers] == [TRANSFER_DONE] * 5 + [TRANSFER_CANCELLED]
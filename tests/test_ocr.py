@@ -0,0 +1,49 @@
+"""Tests for the GLKVM screen region OCR helpers."""
+
+import io
+
+import numpy as np
+from PIL import Image
+import pytest
+
+from custom_components.glkvm.ocr import parse_ocr_regions, region_digests
+
+
+def _jpeg(pixels: np.ndarray, quality: int = 90) -> bytes:
+    """Encode a grayscale array as JPEG."""
+    output = io.BytesIO()
+    Image.fromarray(pixels.astype(np.uint8), "L").save(output, "JPEG", quality=quality)
+    return output.getvalue()
+
+
+def test_parse_ocr_regions():
+    """Ensure regions are parsed and blank lines ignored."""
+    regions = parse_ocr_regions("POST: 0, 1040, 960, 1080\n\n Status :10,20,30,40\n")
+
+    assert regions == {"POST": (0, 1040, 960, 1080), "Status": (10, 20, 30, 40)}
+    assert parse_ocr_regions("") == {}
+
+
+@pytest.mark.parametrize(
+    "text",
+    ["POST 0,0,10,10", "POST: 0,0,10", "POST: 10,0,5,10", "A: 0,0,1,1\nA: 0,0,2,2"],
+)
+def test_parse_ocr_regions_rejects_malformed(text):
+    """Ensure malformed, empty and duplicate regions are rejected."""
+    with pytest.raises(ValueError):
+        parse_ocr_regions(text)
+
+
+def test_region_digest_changes_only_for_changed_region():
+    """Ensure a change in one region leaves the other region's digest alone."""
+    regions = {"top": (0, 0, 128, 32), "bottom": (0, 96, 128, 128)}
+    screen = np.zeros((128, 128))
+    screen[8:24, 8:64] = 255
+    changed = screen.copy()
+    changed[104:120, 8:64] = 255
+
+    before = region_digests(_jpeg(screen), regions)
+    after = region_digests(_jpeg(changed), regions)
+
+    assert before["top"] == after["top"]
+    assert before["bottom"] != after["bottom"]
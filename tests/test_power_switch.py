@@ -0,0 +1,83 @@
+"""Tests for the GLKVM power switch."""
+
+import asyncio
+from unittest.mock import AsyncMock
+
+import pytest
+import requests
+
+from custom_components.glkvm.const import (
+    API_ATX_POWER,
+    ATX_ACTION_POWER_ON,
+)
+from custom_components.glkvm.switch import POWER_SWITCH, GLKVMPowerSwitch
+
+
+def _power_switch(runtime, polled: str):
+    """Return a power switch whose last poll saw the given power state."""
+    coordinator = runtime.coordinator
+    coordinator.data = {"atx": {"power": polled}}
+    coordinator.async_post = AsyncMock(
+        return_value=AsyncMock(status_code=200, text="")
+    )
+    coordinator.async_request_refresh = AsyncMock()
+    return coordinator, runtime.create(GLKVMPowerSwitch, POWER_SWITCH)
+
+
+@pytest.mark.asyncio
+async def test_turn_on_reads_the_current_state(runtime):
+    """Ensure a stale 'on' poll does not skip powering on a host now off."""
+    coordinator, switch = _power_switch(runtime, "on")
+    loads = 0
+
+    async def load_atx():
+        nonlocal loads
+        loads += 1
+        await asyncio.sleep(0.01)
+        return {"power": "off"}
+
+    coordinator._async_load_atx = load_atx
+
+    await asyncio.gather(switch._async_fresh_is_on(), switch._async_fresh_is_on())
+    assert loads == 1
+
+    await switch.async_turn_on()
+    assert loads == 1
+    coordinator.async_post.assert_awaited_once_with(
+        API_ATX_POWER, params={"action": ATX_ACTION_POWER_ON}
+    )
+
+    # The command invalidates the cache, so the next decision reads again
+    await switch.async_turn_off()
+    assert loads == 2
+
+
+@pytest.mark.asyncio
+async def test_unreadable_state_falls_back_to_the_poll(runtime):
+    """Ensure a failed state read decides on the last polled state."""
+    coordinator, switch = _power_switch(runtime, "on")
+    coordinator._async_load_atx = AsyncMock(
+        side_effect=requests.exceptions.ConnectionError("down")
+    )
+
+    await switch.async_turn_on()
+
+    coordinator.async_post.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_concurrent_commands_decide_on_the_state_after_each_other(runtime):
+    """Ensure a second power on sees the first one and does not toggle back."""
+    coordinator, switch = _power_switch(runtime, "off")
+
+    async def load_atx():
+        await asyncio.sleep(0.01)
+        return {"power": "on" if coordinator.async_post.await_count else "off"}
+
+    coordinator._async_load_atx = load_atx
+
+    await asyncio.gather(switch.async_turn_on(), switch.async_turn_on())
+
+    coordinator.async_post.assert_awaited_once_with(
+        API_ATX_POWER, params={"action": ATX_ACTION_POWER_ON}
+    )
@@ -0,0 +1,31 @@
+"""Tests for the GLKVM Prometheus metrics parser."""
+
+from custom_components.glkvm.prometheus import parse_metrics
+
+
+def test_parse_metrics_keeps_whitelisted_families():
+    """Ensure only whitelisted families are kept and comments are skipped."""
+    lines = [
+        b"# TYPE pikvm_atx_power gauge",
+        b"pikvm_atx_power 1",
+        b"",
+        b"# TYPE process_cpu_seconds_total counter",
+        b"process_cpu_seconds_total 12.5",
+        b"pikvm_hw_temp_cpu 45.5 1700000000000",
+    ]
+
+    assert parse_metrics(lines) == {
+        "pikvm_atx_power": 1.0,
+        "pikvm_hw_temp_cpu": 45.5,
+    }
+
+
+def test_parse_metrics_labels_and_malformed_lines():
+    """Ensure labelled samples are keyed verbatim and bad values are dropped."""
+    lines = [
+        'pikvm_gpio_input_state{channel="led 1"} 0',
+        "pikvm_msd_online not-a-number",
+        "pikvm_hid_online",
+    ]
+
+    assert parse_metrics(lines) == {'pikvm_gpio_input_state{channel="led 1"}': 0.0}
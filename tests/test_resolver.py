@@ -0,0 +1,81 @@
+"""Tests for GLKVM host name resolution with address pinning."""
+
+import pytest
+
+from custom_components.glkvm.const import API_HID_SEND_KEY
+from custom_components.glkvm.coordinator import GLKVMDataUpdateCoordinator
+from custom_components.glkvm.resolver import GLKVMResolver
+from custom_components.glkvm.services import key_events
+
+
+def _answers(resolver, *answers):
+    """Make the resolver's lookups return or raise the answers in turn."""
+    answers = list(answers)
+    resolver.lookups = 0
+
+    def lookup():
+        resolver.lookups += 1
+        answer = answers.pop(0) if len(answers) > 1 else answers[0]
+        if isinstance(answer, Exception):
+            raise answer
+        return answer
+
+    resolver._lookup = lookup
+
+
+@pytest.mark.asyncio
+async def test_connections_reuse_the_pinned_address(hass, fake_kvmd_ws):
+    """Ensure new HTTP and websocket connections do not resolve again."""
+    port = fake_kvmd_ws.url.rsplit(":", 1)[1]
+    coordinator = GLKVMDataUpdateCoordinator(
+        hass, f"http://kvm.test:{port}", "admin", "admin", None
+    )
+    _answers(coordinator.resolver, ["127.0.0.1"])
+    await coordinator.async_setup()
+
+    for key in ("KeyA", "KeyB", "KeyC"):
+        response = await coordinator.async_post(API_HID_SEND_KEY, params={"key": key})
+        response.raise_for_status()
+        # Drop the kept-alive connection so the next request dials again
+        await hass.async_add_executor_job(coordinator.session.close)
+    await coordinator.hid.async_send(key_events([["Enter"]]))
+    await coordinator.async_shutdown()
+
+    assert fake_kvmd_ws.keys == ["KeyA", "KeyB", "KeyC"]
+    assert fake_kvmd_ws.frames
+    assert coordinator.resolver.lookups == 1
+    assert coordinator.resolver.address == "127.0.0.1"
+    assert coordinator.resolver.resolve_ms is not None
+
+
+@pytest.mark.asyncio
+async def test_failed_re_resolution_keeps_the_last_address(hass):
+    """Ensure the pin survives lookup failures and stays put while valid."""
+    resolver = GLKVMResolver(hass, "kvm.test", ttl=0)
+    _answers(
+        resolver,
+        ["10.0.0.5"],
+        OSError("mDNS timeout"),
+        ["10.0.0.6", "10.0.0.5"],
+        ["10.0.0.7"],
+    )
+
+    assert await resolver.async_get() == "10.0.0.5"
+    for expected in ("10.0.0.5", "10.0.0.5", "10.0.0.7"):
+        resolver.async_refresh()
+        await resolver._task
+        assert resolver.address == expected
+
+    assert resolver.lookups == 4
+    assert resolver.failures == 1
+    assert resolver.resolutions == 3
+
+
+def test_unresolvable_host_is_dialed_by_name(hass):
+    """Ensure a host that never resolved falls back to normal resolution."""
+    resolver = GLKVMResolver(hass, "kvm.test")
+    _answers(resolver, OSError("no such host"))
+
+    assert resolver.get() == "kvm.test"
+    assert resolver.address is None
+    assert not GLKVMResolver(hass, "192.168.8.1").expired
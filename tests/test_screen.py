@@ -0,0 +1,47 @@
+"""Tests for the GLKVM screen change detection."""
+
+import io
+
+import numpy as np
+from PIL import Image
+
+from custom_components.glkvm.const import SCREEN_CHANGE_THRESHOLD
+from custom_components.glkvm.screen import hamming_distance, hash_snapshot
+
+
+def _jpeg(pixels: np.ndarray, quality: int = 80) -> bytes:
+    """Encode a grayscale array as JPEG."""
+    output = io.BytesIO()
+    Image.fromarray(pixels.astype(np.uint8), "L").save(output, "JPEG", quality=quality)
+    return output.getvalue()
+
+
+def _desktop() -> np.ndarray:
+    """Return a synthetic desktop: gradient background with a window."""
+    pixels = np.tile(np.linspace(40, 200, 256), (192, 1))
+    pixels[40:140, 60:200] = 230
+    return pixels
+
+
+def test_noise_and_recompression_do_not_count_as_change():
+    """Ensure small pixel noise and JPEG quality changes keep the hash close."""
+    rng = np.random.default_rng(0)
+    base = _desktop()
+    noisy = np.clip(base + rng.normal(0, 4, base.shape), 0, 255)
+
+    distance = hamming_distance(
+        hash_snapshot(_jpeg(base)), hash_snapshot(_jpeg(noisy, quality=60))
+    )
+
+    assert distance < SCREEN_CHANGE_THRESHOLD
+
+
+def test_new_window_counts_as_change():
+    """Ensure a large layout change exceeds the change threshold."""
+    base = _desktop()
+    changed = base.copy()
+    changed[100:180, 10:120] = 10
+
+    distance = hamming_distance(hash_snapshot(_jpeg(base)), hash_snapshot(_jpeg(changed)))
+
+    assert distance >= SCREEN_CHANGE_THRESHOLD
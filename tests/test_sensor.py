@@ -0,0 +1,114 @@
+"""Tests for the GLKVM sensor entities."""
+
+from datetime import UTC, datetime
+from types import SimpleNamespace
+from unittest.mock import Mock
+
+from homeassistant.components.sensor import SensorDeviceClass, SensorStateClass
+from homeassistant.const import UnitOfTemperature
+
+from custom_components.glkvm.const import OCR_STATE_MAX_LENGTH
+from custom_components.glkvm.sensor import (
+    METRIC_SENSORS,
+    SCREEN_CHANGED,
+    GLKVMLedActivitySensor,
+    GLKVMOcrSensor,
+    GLKVMOnDemandSensor,
+    GLKVMSensor,
+    ocr_region_description,
+)
+
+
+def test_duty_cycle_is_a_rounded_measurement(runtime):
+    """Ensure the sensor options reach Home Assistant's sensor entity."""
+    sensor = runtime.create(
+        GLKVMLedActivitySensor,
+        "hdd",
+        "atx_disk_activity",
+        "Disk Activity",
+        "mdi:harddisk",
+        300,
+    )
+    sensor._value = 12.5
+
+    assert sensor.state_class is SensorStateClass.MEASUREMENT
+    assert sensor.suggested_display_precision == 1
+    assert sensor.unit_of_measurement == "%"
+    assert sensor.state == 12.5
+
+
+def test_duty_cycle_is_written_on_availability_changes_only(hass, runtime):
+    """Ensure polls only write the duty cycle when the availability changes."""
+    sensor = runtime.create(
+        GLKVMLedActivitySensor,
+        "hdd",
+        "atx_disk_activity",
+        "Disk Activity",
+        "mdi:harddisk",
+        300,
+    )
+    sensor.hass = hass
+    sensor.async_write_ha_state = Mock()
+    coordinator = runtime.coordinator
+
+    sensor._async_publish(None)
+    coordinator.last_update_success = True
+    sensor._handle_coordinator_update()
+    assert sensor.async_write_ha_state.call_count == 1
+
+    coordinator.last_update_success = False
+    sensor._handle_coordinator_update()
+    sensor._handle_coordinator_update()
+    assert sensor.async_write_ha_state.call_count == 2
+    assert not sensor.available
+
+    coordinator.last_update_success = True
+    sensor._handle_coordinator_update()
+    assert sensor.async_write_ha_state.call_count == 3
+    assert sensor.available
+
+
+def test_described_sensor_reports_its_unit(hass, runtime):
+    """Ensure the unit of a description is the sensor's native unit."""
+    runtime.coordinator.data = {"metrics": {"pikvm_hw_temp_cpu": 51.0}}
+    description = next(d for d in METRIC_SENSORS if d.key == "metric_hw_temp_cpu")
+    sensor = runtime.create(GLKVMSensor, description)
+    sensor.hass = hass
+
+    assert sensor.native_unit_of_measurement == UnitOfTemperature.CELSIUS
+    assert sensor.device_class is SensorDeviceClass.TEMPERATURE
+    assert sensor.state_class is SensorStateClass.MEASUREMENT
+    assert sensor.state == 51
+
+
+def test_screen_change_is_a_timestamp(runtime):
+    """Ensure the last change is reported as an ISO timestamp state."""
+    screen = runtime.coordinator.screen
+    sensor = runtime.create(GLKVMOnDemandSensor, SCREEN_CHANGED, coordinator=screen)
+    assert sensor.state is None
+
+    screen.data = {"last_changed": datetime(2024, 5, 1, 12, 30, tzinfo=UTC)}
+    sensor._evaluate()
+
+    assert sensor.device_class is SensorDeviceClass.TIMESTAMP
+    assert sensor.state == "2024-05-01T12:30:00+00:00"
+
+
+def test_ocr_text_is_truncated_but_kept_whole_in_attributes(runtime):
+    """Ensure long recognized text fits the state and counters are reported."""
+    text = "x" * (OCR_STATE_MAX_LENGTH + 10)
+    ocr = SimpleNamespace(
+        url="https://kvm", data={"Status": text}, ocr_requests=3, cache_hits=2
+    )
+    sensor = runtime.create(
+        GLKVMOcrSensor,
+        ocr_region_description("Status", (0, 0, 100, 20)),
+        coordinator=ocr,
+    )
+
+    assert sensor.unique_id.endswith("_ocr_status")
+    assert sensor.state == text[:OCR_STATE_MAX_LENGTH]
+    assert sensor.extra_state_attributes["text"] == text
+    assert sensor.extra_state_attributes["region"] == [0, 0, 100, 20]
+    assert sensor.extra_state_attributes["ocr_requests"] == 3
+    assert sensor.extra_state_attributes["cache_hits"] == 2
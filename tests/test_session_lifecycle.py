@@ -0,0 +1,59 @@
+"""Tests for the GLKVM connection pool lifecycle."""
+
+import http.server
+import threading
+
+import pytest
+
+from custom_components.glkvm.cert_handler import connection_stats
+from custom_components.glkvm.const import HTTP_POOL_MAXSIZE
+from custom_components.glkvm.coordinator import GLKVMDataUpdateCoordinator
+
+RELOADS = 20
+
+
+class _Handler(http.server.BaseHTTPRequestHandler):
+    """Answer every request with an empty kvmd result over keep-alive."""
+
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        body = b'{"ok": true, "result": {}}'
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def http_url(socket_enabled):
+    """Serve HTTP on a local port, returning its URL."""
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.mark.asyncio
+async def test_shutdown_closes_every_pooled_connection(hass, http_url):
+    """Ensure repeated setup and unload leave no connection open."""
+    for _ in range(RELOADS):
+        coordinator = GLKVMDataUpdateCoordinator(hass, http_url, "admin", "admin", None)
+        await coordinator.async_setup()
+        await coordinator.async_refresh()
+        assert coordinator.last_update_success
+
+        session = coordinator.session
+        stats = connection_stats(session)
+        assert stats["pools"] == 1
+        assert 1 <= stats["open"] <= HTTP_POOL_MAXSIZE
+
+        await coordinator.async_shutdown()
+        assert coordinator.session is None
+        assert connection_stats(session)["open"] == 0
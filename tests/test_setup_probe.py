@@ -0,0 +1,48 @@
+"""Startup benchmark for GLKVM devices that are unreachable at boot."""
+
+import asyncio
+import socket
+import time
+
+import pytest
+import requests
+from homeassistant.exceptions import ConfigEntryNotReady
+
+from custom_components.glkvm.const import PROBE_TIMEOUT
+from custom_components.glkvm.coordinator import GLKVMDataUpdateCoordinator
+
+# Probes run in the executor; stay within the smallest default worker count
+DEVICES = 4
+
+
+@pytest.fixture
+def blackhole_url(socket_enabled):
+    """Return the URL of a port that accepts connections but never answers."""
+    server = socket.socket()
+    server.bind(("127.0.0.1", 0))
+    server.listen(DEVICES)
+    yield f"http://127.0.0.1:{server.getsockname()[1]}"
+    server.close()
+
+
+@pytest.mark.asyncio
+async def test_unreachable_devices_fail_setup_within_probe_timeout(hass, blackhole_url):
+    """Ensure N unresponsive devices fail their first refresh in bounded time."""
+    coordinators = []
+    for _ in range(DEVICES):
+        coordinator = GLKVMDataUpdateCoordinator(
+            hass, blackhole_url, "admin", "password", "cert"
+        )
+        coordinator.session = requests.Session()
+        coordinators.append(coordinator)
+
+    start = time.monotonic()
+    results = await asyncio.gather(
+        *(c.async_config_entry_first_refresh() for c in coordinators),
+        return_exceptions=True,
+    )
+    elapsed = time.monotonic() - start
+
+    assert all(isinstance(result, ConfigEntryNotReady) for result in results)
+    # One short attempt each, in parallel: no retry loop, no backoff sleeps
+    assert elapsed < PROBE_TIMEOUT * 2
@@ -0,0 +1,45 @@
+"""Tests for the GLKVM last known state storage."""
+
+from datetime import timedelta
+
+import pytest
+from homeassistant.util import dt as dt_util
+from pytest_homeassistant_custom_component.common import async_fire_time_changed
+
+from custom_components.glkvm.const import STORAGE_SAVE_DELAY
+from custom_components.glkvm.storage import GLKVMDataStore
+
+
+@pytest.mark.asyncio
+async def test_store_saves_compact_data_and_restores_it(hass, hass_storage):
+    """Ensure only restorable parts are saved, debounced, and loaded back."""
+    store = GLKVMDataStore(hass, "entry")
+    store.async_save(
+        {
+            "system": {"kvmd": {"version": "4.20"}},
+            "atx": {"leds": {"power": True}},
+            "gpio": {},
+            "extras": {"large": "ignored"},
+        }
+    )
+    await hass.async_block_till_done()
+    assert "glkvm.entry" not in hass_storage
+
+    async_fire_time_changed(
+        hass, dt_util.utcnow() + timedelta(seconds=STORAGE_SAVE_DELAY + 1)
+    )
+    await hass.async_block_till_done()
+
+    assert hass_storage["glkvm.entry"]["data"] == {
+        "system": {"kvmd": {"version": "4.20"}},
+        "atx": {"leds": {"power": True}},
+    }
+    restored = await GLKVMDataStore(hass, "entry").async_load()
+    assert restored["restored"] is True
+    assert restored["system"] == {"kvmd": {"version": "4.20"}}
+
+
+@pytest.mark.asyncio
+async def test_store_load_without_saved_data(hass, hass_storage):
+    """Ensure a device that was never seen restores nothing."""
+    assert await GLKVMDataStore(hass, "unknown").async_load() is None
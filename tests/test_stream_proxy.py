@@ -0,0 +1,123 @@
+"""Tests for the shared MJPEG stream proxy."""
+
+import asyncio
+from types import SimpleNamespace
+
+from aiohttp import web
+import pytest
+
+from custom_components.glkvm.const import API_STREAMER_STREAM, STREAM_QUEUE_SIZE
+from custom_components.glkvm.stream_proxy import MjpegStreamProxy
+
+FRAME = b"\xff\xd8" + b"\x00" * 1000 + b"\xff\xd9"
+
+
+def _part(frame: bytes) -> bytes:
+    return (
+        b"--boundarydonotcross\r\nContent-Type: image/jpeg\r\n"
+        b"Content-Length: %d\r\n\r\n%s\r\n" % (len(frame), frame)
+    )
+
+
+@pytest.fixture
+async def fake_streamer(socket_enabled):
+    """Serve an MJPEG stream that sends `frames` parts and then stalls."""
+    device = SimpleNamespace(
+        url=None, connections=0, frames=1000, closed=asyncio.Event()
+    )
+
+    async def stream(request):
+        device.connections += 1
+        response = web.StreamResponse(
+            headers={
+                "Content-Type": "multipart/x-mixed-replace;boundary=boundarydonotcross"
+            }
+        )
+        await response.prepare(request)
+        try:
+            for _ in range(device.frames):
+                await response.write(_part(FRAME))
+                await asyncio.sleep(0.001)
+        except ConnectionResetError:
+            return response
+        # Stay connected without sending, like a streamer without a signal
+        await device.closed.wait()
+        return response
+
+    app = web.Application()
+    app.router.add_get(API_STREAMER_STREAM, stream)
+    runner = web.AppRunner(app, shutdown_timeout=0)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    device.url = f"http://127.0.0.1:{site._server.sockets[0].getsockname()[1]}"
+    yield device
+    device.closed.set()
+    await runner.cleanup()
+
+
+def _proxy(hass, url: str = "http://127.0.0.1:1") -> MjpegStreamProxy:
+    return MjpegStreamProxy(
+        SimpleNamespace(
+            hass=hass,
+            url=url,
+            username="admin",
+            password="admin",
+            cert=None,
+            resolver=None,
+        )
+    )
+
+
+async def test_viewers_share_one_upstream(hass, fake_streamer):
+    """Ensure every viewer gets the same frame object from one connection."""
+    fake_streamer.frames = 1
+    proxy = _proxy(hass, fake_streamer.url)
+    first = proxy._subscribe()
+    second = proxy._subscribe()
+
+    frame = await asyncio.wait_for(first.get(), 5)
+    assert frame == FRAME
+    assert await asyncio.wait_for(second.get(), 5) is frame
+    assert fake_streamer.connections == 1
+    assert proxy.viewers == 2
+    assert proxy.frames == 1
+
+    # Closing ends every viewer's stream
+    await proxy.async_close()
+    assert first.get_nowait() is None
+    assert second.get_nowait() is None
+
+
+async def test_slow_viewer_loses_its_oldest_frames(hass):
+    """Ensure a full viewer queue drops the oldest frame, not the newest."""
+    proxy = _proxy(hass)
+    queue = asyncio.Queue(maxsize=STREAM_QUEUE_SIZE)
+    frames = [bytes([i]) for i in range(STREAM_QUEUE_SIZE + 3)]
+
+    for frame in frames:
+        proxy._offer(queue, frame)
+
+    assert proxy.dropped == 3
+    assert [queue.get_nowait() for _ in range(queue.qsize())] == frames[-STREAM_QUEUE_SIZE:]
+
+
+async def test_last_viewer_closes_a_stalled_upstream(hass, fake_streamer):
+    """Ensure the last viewer leaving closes the upstream without waiting on it."""
+    fake_streamer.frames = 1
+    proxy = _proxy(hass, fake_streamer.url)
+    queue = proxy._subscribe()
+    assert await asyncio.wait_for(queue.get(), 5) == FRAME
+
+    # The upstream now sends nothing; closing must not wait for its timeout
+    async with asyncio.timeout(1):
+        await proxy._async_unsubscribe(queue)
+
+    assert proxy._reader is None
+    assert proxy.viewers == 0
+
+    # The next viewer opens a new upstream
+    queue = proxy._subscribe()
+    assert await asyncio.wait_for(queue.get(), 5) == FRAME
+    assert fake_streamer.connections == 2
+    await proxy._async_unsubscribe(queue)
@@ -0,0 +1,30 @@
+"""Tests for the GLKVM streamer entities."""
+
+from custom_components.glkvm.sensor import STREAMER_SENSORS, GLKVMStreamerSensor
+
+# /api/streamer result of a streamer without a signal or viewers
+STREAMER = {
+    "source": {
+        "online": False,
+        "captured_fps": 0,
+        "resolution": {"width": 1920, "height": 1080},
+    },
+    "stream": {"clients": 0},
+    "encoder": {"type": "CPU"},
+}
+
+
+async def test_zero_streamer_values_are_reported(runtime):
+    """Ensure 0 clients and 0 fps are states, not unknown."""
+    runtime.coordinator.streamer.data = STREAMER
+    sensors = {
+        description.key: runtime.create(
+            GLKVMStreamerSensor, description, coordinator=runtime.coordinator.streamer
+        )
+        for description in STREAMER_SENSORS
+    }
+
+    assert sensors["streamer_clients"].state == 0
+    assert sensors["streamer_captured_fps"].state == 0
+    assert sensors["streamer_resolution"].state == "1920x1080"
+    assert sensors["streamer_encoder"].state == "CPU"
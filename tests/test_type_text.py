@@ -0,0 +1,94 @@
+"""Tests for typing text on the host."""
+
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, call, patch
+
+import pytest
+
+from homeassistant.exceptions import ServiceValidationError
+
+from custom_components.glkvm.const import (
+    API_HID_PRINT,
+    API_HID_SEND_KEY,
+    API_HID_SEND_SHORTCUT,
+)
+from custom_components.glkvm.hid import chunk_text, unmapped_characters
+from custom_components.glkvm.services import TYPE_TEXT_SCHEMA, _async_type_text
+
+
+def _coordinator():
+    return SimpleNamespace(url="https://kvm", async_post=AsyncMock(return_value=MagicMock()))
+
+
+def _data(**options):
+    return TYPE_TEXT_SCHEMA({"device_id": "device", **options})
+
+
+def test_chunk_text_prefers_line_breaks():
+    """Ensure chunks end after a newline if that keeps them half full."""
+    text = "echo one\necho two\necho three\n"
+
+    assert chunk_text(text, 12) == ["echo one\n", "echo two\n", "echo three\n"]
+    assert "".join(chunk_text(text, 12)) == text
+
+
+def test_chunk_text_cuts_long_lines_at_the_size():
+    """Ensure text without a usable newline is cut at the chunk size."""
+    assert chunk_text("abcdefghij", 4) == ["abcd", "efgh", "ij"]
+    assert chunk_text("a\nbcdefghij", 8) == ["a\nbcdefg", "hij"]
+    assert chunk_text("", 4) == []
+
+
+async def test_chunks_are_paced_by_the_chunk_delay():
+    """Ensure the delay is waited between chunks, not after the last one."""
+    coordinator = _coordinator()
+
+    with patch(
+        "custom_components.glkvm.services.asyncio.sleep", new=AsyncMock()
+    ) as sleep:
+        result = await _async_type_text(
+            coordinator, _data(text="abcdefghij", chunk_size=4, chunk_delay=0.5)
+        )
+
+    assert sleep.await_args_list == [call(0.5), call(0.5)]
+    assert [c.kwargs["data"] for c in coordinator.async_post.await_args_list] == [
+        b"abcd",
+        b"efgh",
+        b"ij",
+    ]
+    assert coordinator.async_post.await_args.args == (API_HID_PRINT,)
+    assert coordinator.async_post.await_args.kwargs["params"]["keymap"] == "en-us"
+    assert result["completed"] is True
+    assert result["characters"] == 10
+    assert result["chunks"] == 3
+
+
+async def test_keys_method_sends_one_key_per_character():
+    """Ensure shifted characters are sent as shortcuts with ShiftLeft."""
+    coordinator = _coordinator()
+
+    result = await _async_type_text(
+        coordinator, _data(text="Hi!", method="keys", chunk_delay=0)
+    )
+
+    assert coordinator.async_post.await_args_list == [
+        call(API_HID_SEND_SHORTCUT, params={"keys": "ShiftLeft,KeyH"}),
+        call(API_HID_SEND_KEY, params={"key": "KeyI"}),
+        call(API_HID_SEND_SHORTCUT, params={"keys": "ShiftLeft,Digit1"}),
+    ]
+    assert result["completed"] is True
+    assert result["characters"] == 3
+
+
+async def test_keys_method_rejects_text_it_cannot_type():
+    """Ensure nothing is sent if a character has no key in the US layout."""
+    coordinator = _coordinator()
+
+    assert unmapped_characters("naïve café") == ["ï", "é"]
+    with pytest.raises(ServiceValidationError, match="ïé"):
+        await _async_type_text(coordinator, _data(text="naïve café", method="keys"))
+    with pytest.raises(ServiceValidationError, match="en-us"):
+        await _async_type_text(
+            coordinator, _data(text="hello", method="keys", keymap="de")
+        )
+    coordinator.async_post.assert_not_awaited()
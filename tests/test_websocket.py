@@ -0,0 +1,108 @@
+"""Tests for the kvmd websocket push events."""
+
+import asyncio
+
+import pytest
+
+from custom_components.glkvm.binary_sensor import (
+    VIDEO_SIGNAL,
+    GLKVMVideoSignalSensor,
+)
+from custom_components.glkvm.const import DOMAIN, WS_EVENT_STREAMER_STATE
+from custom_components.glkvm.coordinator import GLKVMDataUpdateCoordinator
+
+
+@pytest.fixture
+async def coordinator(hass, fake_kvmd_ws):
+    """Return a coordinator of the fake device."""
+    coordinator = GLKVMDataUpdateCoordinator(
+        hass, fake_kvmd_ws.url, "admin", "admin", None
+    )
+    yield coordinator
+    await coordinator.events.async_close()
+
+
+async def _push(coordinator, fake_kvmd_ws, *messages) -> None:
+    """Wait for the websocket and send messages from the device."""
+    async with asyncio.timeout(5):
+        while not (coordinator.events.connected and fake_kvmd_ws.sockets):
+            await asyncio.sleep(0.01)
+    for message in messages:
+        if isinstance(message, str):
+            await fake_kvmd_ws.sockets[0].send_str(message)
+        else:
+            await fake_kvmd_ws.sockets[0].send_json(message)
+
+
+async def test_events_reach_the_subscribers_of_their_type(coordinator, fake_kvmd_ws):
+    """Ensure events are dispatched by type and malformed frames skipped."""
+    streamer, atx = [], []
+    unsubscribe_streamer = coordinator.events.async_subscribe(
+        WS_EVENT_STREAMER_STATE, streamer.append
+    )
+    unsubscribe_atx = coordinator.events.async_subscribe("atx_state", atx.append)
+
+    await _push(
+        coordinator,
+        fake_kvmd_ws,
+        "not json",
+        {"event_type": "gpio_state", "event": {"state": {}}},
+        {"event_type": WS_EVENT_STREAMER_STATE, "event": {"streamer": None}},
+        {"event_type": "atx_state", "event": {"leds": {"power": True}}},
+    )
+    async with asyncio.timeout(5):
+        while not atx:
+            await asyncio.sleep(0.01)
+
+    assert streamer == [{"streamer": None}]
+    assert atx == [{"leds": {"power": True}}]
+    assert fake_kvmd_ws.connections == 1
+
+    unsubscribe_streamer()
+    unsubscribe_atx()
+
+
+async def test_video_signal_follows_streamer_events(
+    hass, add_entry, coordinator, fake_kvmd_ws
+):
+    """Ensure a streamer_state event switches the video signal sensor."""
+    entry = add_entry(coordinator=coordinator)
+    sensor = hass.data[DOMAIN][entry.entry_id].create(
+        GLKVMVideoSignalSensor, VIDEO_SIGNAL, coordinator=coordinator.streamer
+    )
+    sensor.hass = hass
+    sensor.entity_id = "binary_sensor.kvm_video_signal"
+    assert VIDEO_SIGNAL.entity_registry_enabled_default is False
+    assert not sensor.available
+
+    unsubscribe = coordinator.events.async_subscribe(
+        WS_EVENT_STREAMER_STATE, coordinator.streamer.async_handle_push
+    )
+    remove_listener = coordinator.streamer.async_add_listener(
+        sensor._handle_coordinator_update
+    )
+    await _push(
+        coordinator,
+        fake_kvmd_ws,
+        {
+            "event_type": WS_EVENT_STREAMER_STATE,
+            "event": {
+                "streamer": {
+                    "source": {
+                        "online": True,
+                        "resolution": {"width": 1920, "height": 1080},
+                    }
+                }
+            },
+        },
+    )
+    async with asyncio.timeout(5):
+        while not sensor.available:
+            await asyncio.sleep(0.01)
+
+    assert sensor.is_on is True
+    assert sensor.extra_state_attributes["resolution"] == "1920x1080"
+    assert sensor.extra_state_attributes["push_connected"] is True
+
+    remove_listener()
+    unsubscribe()